@@ -0,0 +1,8 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Benchmarks Package
+
+Synthetic catalog generation and timing scripts. Run the full suite with:
+
+    python -m benchmarks.run_benchmarks --sizes 1000 10000 --output results.json
+"""
@@ -0,0 +1,79 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Bulk Character Load Benchmark
+
+Compares loading a few thousand synthetic text saves with a serial
+load_character loop against character_manager.load_characters with
+different thread pool sizes. With a warm page cache each load is
+mostly CPU work under the GIL, so the pool only pays off when opens
+block; pass latency_ms to add a simulated per-load delay (e.g. a network
+filesystem).
+
+Usage: python -m benchmarks.bench_bulk_load [save_count] [latency_ms]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+import save_backends
+
+CLASSES = ['Warrior', 'Mage', 'Rogue', 'Cleric']
+
+def write_saves(directory, count):
+    """Write count synthetic saves and return their names"""
+    names = []
+    for number in range(count):
+        character = character_manager.create_character(f"hero_{number:06d}", CLASSES[number % 4])
+        character['inventory'] = [f"item_{number % 50}", "health_potion"]
+        character['completed_quests'] = [f"quest_{step}" for step in range(number % 10)]
+        character_manager.save_character(character, directory)
+        names.append(character['name'])
+    return names
+
+def time_call(function, *args, **kwargs):
+    """Return (seconds, result) for a single call"""
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+class SlowTextBackend(save_backends.TextSaveBackend):
+    """Text backend that sleeps before each load to mimic slow storage"""
+
+    def __init__(self, latency):
+        super().__init__()
+        self.latency = latency
+
+    def load(self, character_name, save_directory):
+        time.sleep(self.latency)
+        return super().load(character_name, save_directory)
+
+def serial_load(names, directory):
+    """The loop the bulk API replaces"""
+    return {name: character_manager.load_character(name, directory) for name in names}
+
+def run(count=5000, latency_ms=0.0):
+    """Run the benchmark and print a small report"""
+    previous = character_manager.get_save_backend()
+    with tempfile.TemporaryDirectory() as directory:
+        names = write_saves(directory, count)
+        if latency_ms:
+            character_manager.set_save_backend(SlowTextBackend(latency_ms / 1000))
+
+        serial, expected = time_call(serial_load, names, directory)
+        print(f"Saves:               {count} (+{latency_ms}ms per load)")
+        print(f"Serial loop:         {serial:.3f}s")
+        for workers in (1, 4, 8, 16):
+            seconds, (characters, errors) = time_call(character_manager.load_characters,
+                                                      names, directory, max_workers=workers)
+            assert characters == expected and not errors
+            print(f"load_characters({workers:>2}): {seconds:.3f}s ({serial / seconds:.2f}x)")
+    character_manager.set_save_backend(previous)
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 5000,
+        float(sys.argv[2]) if len(sys.argv) > 2 else 0.0)
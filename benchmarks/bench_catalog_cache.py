@@ -0,0 +1,44 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Catalog Cache Benchmark
+
+Compares a cold load of a large quest catalog (parse + validate) with a
+load served from the compiled cache in data/.cache/.
+
+Usage: python -m benchmarks.bench_catalog_cache [quest_count]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import game_data
+from benchmarks.generate_catalogs import write_quest_file
+
+def time_call(function, *args, **kwargs):
+    """Return (seconds, result) for a single call"""
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+def run(count=100000):
+    """Run the benchmark and print a small report"""
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, "quests.txt")
+        write_quest_file(filename, count)
+
+        cold, quests = time_call(game_data.load_quests, filename)
+        build, _ = time_call(game_data.load_quests, filename, use_cache=True)
+        hit, cached = time_call(game_data.load_quests, filename, use_cache=True)
+        assert cached == quests
+
+        print(f"Quests:              {count}")
+        print(f"Cold load:           {cold:.3f}s")
+        print(f"Cold load + cache:   {build:.3f}s")
+        print(f"Cache hit:           {hit:.3f}s ({cold / hit:.1f}x faster)")
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
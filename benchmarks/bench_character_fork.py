@@ -0,0 +1,59 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Character Fork Benchmark
+
+Measures how many what-if branches per second can be run from one
+character: copy.deepcopy of the character dict against
+character_manager.fork_character + CharacterBranch.fork. Each branch
+gains experience, spends gold and picks up an item, then is thrown away.
+
+Usage: python -m benchmarks.bench_character_fork [branch_count]
+"""
+
+import copy
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+import inventory_system
+
+def make_character():
+    """Return a mid-game character with a full-ish inventory and quest log"""
+    character = character_manager.create_character("Planner", "Warrior")
+    for number in range(15):
+        character['inventory'].append(f"item_{number % 5}")
+    character['active_quests'] = [f"quest_{number}" for number in range(5)]
+    character['completed_quests'] = [f"quest_{number}" for number in range(5, 40)]
+    return character
+
+def play(branch):
+    """One simulated future"""
+    character_manager.gain_experience(branch, 500)
+    character_manager.add_gold(branch, -10)
+    inventory_system.add_item_to_inventory(branch, "health_potion")
+
+def branches_per_second(make_branch, count):
+    """Return how many make_branch + play rounds run per second"""
+    start = time.perf_counter()
+    for _ in range(count):
+        play(make_branch())
+    return count / (time.perf_counter() - start)
+
+def run(count=50000):
+    """Run the benchmark and print a small report"""
+    character = make_character()
+    root = character_manager.fork_character(character)
+
+    deep = branches_per_second(lambda: copy.deepcopy(character), count)
+    fork = branches_per_second(root.fork, count)
+    assert character['level'] == 1 and root['level'] == 1
+
+    print(f"Branches:            {count}")
+    print(f"copy.deepcopy:       {deep:,.0f} branches/s")
+    print(f"CharacterBranch:     {fork:,.0f} branches/s ({fork / deep:.1f}x)")
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 50000)
@@ -0,0 +1,55 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Record Memory Benchmark
+
+Compares the memory held by a quest catalog stored as plain dictionaries
+(the old loader output) with one stored as Quest records.
+
+Usage: python -m benchmarks.bench_record_memory [quest_count]
+"""
+
+import os
+import sys
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import game_data
+from benchmarks.generate_catalogs import write_quest_file
+
+def load_as_dicts(filename):
+    """Load quests the way the original loader did: one dict per quest"""
+    quests = {}
+    with open(filename, 'r') as file:
+        for line_number, lines in game_data._iter_blocks(file):
+            quest_data = game_data.parse_quest_block(lines)
+            game_data.validate_quest_data(quest_data)
+            quests[quest_data['quest_id']] = quest_data
+    return quests
+
+def measure(function, *args):
+    """Return the bytes still allocated by the object function builds"""
+    tracemalloc.start()
+    result = function(*args)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return current
+
+def run(count=100000):
+    """Run the benchmark and print a small report"""
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, "quests.txt")
+        write_quest_file(filename, count)
+
+        dict_bytes = measure(load_as_dicts, filename)
+        record_bytes = measure(game_data.load_quests, filename)
+
+        print(f"Quests:        {count}")
+        print(f"Dict catalog:  {dict_bytes / 1e6:.1f} MB ({dict_bytes / count:.0f} B/quest)")
+        print(f"Quest records: {record_bytes / 1e6:.1f} MB ({record_bytes / count:.0f} B/quest)")
+        print(f"Saved:         {100 * (1 - record_bytes / dict_bytes):.0f}%")
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,82 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Roster Rewards Benchmark
+
+Compares giving XP and gold to a roster one character at a time
+(gain_experience + add_gold) with character_manager.grant_rewards using
+NumPy arrays (skipped if NumPy isn't installed) and without.
+
+Usage: python -m benchmarks.bench_roster_rewards [roster_size ...]
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+from custom_exceptions import CharacterDeadError
+
+CLASSES = ['Warrior', 'Mage', 'Rogue', 'Cleric']
+
+def make_roster(count, seed=0):
+    """Return count characters at assorted levels, a few of them dead"""
+    rng = random.Random(seed)
+    roster = []
+    for number in range(count):
+        character = dict(character_manager.create_character(f"hero_{number}", CLASSES[number % 4]))
+        character['level'] = rng.randint(1, 30)
+        character['experience'] = rng.randint(0, character['level'] * 100 - 1)
+        if number % 50 == 0:
+            character['health'] = 0
+        roster.append(character)
+    return roster
+
+def scalar_rewards(roster, xp_amounts, gold_amounts):
+    """The per-character loop grant_rewards replaces"""
+    errors = {}
+    for position, character in enumerate(roster):
+        try:
+            character_manager.gain_experience(character, xp_amounts[position])
+            character_manager.add_gold(character, gold_amounts[position])
+        except (CharacterDeadError, ValueError) as e:
+            errors[position] = e
+    return errors
+
+def time_call(function, *args, **kwargs):
+    """Return (seconds, result) for a single call"""
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+def run(count):
+    """Run the benchmark for one roster size and print a small report"""
+    rng = random.Random(count)
+    xp_amounts = [rng.randint(0, 5000) for _ in range(count)]
+    gold_amounts = [rng.randint(-50, 500) for _ in range(count)]
+
+    roster = make_roster(count)
+    loop, expected_errors = time_call(scalar_rewards, roster, xp_amounts, gold_amounts)
+    expected = roster
+    print(f"Characters:          {count}")
+    print(f"Scalar loop:         {loop:.3f}s")
+
+    try:
+        import numpy
+    except ImportError:
+        numpy = None
+    modes = [('pure Python', False)] + ([('NumPy', True)] if numpy is not None else [])
+    for label, use_numpy in modes:
+        roster = make_roster(count)
+        seconds, errors = time_call(character_manager.grant_rewards, roster, xp_amounts,
+                                    gold_amounts, use_numpy=use_numpy)
+        assert roster == expected and errors.keys() == expected_errors.keys()
+        print(f"grant_rewards ({label}): {seconds:.3f}s ({loop / seconds:.2f}x)")
+    if numpy is None:
+        print("NumPy not installed; array path skipped")
+
+if __name__ == "__main__":
+    for size in [int(arg) for arg in sys.argv[1:]] or [10000, 1000000]:
+        run(size)
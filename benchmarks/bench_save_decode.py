@@ -0,0 +1,89 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Save Decode Benchmark
+
+Compares the schema-driven save decoder (save_backends.decode_character_text,
+one pass that converts and checks every field) with the original approach:
+split every line into strings, split the lists, convert the numbers, then
+run validate_character_data as a separate pass.
+
+Usage: python -m benchmarks.bench_save_decode [save_count]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+import save_backends
+from custom_exceptions import InvalidSaveDataError
+
+NUMERIC_FIELDS = ['level', 'health', 'max_health', 'strength', 'magic', 'experience', 'gold']
+
+def make_save_texts(count):
+    """Return count synthetic save files as text"""
+    texts = []
+    for number in range(count):
+        character = character_manager.create_character(f"hero_{number}", "Rogue")
+        character['gold'] = number
+        character['inventory'] = [f"item_{step}" for step in range(number % 8)]
+        character['completed_quests'] = [f"quest_{step}" for step in range(number % 5)]
+        texts.append(save_backends.encode_character_text(character))
+    return texts
+
+def legacy_decode(text, character_name):
+    """The original load_character parse, plus number conversion and validation"""
+    character = {}
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        if ':' not in line:
+            continue
+        if ': ' in line:
+            key, value = line.split(': ', 1)
+        else:
+            key, value = line.split(':', 1)
+        character[key.lower()] = value.strip()
+
+    if not all(key in character for key in save_backends.SAVE_FIELDS):
+        raise InvalidSaveDataError(f"Save file for '{character_name}' is invalid.")
+
+    character['inventory'] = character['inventory'].split(',') if character['inventory'] else []
+    character['active_quests'] = character['active_quests'].split(',') if character['active_quests'] else []
+    character['completed_quests'] = character['completed_quests'].split(',') if character['completed_quests'] else []
+    for field in NUMERIC_FIELDS:
+        try:
+            character[field] = int(character[field])
+        except ValueError:
+            raise InvalidSaveDataError(f"Invalid {field}") from None
+    character_manager.validate_character_data(character)
+    return character
+
+def best_time(function, texts, repeat=5):
+    """Return the best time of repeat runs decoding every text"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text in texts:
+            function(text, "hero")
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def run(count=20000):
+    """Run the benchmark and print a small report"""
+    texts = make_save_texts(count)
+    assert all(legacy_decode(text, "hero") == save_backends.decode_character_text(text, "hero")
+               for text in texts[:100])
+
+    legacy = best_time(legacy_decode, texts)
+    schema = best_time(save_backends.decode_character_text, texts)
+    print(f"Saves:                   {count}")
+    print(f"Parse + validate:        {legacy:.3f}s")
+    print(f"Schema decoder:          {schema:.3f}s ({legacy / schema:.2f}x faster)")
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
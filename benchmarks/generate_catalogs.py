@@ -0,0 +1,106 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Synthetic Catalog Generator
+
+Writes seeded quest and item files in the normal KEY: value format so the
+loaders and queries can be measured at sizes far beyond data/.
+
+Quest prerequisite shapes:
+- chain:   every quest requires the one before it (one long chain)
+- fanout:  a few root quests, each unlocking many follow-ups
+- random:  each quest requires a random earlier quest (or none)
+
+Usage: python -m benchmarks.generate_catalogs COUNT [--shape SHAPE] [--seed N] [--out DIR]
+"""
+
+import argparse
+import os
+import random
+
+QUEST_SHAPES = ('chain', 'fanout', 'random')
+ITEM_TYPES = ('weapon', 'armor', 'consumable')
+EFFECT_STATS = {'weapon': 'strength', 'armor': 'max_health', 'consumable': 'health'}
+
+def quest_prerequisite(index, shape, rng, fanout=100):
+    """Pick the prerequisite of quest number index for a given shape"""
+    if index == 0:
+        return "NONE"
+    if shape == 'chain':
+        return f"quest_{index - 1}"
+    if shape == 'fanout':
+        if index % fanout == 0:
+            return "NONE"
+        return f"quest_{index - index % fanout}"
+    if shape == 'random':
+        if rng.random() < 0.05:
+            return "NONE"
+        return f"quest_{rng.randrange(index)}"
+    raise ValueError(f"Unknown quest shape: {shape}")
+
+def write_quest_file(filename, count, shape='chain', seed=0):
+    """
+    Write a synthetic quest file
+    
+    Args:
+        filename: File to create
+        count: Number of quests
+        shape: One of QUEST_SHAPES
+        seed: Random seed (same seed → same file)
+    
+    Returns: filename
+    """
+    rng = random.Random(seed)
+    with open(filename, 'w') as file:
+        for i in range(count):
+            file.write(
+                f"QUEST_ID: quest_{i}\n"
+                f"TITLE: Quest {i}\n"
+                f"DESCRIPTION: Synthetic {shape} quest number {i}\n"
+                f"REWARD_XP: {rng.randint(10, 500)}\n"
+                f"REWARD_GOLD: {rng.randint(5, 250)}\n"
+                f"REQUIRED_LEVEL: {rng.randint(1, 50)}\n"
+                f"PREREQUISITE: {quest_prerequisite(i, shape, rng)}\n\n"
+            )
+    return filename
+
+def write_item_file(filename, count, seed=0):
+    """
+    Write a synthetic item file
+    
+    Args:
+        filename: File to create
+        count: Number of items
+        seed: Random seed (same seed → same file)
+    
+    Returns: filename
+    """
+    rng = random.Random(seed)
+    with open(filename, 'w') as file:
+        for i in range(count):
+            item_type = rng.choice(ITEM_TYPES)
+            file.write(
+                f"ITEM_ID: item_{i}\n"
+                f"NAME: Item {i}\n"
+                f"TYPE: {item_type}\n"
+                f"EFFECT: {EFFECT_STATS[item_type]}:{rng.randint(1, 50)}\n"
+                f"COST: {rng.randint(1, 1000)}\n"
+                f"DESCRIPTION: Synthetic {item_type} number {i}\n\n"
+            )
+    return filename
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.generate_catalogs")
+    parser.add_argument('count', type=int, help="number of quests and items")
+    parser.add_argument('--shape', choices=QUEST_SHAPES, default='chain')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--out', default="benchmark_data")
+    args = parser.parse_args(argv)
+
+    os.makedirs(args.out, exist_ok=True)
+    quests = write_quest_file(os.path.join(args.out, "quests.txt"), args.count, args.shape, args.seed)
+    items = write_item_file(os.path.join(args.out, "items.txt"), args.count, args.seed)
+    print(f"Wrote {quests} and {items}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Benchmark Runner
+
+Generates seeded catalogs for each size and prerequisite shape, times the
+loaders and quest/shop queries, and writes the results as JSON so runs
+from different commits can be compared.
+
+Usage: python -m benchmarks.run_benchmarks [--sizes N ...] [--shapes S ...]
+                                           [--repeat N] [--output FILE]
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import game_data
+import inventory_system
+import quest_handler
+from benchmarks.generate_catalogs import QUEST_SHAPES, write_item_file, write_quest_file
+
+def best_time(function, repeat):
+    """Return the fastest of repeat calls, in seconds"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+def git_commit():
+    """Return the current git commit, or None outside a repository"""
+    try:
+        result = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)))
+    except OSError:
+        return None
+    return result.stdout.strip() or None
+
+def benchmark_size(directory, size, shape, repeat, seed):
+    """
+    Time every loader and query for one catalog size and shape
+    
+    Returns: Dictionary {benchmark_name: seconds}
+    """
+    quest_file = write_quest_file(os.path.join(directory, f"quests_{shape}_{size}.txt"), size, shape, seed)
+    item_file = write_item_file(os.path.join(directory, f"items_{size}.txt"), size, seed)
+    timings = {}
+
+    timings['load_quests'] = best_time(lambda: game_data.load_quests(quest_file), repeat)
+    timings['load_items'] = best_time(lambda: game_data.load_items(item_file), repeat)
+    game_data.load_quests(quest_file, use_cache=True)
+    timings['load_quests_cached'] = best_time(lambda: game_data.load_quests(quest_file, use_cache=True), repeat)
+    timings['lazy_item_catalog_open'] = best_time(lambda: game_data.LazyItemCatalog(item_file).close(), repeat)
+
+    quests = game_data.load_quests(quest_file)
+    binary_file = os.path.join(directory, f"quests_{shape}_{size}.bin")
+    game_data.write_binary_catalog(quests, binary_file, 'quests')
+    timings['load_quests_binary'] = best_time(lambda: game_data.load_quests(binary_file), repeat)
+    items = game_data.load_items(item_file)
+    item_binary_file = os.path.join(directory, f"items_{size}.bin")
+    game_data.write_binary_catalog(items, item_binary_file, 'items')
+    timings['load_items_binary'] = best_time(lambda: game_data.load_items(item_binary_file), repeat)
+    graph = quest_handler.build_quest_graph(quests)
+    level_index = game_data.QuestLevelIndex(quests)
+    cost_index = game_data.ItemCostIndex(items)
+    last_quest = f"quest_{size - 1}"
+    character = {'level': 25, 'active_quests': [],
+                 'completed_quests': [f"quest_{i}" for i in range(0, size, max(1, size // 100))]}
+
+    timings['build_quest_graph'] = best_time(lambda: quest_handler.build_quest_graph(quests), repeat)
+    timings['validate_quest_prerequisites'] = best_time(
+        lambda: quest_handler.validate_quest_prerequisites(quests), repeat)
+    timings['get_available_quests'] = best_time(
+        lambda: quest_handler.get_available_quests(character, quests), repeat)
+    timings['get_available_quests_graph'] = best_time(
+        lambda: quest_handler.get_available_quests(character, quests, graph), repeat)
+    timings['get_quest_prerequisite_chain'] = best_time(
+        lambda: quest_handler.get_quest_prerequisite_chain(last_quest, quests), repeat)
+    timings['get_quests_by_level'] = best_time(
+        lambda: quest_handler.get_quests_by_level(quests, 5, 10), repeat)
+    timings['get_quests_by_level_index'] = best_time(
+        lambda: quest_handler.get_quests_by_level(quests, 5, 10, level_index), repeat)
+    timings['get_shop_items'] = best_time(
+        lambda: inventory_system.get_shop_items(items, 'consumable', 50), repeat)
+    timings['get_shop_items_index'] = best_time(
+        lambda: inventory_system.get_shop_items(items, 'consumable', 50, cost_index), repeat)
+    return timings
+
+def run(sizes, shapes, repeat=3, seed=0, output=None):
+    """
+    Run the benchmark matrix
+    
+    Returns: Results dictionary (also written to output as JSON if given)
+    """
+    results = {
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'timestamp': time.strftime("%Y-%m-%dT%H:%M:%S"),
+        'seed': seed,
+        'repeat': repeat,
+        'results': []
+    }
+    with tempfile.TemporaryDirectory() as directory:
+        for shape in shapes:
+            for size in sizes:
+                timings = benchmark_size(directory, size, shape, repeat, seed)
+                for name, seconds in timings.items():
+                    results['results'].append(
+                        {'shape': shape, 'size': size, 'benchmark': name, 'seconds': seconds})
+                    print(f"{shape:>7} {size:>8} {name:<32} {seconds * 1000:10.2f} ms")
+    if output:
+        with open(output, 'w') as file:
+            json.dump(results, file, indent=2)
+        print(f"Results written to {output}")
+    return results
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run_benchmarks")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--shapes', choices=QUEST_SHAPES, nargs='+', default=list(QUEST_SHAPES))
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default="benchmark_results.json")
+    args = parser.parse_args(argv)
+    run(args.sizes, args.shapes, args.repeat, args.seed, args.output)
+
+if __name__ == "__main__":
+    main()
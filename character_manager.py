@@ -10,8 +10,17 @@ This module handles character creation, loading, and saving.
 """
 
 from fileinput import filename
+import contextlib
+import functools
+import math
+import numbers
 import os
+import threading
+import weakref
+from collections.abc import Iterable, MutableSequence
 
+import inventory_storage
+import save_backends
 from custom_exceptions import (
     InvalidCharacterClassError,
     CharacterNotFoundError,
@@ -66,12 +75,12 @@ def create_character(name, character_class):
         'magic': base_stats[character_class]['magic'],
         'experience': 0,
         'gold': 100,
-        'inventory': [],
+        'inventory': inventory_storage.Inventory(),
         'active_quests': [],
         'completed_quests': []
     }
 
-    return character_data
+    return TrackedCharacter(character_data)
 
 def save_character(character, save_directory="data/save_games"):
     """
@@ -93,36 +102,40 @@ def save_character(character, save_directory="data/save_games"):
     ACTIVE_QUESTS: quest1,quest2
     COMPLETED_QUESTS: quest1,quest2
     
+    With a sqlite or log backend selected (see set_save_backend) the same
+    record is stored in that backend's single file instead.
+    
+    A TrackedCharacter with no fields changed since it was last saved to
+    (or loaded from) this directory is not written again while the
+    backend still has its save; the log backend only writes the fields
+    that changed.
+    
     Returns: True if successful
     Raises: PermissionError, IOError (let them propagate or handle)
     """
-    # TODO: Implement save functionality
-    # Create save_directory if it doesn't exist
-    # Handle any file I/O errors appropriately
-    # Lists should be saved as comma-separated values
+    target = (save_backend, save_directory)
+    tracked = isinstance(character, TrackedCharacter)
+    epoch = _save_epoch(character['name'], save_directory)
+    fields = character.dirty_fields(target, epoch) if tracked else None
+    if fields == []:
+        if _has_save(character['name'], save_directory):
+            with _save_stats_lock:
+                save_stats['skipped'] += 1
+            return True
+        fields = None  # The save vanished since it was written
+    # Lists are saved as comma-separated values by every backend
     try:
-        if not os.path.exists(save_directory):
-            os.makedirs(save_directory)
-        filename = os.path.join(save_directory, f"{character['name']}_save.txt")
-        with open(filename, 'w') as file:
-            file.write(f"NAME: {character['name']}\n")
-            file.write(f"CLASS: {character['class']}\n")
-            file.write(f"LEVEL: {character['level']}\n")
-            file.write(f"HEALTH: {character['health']}\n")
-            file.write(f"MAX_HEALTH: {character['max_health']}\n")
-            file.write(f"STRENGTH: {character['strength']}\n")
-            file.write(f"MAGIC: {character['magic']}\n")
-            file.write(f"EXPERIENCE: {character['experience']}\n")
-            file.write(f"GOLD: {character['gold']}\n")
-            file.write(f"INVENTORY: {','.join(character['inventory'])}\n")
-            file.write(f"ACTIVE_QUESTS: {','.join(character['active_quests'])}\n")
-            file.write(f"COMPLETED_QUESTS: {','.join(character['completed_quests'])}\n")
-
+        written = save_backend.save(character, save_directory, fields)
     except (PermissionError, IOError) as e:
         # Handle file I/O errors
         print(f"Error saving character: {e}")
         return False
-
+    with _save_stats_lock:
+        save_stats['saved'] += 1
+        # Backends that just return True rewrote every field
+        save_stats['fields_written'] += written if type(written) is int else len(save_backends.SAVE_FIELDS)
+    if tracked:
+        character.mark_clean(target, epoch)
     return True
 
 def load_character(character_name, save_directory="data/save_games"):
@@ -139,73 +152,344 @@ def load_character(character_name, save_directory="data/save_games"):
         SaveFileCorruptedError if file exists but can't be read
         InvalidSaveDataError if data format is wrong
     """
-    # TODO: Implement load functionality
-    filename = os.path.join(save_directory, f"{character_name}_save.txt")
-    if not os.path.exists(filename):
-        raise CharacterNotFoundError(f"Character '{character_name}' not found.")    # Check if file exists → CharacterNotFoundError
-    character = {}
-    try:
-        with open(filename, 'r') as file:
-            for line in file:
-                line = line.strip()
-                if not line:  # Skip empty lines
-                    continue
-                if ':' not in line:  # Skip lines that don't have a colon
-                    continue
-                
-                # Handle both "KEY: value" and "KEY:" formats
-                if ': ' in line:
-                    key, value = line.split(': ', 1)
-                else:
-                    key, value = line.split(':', 1)
-                
-                character[key.lower()] = value.strip()  # Strip whitespace from value, but keep empty strings
-    except Exception as e:
-        raise SaveFileCorruptedError(f"{e} exists but can't be read") from e # Try to read file → SaveFileCorruptedError
-
-    if not all(key in character for key in ['name', 'class', 'level', 'health', 'max_health', 'strength', 'magic', 'experience', 'gold', 'inventory', 'active_quests', 'completed_quests']):
-        raise InvalidSaveDataError(f"Save file for '{character_name}' is invalid.") # Validate data format → InvalidSaveDataError
-
-    # Parse comma-separated lists back into Python lists
-    character['inventory'] = character['inventory'].split(',') if character['inventory'] else []
-    character['active_quests'] = character['active_quests'].split(',') if character['active_quests'] else []
-    character['completed_quests'] = character['completed_quests'].split(',') if character['completed_quests'] else []
-
-    return character    
+    character = TrackedCharacter(save_backend.load(character_name, save_directory))
+    character.mark_clean((save_backend, save_directory), _save_epoch(character_name, save_directory))
+    return character
 
-def list_saved_characters(save_directory="data/save_games"):
+def list_saved_characters(save_directory="data/save_games", prefix="", offset=0, limit=None):
     """
     Get list of all saved character names
     
+    Names come back sorted. Pass prefix to only list names starting with
+    it, and offset/limit to fetch one page at a time.
+    
     Returns: List of character names (without _save.txt extension)
     """
-    # TODO: Implement this function
-    # Return empty list if directory doesn't exist
-    if not os.path.exists(save_directory):
-        return []
-    character_names = []
-    for filename in os.listdir(save_directory):
-        if filename.endswith("_save.txt"):
-            character_name = filename[:-9]  # Remove '_save.txt'
-            character_names.append(character_name)
-    # Extract character names from filenames
+    return save_backend.list_names(save_directory, prefix, offset, limit)
+
+def count_saved_characters(save_directory="data/save_games", prefix=""):
+    """Return how many saved characters have names starting with prefix"""
+    return save_backend.count_names(save_directory, prefix)
 
-    return character_names
+def load_characters(names, save_directory="data/save_games", max_workers=8):
+    """
+    Load many characters at once using a thread pool
+    
+    A save that can't be loaded doesn't stop the batch; its error is
+    reported instead.
+    
+    Args:
+        names: Character names to load (duplicates are loaded once)
+        save_directory: Directory containing save files
+        max_workers: Number of loader threads (1 loads serially)
+    
+    Returns: (characters, errors) where characters maps name → character
+             and errors maps name → CharacterNotFoundError,
+             SaveFileCorruptedError or InvalidSaveDataError
+    """
+    names = list(dict.fromkeys(names))
+    
+    def load_one(name):
+        try:
+            return name, load_character(name, save_directory), None
+        except (CharacterNotFoundError, SaveFileCorruptedError, InvalidSaveDataError) as e:
+            return name, None, e
+    
+    def load_chunk(chunk):
+        return [load_one(name) for name in chunk]
+    
+    workers = min(max_workers, len(names))
+    if workers <= 1:
+        results = load_chunk(names)
+    else:
+        # One contiguous chunk per thread keeps per-task overhead out of the way
+        from concurrent.futures import ThreadPoolExecutor
+        size = -(-len(names) // workers)
+        chunks = [names[start:start + size] for start in range(0, len(names), size)]
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = [result for chunk in executor.map(load_chunk, chunks) for result in chunk]
+    
+    characters = {}
+    errors = {}
+    for name, character, error in results:
+        if error is None:
+            characters[name] = character
+        else:
+            errors[name] = error
+    return characters, errors
 
 def delete_character(character_name, save_directory="data/save_games"):
     """
     Delete a character's save file
     
+    The backend bumps the character's save epoch, so a TrackedCharacter
+    saved before the delete is written in full the next time it is saved.
+    
     Returns: True if deleted successfully
     Raises: CharacterNotFoundError if character doesn't exist
     """
-    # TODO: Implement character deletion
-    # Verify file exists before attempting deletion
-    filename = os.path.join(save_directory, f"{character_name}_save.txt")
-    if not os.path.exists(filename):
-        raise CharacterNotFoundError(f"Character '{character_name}' not found.")
-    os.remove(filename)
-    return True
+    return save_backend.delete(character_name, save_directory)
+
+# ============================================================================
+# DIRTY TRACKING
+# ============================================================================
+
+# Save counters: writes done, writes skipped because nothing changed,
+# and the number of fields written. Saves run on SaveQueue and async
+# worker threads too, so updates hold _save_stats_lock.
+save_stats = {'saved': 0, 'skipped': 0, 'fields_written': 0}
+_save_stats_lock = threading.Lock()
+
+class TrackedCharacter(dict):
+    """
+    Character dictionary that knows which fields changed since its last save
+    
+    It behaves exactly like the plain dict it wraps. When it is saved or
+    loaded, a copy of the saved values is kept along with where they
+    were saved; dirty_fields() compares against that copy, so in-place
+    changes such as character['inventory'].append(...) are seen too.
+    
+    The save epoch recorded with the saved values changes whenever the
+    backend deletes the character, so a save deleted through the game is
+    always rewritten. If the save file is changed behind the character's
+    back, call mark_dirty() so the next save writes everything.
+    """
+
+    __slots__ = ('saved_values', 'save_target', 'save_epoch', 'source')
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.saved_values = None
+        self.save_target = None
+        self.save_epoch = 0
+        self.source = None
+
+    def dirty_fields(self, target=None, epoch=0):
+        """
+        Return the save fields that differ from the last save to target
+        
+        Every field is dirty if the character was never saved there, or
+        was deleted there since (the target's epoch moved on).
+        """
+        if self.saved_values is None or (target is not None and
+                                         (target != self.save_target or epoch != self.save_epoch)):
+            return list(save_backends.SAVE_FIELDS)
+        return [field for field in save_backends.SAVE_FIELDS
+                if self.get(field) != self.saved_values.get(field)]
+
+    def is_dirty(self, target=None, epoch=0):
+        """Return True if any save field changed since the last save"""
+        return bool(self.dirty_fields(target, epoch))
+
+    def mark_clean(self, target=None, epoch=0):
+        """Record the current values as saved to target at the given save epoch"""
+        saved_values = {field: save_backends.copy_value(value) for field, value in self.items()}
+        self.saved_values = saved_values
+        self.save_target = target
+        self.save_epoch = epoch
+        # A queued snapshot's save also counts for the character it was taken from
+        if self.source is not None:
+            self.source.saved_values = saved_values
+            self.source.save_target = target
+            self.source.save_epoch = epoch
+
+    def mark_dirty(self):
+        """Forget the last save so every field is written next time"""
+        self.saved_values = None
+        self.save_target = None
+
+    def snapshot(self):
+        """Copy the character, its saved values and where they were saved"""
+        copy = TrackedCharacter({key: save_backends.copy_value(value) for key, value in self.items()})
+        copy.saved_values = self.saved_values
+        copy.save_target = self.save_target
+        copy.save_epoch = self.save_epoch
+        copy.source = self
+        return copy
+
+def _save_epoch(character_name, save_directory):
+    """Return the backend's save epoch for a character (0 if it doesn't keep one)"""
+    save_epoch = getattr(save_backend, 'save_epoch', None)
+    return save_epoch(character_name, save_directory) if save_epoch else 0
+
+def _has_save(character_name, save_directory):
+    """Return True if the backend still has a character's save (False if it can't tell)"""
+    has_save = getattr(save_backend, 'has_save', None)
+    return has_save(character_name, save_directory) if has_save else False
+
+def get_save_stats():
+    """Return a copy of the save counters"""
+    with _save_stats_lock:
+        return dict(save_stats)
+
+def reset_save_stats():
+    """Zero the save counters"""
+    with _save_stats_lock:
+        for key in save_stats:
+            save_stats[key] = 0
+
+# ============================================================================
+# SAVE BACKENDS
+# ============================================================================
+
+# Backend used by save/load/list/delete; text files unless changed
+save_backend = save_backends.TextSaveBackend()
+
+def set_save_backend(backend):
+    """
+    Select where characters are saved
+    
+    Args:
+        backend: 'text', 'binary', 'sqlite', 'log', or a backend instance
+                 with save/load/list_names/delete methods
+    
+    Returns: The backend now in use
+    Raises: ValueError if the backend name is unknown
+    """
+    global save_backend
+    if isinstance(backend, str):
+        backend = save_backends.create_backend(backend)
+    save_backend = backend
+    return save_backend
+
+def get_save_backend():
+    """Return the backend currently used for saves"""
+    return save_backend
+
+def migrate_saves(source, destination, save_directory="data/save_games"):
+    """
+    Copy every saved character from one backend to another
+    
+    Args:
+        source, destination: Backend names or instances
+    
+    Returns: Number of characters copied
+    """
+    if isinstance(source, str):
+        source = save_backends.create_backend(source)
+    if isinstance(destination, str):
+        destination = save_backends.create_backend(destination)
+    count = 0
+    for name in source.list_names(save_directory):
+        destination.save(source.load(name, save_directory), save_directory)
+        count += 1
+    return count
+
+# ============================================================================
+# ASYNC SAVE API
+# ============================================================================
+
+# Threads shared by every async save/load call
+ASYNC_MAX_WORKERS = 8
+
+# Async file operations allowed at once in one save directory
+ASYNC_DIRECTORY_LIMIT = 4
+
+_async_executor = None
+_async_limits = weakref.WeakKeyDictionary()  # event loop → _AsyncIOLimits
+
+class _AsyncIOLimits:
+    """Per-event-loop directory semaphores and per-character write locks"""
+
+    def __init__(self):
+        self.directories = {}
+        self.writers = {}  # (directory, name) → [asyncio.Lock, users]
+
+    def directory(self, save_directory):
+        import asyncio
+        if save_directory not in self.directories:
+            self.directories[save_directory] = asyncio.Semaphore(ASYNC_DIRECTORY_LIMIT)
+        return self.directories[save_directory]
+
+    @contextlib.asynccontextmanager
+    async def writer(self, save_directory, character_name):
+        """Hold the write lock for one character, dropping it once unused"""
+        import asyncio
+        key = (save_directory, character_name)
+        entry = self.writers.get(key)
+        if entry is None:
+            entry = self.writers[key] = [asyncio.Lock(), 0]
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                yield
+        finally:
+            entry[1] -= 1
+            if entry[1] == 0:
+                del self.writers[key]
+
+def _get_async_limits():
+    import asyncio
+    loop = asyncio.get_running_loop()
+    if loop not in _async_limits:
+        _async_limits[loop] = _AsyncIOLimits()
+    return _async_limits[loop]
+
+def _get_async_executor():
+    global _async_executor
+    if _async_executor is None:
+        from concurrent.futures import ThreadPoolExecutor
+        _async_executor = ThreadPoolExecutor(max_workers=ASYNC_MAX_WORKERS,
+                                             thread_name_prefix="save-io")
+    return _async_executor
+
+def shutdown_async_io(wait=True):
+    """Stop the async I/O threads (they are started again when next needed)"""
+    global _async_executor
+    if _async_executor is not None:
+        _async_executor.shutdown(wait=wait)
+        _async_executor = None
+
+async def _run_save_io(save_directory, function, *args):
+    """Run blocking save work on the executor within the directory's limit"""
+    import asyncio
+    async with _get_async_limits().directory(os.path.abspath(save_directory)):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_get_async_executor(), functools.partial(function, *args))
+
+def async_save_character(character, save_directory="data/save_games"):
+    """
+    save_character for asyncio code: await async_save_character(character)
+    
+    The character is copied when this is called (not when the result is
+    awaited), so it can keep changing while the save runs. Saves and
+    deletes of the same character never overlap; they take turns in the
+    order their coroutines start, not the order of the calls.
+    asyncio.gather and create_task start them in the order given.
+    
+    Returns: Awaitable giving True if successful, False on file errors
+             (as save_character)
+    """
+    return _async_save_snapshot(save_backends.snapshot_character(character), save_directory)
+
+async def _async_save_snapshot(snapshot, save_directory):
+    async with _get_async_limits().writer(os.path.abspath(save_directory), snapshot['name']):
+        return await _run_save_io(save_directory, save_character, snapshot, save_directory)
+
+async def async_load_character(character_name, save_directory="data/save_games"):
+    """
+    load_character for asyncio code
+    
+    Raises: CharacterNotFoundError, SaveFileCorruptedError, InvalidSaveDataError
+    """
+    return await _run_save_io(save_directory, load_character, character_name, save_directory)
+
+async def async_list_saved_characters(save_directory="data/save_games", prefix="", offset=0, limit=None):
+    """list_saved_characters for asyncio code"""
+    return await _run_save_io(save_directory, list_saved_characters, save_directory, prefix, offset, limit)
+
+async def async_count_saved_characters(save_directory="data/save_games", prefix=""):
+    """count_saved_characters for asyncio code"""
+    return await _run_save_io(save_directory, count_saved_characters, save_directory, prefix)
+
+async def async_delete_character(character_name, save_directory="data/save_games"):
+    """
+    delete_character for asyncio code (waits for saves of the character already running)
+    
+    Raises: CharacterNotFoundError if character doesn't exist
+    """
+    async with _get_async_limits().writer(os.path.abspath(save_directory), character_name):
+        return await _run_save_io(save_directory, delete_character, character_name, save_directory)
 
 # ============================================================================
 # CHARACTER OPERATIONS
@@ -232,17 +516,68 @@ def gain_experience(character, xp_amount):
     # Add experience
     character['experience'] += xp_amount
 
-    # Check for level up (can level up multiple times)
-    while character['experience'] >= character['level'] * 100:
-        character['level'] += 1
-        character['max_health'] += 10
-        character['strength'] += 2
-        character['magic'] += 2
+    # Check for level up (can level up multiple times), solved in one step
+    levels, character['experience'] = compute_level_ups(character['level'], character['experience'])
+    if levels:
+        character['level'] += levels
+        character['max_health'] += 10 * levels
+        character['strength'] += 2 * levels
+        character['magic'] += 2 * levels
         character['health'] = character['max_health']
-        character['experience'] -= character['level'] * 100
 
     return character
 
+def compute_level_ups(level, experience):
+    """
+    Work out the level ups the gain_experience rules give, without looping
+    
+    The rules, applied while experience >= level * 100: the level goes
+    up by one and experience drops by the *new* level * 100. After k
+    level ups experience has dropped by 100 * (k*level + k*(k+1)/2), and
+    another level up happens while
+    
+        k*k + (2*level + 3)*k + 2*level <= 2 * (experience // 100)
+    
+    so k is found from the root of that quadratic with math.isqrt.
+    
+    Returns: (levels gained, experience left over)
+    """
+    if not isinstance(level, int) or not isinstance(experience, int) or level < 0:
+        # Unusual values: apply the rules one step at a time
+        levels = 0
+        while experience >= (level + levels) * 100:
+            levels += 1
+            experience -= (level + levels) * 100
+        return levels, experience
+    
+    budget = experience // 100
+    if level > budget:
+        return 0, experience
+    
+    def needed(step):
+        return step * step + (2 * level + 3) * step + 2 * level
+    
+    # Largest step with needed(step) <= 2 * budget; isqrt may be off by one
+    step = (math.isqrt(4 * level * level + 4 * level + 9 + 8 * budget) - (2 * level + 3)) // 2
+    while needed(step + 1) <= 2 * budget:
+        step += 1
+    while step > 0 and needed(step) > 2 * budget:
+        step -= 1
+    levels = step + 1
+    return levels, experience - 100 * (levels * level + levels * (levels + 1) // 2)
+
+def xp_to_next_level(character):
+    """Return how much more experience the character needs to level up"""
+    return max(0, character['level'] * 100 - character['experience'])
+
+def level_for_total_xp(total_xp, level=1):
+    """
+    Return the level a character reaches after gaining total_xp
+    
+    Starts from the given level with no experience, as a new character does.
+    """
+    return level + compute_level_ups(level, total_xp)[0]
+
 def add_gold(character, amount):
     """
     Add gold to character's inventory
@@ -305,6 +640,294 @@ def revive_character(character):
     character['health'] = character['max_health'] // 2
     return True
 
+# ============================================================================
+# WHAT-IF BRANCHES
+# ============================================================================
+
+def _is_mutable(value):
+    return isinstance(value, (list, MutableSequence))
+
+class CharacterBranch(dict):
+    """
+    Copy-on-write fork of a character for what-if simulation
+    
+    A branch is a character dictionary that can be passed to any
+    function in the game. Forking copies only the dictionary of field
+    references; lists (inventory, quests) stay shared between branches
+    until one branch reads or changes them, at which point that branch
+    takes its own copy. Numbers and strings are never copied.
+    
+    Branches don't affect each other or the character they came from
+    until commit() copies one back.
+    
+    Note: dict(branch) and TrackedCharacter(branch) copy raw references,
+    so use branch.copy() or branch.fork() to duplicate a branch. Pickling
+    a branch gives a plain dictionary of its current state, without the
+    link back to the original character.
+    """
+
+    __slots__ = ('origin', '_mutable', '_shared')
+
+    def fork(self):
+        """Return a new branch starting from this branch's current state"""
+        child = CharacterBranch(self._raw_items())
+        child.origin = self.origin
+        child._mutable = set(self._mutable)
+        child._shared = set(self._mutable)
+        # The lists are now shared both ways
+        self._shared = set(self._mutable)
+        return child
+
+    def commit(self):
+        """
+        Make the original character match this branch
+        
+        Returns: The original character
+        """
+        origin = self.origin
+        for key in [key for key in origin if key not in self]:
+            del origin[key]
+        for key, value in self._raw_items():
+            origin[key] = save_backends.copy_value(value) if key in self._mutable else value
+        return origin
+
+    def _raw_items(self):
+        return dict.items(self)
+
+    def _own(self, key):
+        """Replace a shared list with this branch's own copy"""
+        self._shared.discard(key)
+        dict.__setitem__(self, key, save_backends.copy_value(dict.__getitem__(self, key)))
+
+    def _own_all(self):
+        for key in list(self._shared):
+            self._own(key)
+
+    def __getitem__(self, key):
+        if key in self._shared:
+            self._own(key)
+        return dict.__getitem__(self, key)
+
+    def __setitem__(self, key, value):
+        self._shared.discard(key)
+        if _is_mutable(value):
+            self._mutable.add(key)
+        else:
+            self._mutable.discard(key)
+        dict.__setitem__(self, key, value)
+
+    def __delitem__(self, key):
+        self._shared.discard(key)
+        self._mutable.discard(key)
+        dict.__delitem__(self, key)
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def pop(self, key, *default):
+        if key in self._shared:
+            self._own(key)
+        self._mutable.discard(key)
+        return dict.pop(self, key, *default)
+
+    def popitem(self):
+        self._own_all()
+        key, value = dict.popitem(self)
+        self._mutable.discard(key)
+        return key, value
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def clear(self):
+        self._shared.clear()
+        self._mutable.clear()
+        dict.clear(self)
+
+    def items(self):
+        self._own_all()
+        return dict.items(self)
+
+    def values(self):
+        self._own_all()
+        return dict.values(self)
+
+    def copy(self):
+        return self.fork()
+
+    def __reduce__(self):
+        return (dict, ({key: save_backends.copy_value(value) for key, value in self._raw_items()},))
+
+def fork_character(character):
+    """
+    Start a what-if branch from a character
+    
+    Forking a branch is cheap (no lists are copied). Forking a regular
+    character copies its lists once, so to try many futures fork once
+    and then call .fork() on that branch for each future.
+    
+    Returns: CharacterBranch whose commit() writes back to character
+    """
+    if isinstance(character, CharacterBranch):
+        return character.fork()
+    values = dict.items(character)
+    branch = CharacterBranch({key: save_backends.copy_value(value) for key, value in values})
+    branch.origin = character
+    branch._mutable = {key for key, value in values if _is_mutable(value)}
+    branch._shared = set()
+    return branch
+
+def commit_character(branch):
+    """
+    Keep a what-if branch: copy its state back into the original character
+    
+    Returns: The original character
+    """
+    return branch.commit()
+
+# ============================================================================
+# BATCH REWARDS
+# ============================================================================
+
+# Character fields the batch path works on as arrays
+ROSTER_FIELDS = ['level', 'experience', 'gold', 'health', 'max_health', 'strength', 'magic']
+
+# Largest magnitude the NumPy path handles. The level-up quadratic squares
+# the level (4 * level * level), which only stays inside int64 below 2**30
+_BATCH_VALUE_LIMIT = 2 ** 30
+
+def grant_rewards(characters, xp_amount=0, gold_amount=0, use_numpy=None):
+    """
+    Give experience and gold to a whole roster at once
+    
+    Same result as calling gain_experience(character, xp) and then
+    add_gold(character, gold) on each character, stopping at the first
+    error for that character. With NumPy installed the roster's stats
+    are loaded into arrays and the level-up rule is applied to all of
+    them together; otherwise (or if the values don't fit the array path)
+    the scalar functions are used.
+    
+    Args:
+        characters: Sequence of character dictionaries (updated in place)
+        xp_amount: XP for everyone, or a sequence with one amount per character
+        gold_amount: Gold for everyone, or a sequence with one amount per character
+        use_numpy: True to require NumPy, False to never use it,
+                   None to use it if installed
+    
+    Returns: Dictionary mapping position in characters → the
+             CharacterDeadError or ValueError that character raised
+    """
+    characters = list(characters)
+    xp_amounts = _per_character(xp_amount, len(characters))
+    gold_amounts = _per_character(gold_amount, len(characters))
+    
+    numpy = None
+    if use_numpy is not False:
+        try:
+            import numpy
+        except ImportError:
+            if use_numpy:
+                raise
+    if numpy is not None and characters:
+        errors = _grant_rewards_numpy(numpy, characters, xp_amounts, gold_amounts)
+        if errors is not None:
+            return errors
+    
+    errors = {}
+    for position, character in enumerate(characters):
+        try:
+            gain_experience(character, xp_amounts[position])
+            add_gold(character, gold_amounts[position])
+        except (CharacterDeadError, ValueError) as e:
+            errors[position] = e
+    return errors
+
+def _per_character(amount, count):
+    """Expand a single amount (any number, e.g. 50.0 or a NumPy scalar) to one per character"""
+    if isinstance(amount, numbers.Number) or not isinstance(amount, Iterable):
+        return [amount] * count
+    amounts = list(amount)
+    if len(amounts) != count:
+        raise ValueError(f"Expected {count} amounts, got {len(amounts)}")
+    return amounts
+
+def _grant_rewards_numpy(numpy, characters, xp_amounts, gold_amounts):
+    """
+    Array version of grant_rewards
+    
+    Returns: The errors dictionary, or None (with nothing changed) if
+             the roster has values the array path can't handle exactly
+    """
+    columns = {field: numpy.array([character[field] for character in characters])
+               for field in ROSTER_FIELDS}
+    xp = numpy.array(xp_amounts)
+    gold = numpy.array(gold_amounts)
+    for array in list(columns.values()) + [xp, gold]:
+        if array.dtype.kind != 'i' or numpy.abs(array).max() > _BATCH_VALUE_LIMIT:
+            return None
+    level = columns['level']
+    if (level < 0).any():
+        return None
+    
+    alive = columns['health'] > 0
+    experience = numpy.where(alive, columns['experience'] + xp, columns['experience'])
+    
+    # compute_level_ups on every row: solve the quadratic, then fix rounding
+    budget2 = 2 * (experience // 100)
+    linear = 2 * level + 3
+    
+    def needed(step):
+        return step * step + linear * step + 2 * level
+    
+    root = numpy.sqrt(numpy.maximum(4 * level * level + 4 * level + 9 + 4 * budget2, 0))
+    step = numpy.maximum((root.astype(numpy.int64) - linear) // 2, 0)
+    while True:
+        up = needed(step + 1) <= budget2
+        if not up.any():
+            break
+        step += up
+    while True:
+        down = (step > 0) & (needed(step) > budget2)
+        if not down.any():
+            break
+        step -= down
+    levels = numpy.where(alive & (level <= budget2 // 2), step + 1, 0)
+    experience -= 100 * (levels * level + levels * (levels + 1) // 2)
+    
+    max_health = columns['max_health'] + 10 * levels
+    health = numpy.where(levels > 0, max_health, columns['health'])
+    new_gold = columns['gold'] + gold
+    gold_ok = new_gold >= 0
+    new_gold = numpy.where(alive & gold_ok, new_gold, columns['gold'])
+    
+    # Write back as Python ints
+    errors = {}
+    rows = zip(characters, alive.tolist(), gold_ok.tolist(), levels.tolist(), experience.tolist(),
+               max_health.tolist(), health.tolist(), new_gold.tolist())
+    for position, (character, is_alive, is_gold_ok, gained, xp_left, max_hp, hp, gold_total) in enumerate(rows):
+        if not is_alive:
+            errors[position] = CharacterDeadError(
+                f"Character '{character['name']}' is dead and cannot gain experience.")
+            continue
+        character['experience'] = xp_left
+        if gained:
+            character['level'] += gained
+            character['max_health'] = max_hp
+            character['strength'] += 2 * gained
+            character['magic'] += 2 * gained
+            character['health'] = hp
+        if is_gold_ok:
+            character['gold'] = gold_total
+        else:
+            errors[position] = ValueError("Gold amount cannot be negative.")
+    return errors
+
 # ============================================================================
 # VALIDATION
 # ============================================================================
@@ -320,22 +943,15 @@ def validate_character_data(character):
     Returns: True if valid
     Raises: InvalidSaveDataError if missing fields or invalid types
     """
-    # TODO: Implement validation
-    # Check all required keys exist
-    # Check that numeric values are numbers
-    # Check that lists are actually lists
-    required_fields = [
-        'name', 'class', 'level', 'health', 'max_health',
-        'strength', 'magic', 'experience', 'gold',
-        'inventory', 'active_quests', 'completed_quests'
-    ]
-    for field in required_fields:
+    # Checked against the same field table the save decoder uses
+    for field in save_backends.SAVE_FIELDS:
         if field not in character:
             raise InvalidSaveDataError(f"Missing field: {field}")
-    if not isinstance(character['level'], int) or not isinstance(character['health'], int) or not isinstance(character['max_health'], int) or not isinstance(character['strength'], int) or not isinstance(character['magic'], int) or not isinstance(character['experience'], int) or not isinstance(character['gold'], int):
-        raise InvalidSaveDataError("Numeric fields must be integers.")
-    if not isinstance(character['inventory'], list) or not isinstance(character['active_quests'], list) or not isinstance(character['completed_quests'], list):
-        raise InvalidSaveDataError("Inventory and quests must be lists.")
+    for field, field_type, decoder in save_backends.SAVE_SCHEMA:
+        if field_type is int and not isinstance(character[field], int):
+            raise InvalidSaveDataError("Numeric fields must be integers.")
+        if field_type is list and not isinstance(character[field], (list, MutableSequence)):
+            raise InvalidSaveDataError("Inventory and quests must be lists.")
     return True
 
 # ============================================================================
@@ -11,17 +11,129 @@ This module handles loading and validating game data from text files.
 
 from fileinput import filename
 import os
+import hashlib
+import mmap
+import pickle
+import re
+import sys
+import glob
+import struct
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Mapping
 from custom_exceptions import (
+    DataError,
     InvalidDataFormatError,
     MissingDataFileError,
     CorruptedDataError
 )
 
+# Compiled catalogs are stored next to the source file in this directory
+CACHE_DIRECTORY = ".cache"
+
+# Bump whenever the shape of loaded records changes so old caches are ignored
+CACHE_VERSION = 3
+
+# Character stats an item effect is allowed to modify
+VALID_EFFECT_STATS = ('health', 'max_health', 'strength', 'magic')
+
+# Field rules shared by the validators
+REQUIRED_QUEST_FIELDS = ['quest_id', 'title', 'description', 'reward_xp',
+                         'reward_gold', 'required_level', 'prerequisite']
+QUEST_INTEGER_FIELDS = ['reward_xp', 'reward_gold', 'required_level']
+REQUIRED_ITEM_FIELDS = ['item_id', 'name', 'type', 'effect', 'cost', 'description']
+ITEM_INTEGER_FIELDS = ['cost']
+VALID_ITEM_TYPES = ['weapon', 'armor', 'consumable']
+
+# ============================================================================
+# RECORD TYPES
+# ============================================================================
+
+class _Record(Mapping):
+    """
+    Base class for compact, read-only catalog records
+    
+    Subclasses list their fields in FIELDS and store them in __slots__, so
+    a record has no per-instance __dict__. Records still act like the old
+    dictionaries: record['field'], 'field' in record, record.get(),
+    iteration and == against a plain dict all work.
+    """
+    __slots__ = ()
+    FIELDS = ()
+    _FIELD_SET = frozenset()
+    
+    @classmethod
+    def from_dict(cls, data):
+        """Build a record from a parsed (and validated) dictionary"""
+        return cls(**{field: data[field] for field in cls.FIELDS if field in data})
+    
+    def __getitem__(self, key):
+        if key not in self._FIELD_SET:
+            raise KeyError(key)
+        return getattr(self, key)
+    
+    def __contains__(self, key):
+        return key in self._FIELD_SET
+    
+    def __iter__(self):
+        return iter(self.FIELDS)
+    
+    def __len__(self):
+        return len(self.FIELDS)
+    
+    def to_dict(self):
+        """Return the record as a plain dictionary"""
+        return {field: getattr(self, field) for field in self.FIELDS}
+    
+    def __reduce__(self):
+        return (self.__class__, tuple(getattr(self, field) for field in self.FIELDS))
+    
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.to_dict()!r})"
+
+class Quest(_Record):
+    """A quest loaded from the quest catalog"""
+    FIELDS = ('quest_id', 'title', 'description', 'reward_xp',
+              'reward_gold', 'required_level', 'prerequisite')
+    _FIELD_SET = frozenset(FIELDS)
+    __slots__ = FIELDS
+    
+    def __init__(self, quest_id, title, description, reward_xp,
+                 reward_gold, required_level, prerequisite):
+        # Ids are interned so prerequisite links share one string per quest
+        self.quest_id = sys.intern(quest_id)
+        self.title = title
+        self.description = description
+        self.reward_xp = reward_xp
+        self.reward_gold = reward_gold
+        self.required_level = required_level
+        self.prerequisite = sys.intern(prerequisite)
+
+class Item(_Record):
+    """
+    An item loaded from the item catalog
+    
+    'effect' is the raw text from the file; 'effects' is the same effect
+    parsed into a tuple of (stat, delta) pairs.
+    """
+    FIELDS = ('item_id', 'name', 'type', 'effect', 'cost', 'description', 'effects')
+    _FIELD_SET = frozenset(FIELDS)
+    __slots__ = FIELDS
+    
+    def __init__(self, item_id, name, type, effect, cost, description, effects=None):
+        self.item_id = sys.intern(item_id)
+        self.name = name
+        self.type = sys.intern(type)
+        self.effect = effect
+        self.cost = cost
+        self.description = description
+        self.effects = effects if effects is not None else parse_item_effects(effect)
+
 # ============================================================================
 # DATA LOADING FUNCTIONS
 # ============================================================================
 
-def load_quests(filename="data/quests.txt"):
+def load_quests(filename="data/quests.txt", use_cache=False):
     """
     Load quest data from file
     
@@ -34,7 +146,11 @@ def load_quests(filename="data/quests.txt"):
     REQUIRED_LEVEL: 1
     PREREQUISITE: previous_quest_id (or NONE)
     
-    Returns: Dictionary of quests {quest_id: quest_data_dict}
+    If use_cache is True, a compiled copy is kept in data/.cache/ and
+    reused (skipping parsing and validation) while the source is unchanged.
+    Binary catalogs (see write_binary_catalog) are also accepted.
+    
+    Returns: Dictionary of quests {quest_id: Quest}
     Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
     """
     # TODO: Implement this function
@@ -42,53 +158,86 @@ def load_quests(filename="data/quests.txt"):
     # - FileNotFoundError → raise MissingDataFileError
     # - Invalid format → raise InvalidDataFormatError
     # - Corrupted/unreadable data → raise CorruptedDataError
+    if is_binary_catalog(filename):
+        return load_binary_catalog(filename, 'quests')
+    if use_cache:
+        return load_cached_catalog(filename, 'quests', iter_quests)
+    return {quest['quest_id']: quest for quest in iter_quests(filename)}
+
+def load_items(filename="data/items.txt", use_cache=False):
+    """
+    Load item data from file
+    
+    Expected format per item (separated by blank lines):
+    ITEM_ID: unique_item_name
+    NAME: Item Display Name
+    TYPE: weapon|armor|consumable
+    EFFECT: stat_name:value (e.g., strength:5 or health:20, or strength:3,magic:3)
+    COST: 100
+    DESCRIPTION: Item description
+    
+    If use_cache is True, a compiled copy is kept in data/.cache/ and
+    reused (skipping parsing and validation) while the source is unchanged.
+    Binary catalogs (see write_binary_catalog) are also accepted.
+    
+    Returns: Dictionary of items {item_id: Item}
+    Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
+    """
+    # TODO: Implement this function
+    # Must handle same exceptions as load_quests
+    if is_binary_catalog(filename):
+        return load_binary_catalog(filename, 'items')
+    if use_cache:
+        return load_cached_catalog(filename, 'items', iter_items)
+    return {item['item_id']: item for item in iter_items(filename)}
 
+def iter_quests(filename="data/quests.txt"):
+    """
+    Stream quests from file one block at a time
+    
+    The file is read line by line, so memory use stays flat no matter
+    how large the catalog is.
+    
+    Yields: One validated Quest record per block
+    Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
+    """
     try:
         with open(filename, 'r') as file:
-            content = file.read()
-            quests = {}
-            quest_blocks = content.strip().split('\n\n')
-            for block in quest_blocks:
-                lines = block.strip().split('\n')
+            found = False
+            for line_number, lines in _iter_blocks(file):
                 quest_data = parse_quest_block(lines)
                 validate_quest_data(quest_data)
-                quests[quest_data['quest_id']] = quest_data
-            return quests
+                found = True
+                yield Quest.from_dict(quest_data)
+            if not found:
+                raise InvalidDataFormatError(f"Quest data file '{filename}' contains no quests.")
     except FileNotFoundError:
         raise MissingDataFileError(f"Quest data file '{filename}' not found.")
     except InvalidDataFormatError as e:
         raise e
     except Exception as e:
         raise CorruptedDataError(f"Quest data file '{filename}' is corrupted: {e}")
-    
-def load_items(filename="data/items.txt"):
+
+def iter_items(filename="data/items.txt"):
     """
-    Load item data from file
+    Stream items from file one block at a time
     
-    Expected format per item (separated by blank lines):
-    ITEM_ID: unique_item_name
-    NAME: Item Display Name
-    TYPE: weapon|armor|consumable
-    EFFECT: stat_name:value (e.g., strength:5 or health:20)
-    COST: 100
-    DESCRIPTION: Item description
+    The file is read line by line, so memory use stays flat no matter
+    how large the catalog is.
     
-    Returns: Dictionary of items {item_id: item_data_dict}
+    Yields: One validated Item record per block
     Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
     """
-    # TODO: Implement this function
-    # Must handle same exceptions as load_quests
     try:
-        with open (filename, 'r') as file:
-            content = file.read()
-            items = {}
-            item_blocks = content.strip().split('\n\n')
-            for block in item_blocks:
-                lines = block.strip().split('\n')
+        with open(filename, 'r') as file:
+            found = False
+            for line_number, lines in _iter_blocks(file):
                 item_data = parse_item_block(lines)
                 validate_item_data(item_data)
-                items[item_data['item_id']] = item_data
-            return items
+                found = True
+                yield Item.from_dict(item_data)
+            if not found:
+                raise InvalidDataFormatError(f"Item data file '{filename}' contains no items.")
     except FileNotFoundError:
         raise MissingDataFileError(f"Item data file '{filename}' not found.")
     except InvalidDataFormatError as e:
@@ -96,6 +245,195 @@ def load_items(filename="data/items.txt"):
     except Exception as e:
         raise CorruptedDataError(f"Item data file '{filename}' is corrupted: {e}")
 
+def load_quest_dir(directory="data/quests", max_workers=None):
+    """
+    Load every quest shard (*.txt) in a directory
+    
+    Shards are parsed in parallel worker processes and merged. A quest id
+    may only be defined in one shard.
+    
+    Args:
+        directory: Directory containing quest shard files
+        max_workers: Number of worker processes (default: one per CPU)
+    
+    Returns: Dictionary of quests {quest_id: Quest}
+    Raises:
+        MissingDataFileError if the directory has no shards
+        InvalidDataFormatError if a shard is invalid or ids are duplicated
+        CorruptedDataError if a shard can't be read
+    """
+    return load_catalog_dir(directory, 'quests', max_workers)
+
+def load_item_dir(directory="data/items", max_workers=None):
+    """
+    Load every item shard (*.txt) in a directory
+    
+    Shards are parsed in parallel worker processes and merged. An item id
+    may only be defined in one shard.
+    
+    Args:
+        directory: Directory containing item shard files
+        max_workers: Number of worker processes (default: one per CPU)
+    
+    Returns: Dictionary of items {item_id: Item}
+    Raises:
+        MissingDataFileError if the directory has no shards
+        InvalidDataFormatError if a shard is invalid or ids are duplicated
+        CorruptedDataError if a shard can't be read
+    """
+    return load_catalog_dir(directory, 'items', max_workers)
+
+def load_catalog_dir(directory, kind, max_workers=None):
+    """
+    Parse the shards of a catalog directory in parallel and merge them
+    
+    Errors raised while parsing a shard already name that shard's file.
+    """
+    shards = sorted(glob.glob(os.path.join(directory, "*.txt")))
+    if not shards:
+        raise MissingDataFileError(f"No {kind} shards found in '{directory}'.")
+
+    if len(shards) == 1 or max_workers == 1:
+        results = map(_load_shard, shards, [kind] * len(shards))
+        return _merge_shards(shards, results, kind)
+    # Imported here because multiprocessing is slow to import at startup
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        results = executor.map(_load_shard, shards, [kind] * len(shards))
+        return _merge_shards(shards, results, kind)
+
+def _load_shard(filename, kind):
+    """Worker: parse one shard into a list of records"""
+    try:
+        if kind == 'quests':
+            return list(iter_quests(filename))
+        return list(iter_items(filename))
+    except InvalidDataFormatError as e:
+        if filename in e.message:
+            raise
+        raise InvalidDataFormatError(f"Shard '{filename}': {e.message}") from e
+
+def _merge_shards(shards, results, kind):
+    """
+    Merge per-shard record lists into one catalog
+    
+    Raises: InvalidDataFormatError if an id appears in two shards
+    """
+    id_field = 'quest_id' if kind == 'quests' else 'item_id'
+    catalog = {}
+    owners = {}
+    for shard, records in zip(shards, results):
+        for record in records:
+            record_id = record[id_field]
+            owner = owners.get(record_id)
+            if owner is not None and owner != shard:
+                raise InvalidDataFormatError(
+                    f"Duplicate {id_field} '{record_id}' in '{owner}' and '{shard}'.")
+            owners[record_id] = shard
+            catalog[record_id] = record
+    return catalog
+
+def load_cached_catalog(filename, kind, iter_records):
+    """
+    Load a catalog through its compiled sidecar cache
+    
+    Args:
+        filename: Source data file (e.g. data/quests.txt)
+        kind: 'quests' or 'items'
+        iter_records: Streaming parser used on a cache miss
+    
+    The cache is stored in {data_dir}/.cache/{name}.bin and is stamped with
+    the source file's size, mtime and SHA-256 hash. If size and mtime match
+    the cache is trusted; if only the mtime changed, the hash decides.
+    A stale or unreadable cache is simply rebuilt.
+    
+    Returns: Dictionary of records {record_id: record}
+    Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
+    """
+    id_field = 'quest_id' if kind == 'quests' else 'item_id'
+    try:
+        stat = os.stat(filename)
+    except OSError:
+        # Let the normal loader report the missing file
+        return {record[id_field]: record for record in iter_records(filename)}
+
+    cache_path = get_cache_path(filename)
+    header, catalog = _read_catalog_cache(cache_path)
+    if header is not None and header['kind'] == kind and header['size'] == stat.st_size:
+        if header['mtime_ns'] == stat.st_mtime_ns:
+            return catalog
+        digest = _hash_file(filename)
+        if header['sha256'] == digest:
+            _write_catalog_cache(cache_path, kind, stat, digest, catalog)
+            return catalog
+
+    digest = _hash_file(filename)
+    catalog = {record[id_field]: record for record in iter_records(filename)}
+    _write_catalog_cache(cache_path, kind, stat, digest, catalog)
+    return catalog
+
+def get_cache_path(filename):
+    """
+    Get the compiled cache path for a data file
+    
+    Example: data/quests.txt → data/.cache/quests.bin
+    """
+    directory, base = os.path.split(filename)
+    name = os.path.splitext(base)[0]
+    return os.path.join(directory, CACHE_DIRECTORY, name + ".bin")
+
+def _read_catalog_cache(cache_path):
+    """
+    Read a compiled catalog cache
+    
+    The header is pickled separately from the records so a stale cache
+    can be rejected without unpickling the whole catalog.
+    
+    Returns: Tuple of (header, catalog), or (None, None) if unusable
+    """
+    try:
+        with open(cache_path, 'rb') as file:
+            header = pickle.load(file)
+            if not isinstance(header, dict) or header.get('version') != CACHE_VERSION:
+                return None, None
+            return header, pickle.load(file)
+    except Exception:
+        return None, None
+
+def _write_catalog_cache(cache_path, kind, stat, digest, catalog):
+    """
+    Write a compiled catalog cache atomically
+    
+    Failures are ignored - the cache is only an optimization.
+    """
+    header = {
+        'version': CACHE_VERSION,
+        'kind': kind,
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'sha256': digest
+    }
+    temp_path = cache_path + ".tmp"
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        with open(temp_path, 'wb') as file:
+            pickle.dump(header, file, pickle.HIGHEST_PROTOCOL)
+            pickle.dump(catalog, file, pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, cache_path)
+    except OSError:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+
+def _hash_file(filename):
+    """Return the SHA-256 hex digest of a file's contents"""
+    digest = hashlib.sha256()
+    with open(filename, 'rb') as file:
+        for chunk in iter(lambda: file.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
 def validate_quest_data(quest_dict):
     """
     Validate that quest dictionary has all required fields
@@ -106,13 +444,11 @@ def validate_quest_data(quest_dict):
     Returns: True if valid
     Raises: InvalidDataFormatError if missing required fields
     """
-    required_fields = ['quest_id', 'title', 'description', 'reward_xp',
-                       'reward_gold', 'required_level', 'prerequisite']
-    for field in required_fields:
+    for field in REQUIRED_QUEST_FIELDS:
         if field not in quest_dict:
             raise InvalidDataFormatError(f"Missing required quest field: {field}")
     # Check that numeric values are actually numbers
-    for field in ['reward_xp', 'reward_gold', 'required_level']:
+    for field in QUEST_INTEGER_FIELDS:
         if field in quest_dict and not isinstance(quest_dict[field], int):
             raise InvalidDataFormatError(f"Field '{field}' must be an integer.")
     return True
@@ -123,18 +459,21 @@ def validate_item_data(item_dict):
     
     Required fields: item_id, name, type, effect, cost, description
     Valid types: weapon, armor, consumable
+    Effect must be "stat:value" pairs (comma separated) using VALID_EFFECT_STATS
     
     Returns: True if valid
     Raises: InvalidDataFormatError if missing required fields or invalid type
     """
-    required_fields = ['item_id', 'name', 'type', 'effect', 'cost', 'description']
-    for field in required_fields:
+    for field in REQUIRED_ITEM_FIELDS:
         if field not in item_dict:
             raise InvalidDataFormatError(f"Missing required item field: {field}")
-    if item_dict['type'] not in ['weapon', 'armor', 'consumable']:
+    if item_dict['type'] not in VALID_ITEM_TYPES:
         raise InvalidDataFormatError(f"Invalid item type: {item_dict['type']}")
+    # Effects are normally parsed by parse_item_block; check hand-built dicts too
+    if 'effects' not in item_dict:
+        parse_item_effects(item_dict['effect'])
     # Check that numeric values are actually numbers
-    for field in ['cost']:
+    for field in ITEM_INTEGER_FIELDS:
         if field in item_dict and not isinstance(item_dict[field], int):
             raise InvalidDataFormatError(f"Field '{field}' must be an integer.")
     return True
@@ -176,6 +515,808 @@ def create_default_data_files():
             )
             itf.close()
 
+# ============================================================================
+# BATCH VALIDATION
+# ============================================================================
+
+def validate_catalog_file(filename, kind=None):
+    """
+    Check a whole catalog file and collect every problem
+    
+    Unlike validate_quest_data/validate_item_data, this does not stop at
+    the first bad field.
+    
+    Args:
+        filename: Quest or item data file
+        kind: 'quests' or 'items' (detected from the file if None)
+    
+    Returns: List of problem dictionaries (see iter_catalog_problems)
+    Raises: MissingDataFileError if the file doesn't exist
+    """
+    return list(iter_catalog_problems(filename, kind))
+
+def iter_catalog_problems(filename, kind=None):
+    """
+    Stream every problem found in a catalog file
+    
+    Detects: malformed lines, missing fields, non-integer numbers, invalid
+    item types and effects, duplicate ids and (for quests) prerequisites
+    that name a quest not defined anywhere in the file.
+    
+    The file is read one block at a time; only the ids seen so far and the
+    unresolved prerequisites are kept, never the records themselves.
+    
+    Yields: Dictionaries with keys:
+            'line' - 1-based line number of the problem
+            'block' - 0-based index of the block in the file
+            'record_id' - quest/item id of the block (None if missing)
+            'message' - description of the problem
+    Raises: MissingDataFileError if the file doesn't exist
+    """
+    if kind is None:
+        kind = detect_catalog_kind(filename)
+    if kind == 'quests':
+        id_field, required, integers = 'quest_id', REQUIRED_QUEST_FIELDS, QUEST_INTEGER_FIELDS
+    else:
+        id_field, required, integers = 'item_id', REQUIRED_ITEM_FIELDS, ITEM_INTEGER_FIELDS
+
+    seen_ids = {}
+    # prerequisite id -> (line, block, record_id) of the first quest that needs it
+    pending_prerequisites = {}
+    block_index = -1
+    try:
+        with open(filename, 'r') as file:
+            for block_index, (start, lines) in enumerate(_iter_blocks(file)):
+                fields = {}
+                problems = []
+                for offset, line in enumerate(lines):
+                    line_number = start + offset
+                    if ': ' not in line:
+                        problems.append((line_number, f"Invalid line format: {line}"))
+                        continue
+                    key, value = line.split(': ', 1)
+                    fields[key.strip().lower()] = (line_number, value.strip())
+
+                record_id = fields[id_field][1] if id_field in fields else None
+                for line_number, message in problems:
+                    yield _problem(line_number, block_index, record_id, message)
+                for field in required:
+                    if field not in fields:
+                        yield _problem(start, block_index, record_id, f"Missing required field: {field}")
+                for field in integers:
+                    if field in fields:
+                        line_number, value = fields[field]
+                        try:
+                            int(value)
+                        except ValueError:
+                            yield _problem(line_number, block_index, record_id,
+                                           f"Expected integer for {field}, got: {value}")
+
+                if kind == 'items':
+                    if 'type' in fields and fields['type'][1] not in VALID_ITEM_TYPES:
+                        yield _problem(fields['type'][0], block_index, record_id,
+                                       f"Invalid item type: {fields['type'][1]}")
+                    if 'effect' in fields:
+                        try:
+                            parse_item_effects(fields['effect'][1])
+                        except InvalidDataFormatError as e:
+                            yield _problem(fields['effect'][0], block_index, record_id, e.message)
+
+                if record_id is not None:
+                    if record_id in seen_ids:
+                        yield _problem(fields[id_field][0], block_index, record_id,
+                                       f"Duplicate {id_field} '{record_id}' (first defined on line {seen_ids[record_id]})")
+                    else:
+                        seen_ids[record_id] = fields[id_field][0]
+                        pending_prerequisites.pop(record_id, None)
+
+                if kind == 'quests' and 'prerequisite' in fields:
+                    prerequisite = fields['prerequisite'][1]
+                    if prerequisite != "NONE" and prerequisite not in seen_ids:
+                        pending_prerequisites.setdefault(
+                            prerequisite, (fields['prerequisite'][0], block_index, record_id))
+    except FileNotFoundError:
+        raise MissingDataFileError(f"Data file '{filename}' not found.")
+    except (OSError, UnicodeDecodeError) as e:
+        yield _problem(0, block_index + 1, None, f"File could not be read: {e}")
+        return
+
+    if block_index < 0:
+        yield _problem(1, 0, None, f"File contains no {kind}")
+    for prerequisite, (line_number, index, record_id) in pending_prerequisites.items():
+        yield _problem(line_number, index, record_id, f"Prerequisite '{prerequisite}' does not exist")
+
+def detect_catalog_kind(filename):
+    """
+    Guess whether a data file holds quests or items
+    
+    Returns: 'items' if the first record has an ITEM_ID, otherwise 'quests'
+    Raises: MissingDataFileError if the file doesn't exist
+    """
+    try:
+        with open(filename, 'r') as file:
+            for line in file:
+                key = line.split(':', 1)[0].strip().lower()
+                if key == 'item_id':
+                    return 'items'
+                if key == 'quest_id':
+                    return 'quests'
+    except FileNotFoundError:
+        raise MissingDataFileError(f"Data file '{filename}' not found.")
+    except (OSError, UnicodeDecodeError):
+        pass
+    return 'quests'
+
+def _problem(line_number, block_index, record_id, message):
+    """Build one problem entry for iter_catalog_problems"""
+    return {'line': line_number, 'block': block_index, 'record_id': record_id, 'message': message}
+
+# ============================================================================
+# BINARY CATALOGS
+# ============================================================================
+
+# Layout (all little-endian):
+#   header        magic, version, kind, record count, string count, blob size
+#   string table  UTF-8 strings joined by NUL bytes
+#   padding       to an 8-byte boundary
+#   string cols   one uint32 string-table index per record, per text field
+#   int cols      one int64 per record, per integer field
+#   effect cols   items only (version 2+): uint32 first effect and uint32
+#                 effect count per record, then per effect an int64 delta
+#                 and a uint8 index into VALID_EFFECT_STATS
+#   id index      uint32 record numbers, sorted by id
+# Version 1 files (no effect columns) are still read; their item effects
+# are parsed from the effect strings.
+BINARY_MAGIC = b'QCCAT'
+BINARY_VERSION = 2
+_BINARY_READ_VERSIONS = (1, 2)
+_BINARY_HEADER = struct.Struct('<5sBBIIQ')
+_BINARY_KINDS = {'quests': 0, 'items': 1}
+
+def _binary_layout(kind):
+    """
+    Get the column layout for a catalog kind
+    
+    Returns: Tuple of (record_type, string_fields, integer_fields)
+    """
+    if kind == 'quests':
+        return Quest, [f for f in Quest.FIELDS if f not in QUEST_INTEGER_FIELDS], QUEST_INTEGER_FIELDS
+    fields = [f for f in REQUIRED_ITEM_FIELDS if f not in ITEM_INTEGER_FIELDS]
+    return Item, fields, ITEM_INTEGER_FIELDS
+
+def is_binary_catalog(filename):
+    """Return True if filename starts with the binary catalog magic bytes"""
+    try:
+        with open(filename, 'rb') as file:
+            return file.read(len(BINARY_MAGIC)) == BINARY_MAGIC
+    except OSError:
+        return False
+
+def write_binary_catalog(catalog, filename, kind):
+    """
+    Write a quest or item catalog in the binary format
+    
+    Args:
+        catalog: Dictionary from load_quests/load_items
+        filename: Destination file
+        kind: 'quests' or 'items'
+    
+    Raises: InvalidDataFormatError if a value can't be stored
+    """
+    record_type, string_fields, integer_fields = _binary_layout(kind)
+    id_field = record_type.FIELDS[0]
+    strings = {}
+    string_columns = [array('I') for field in string_fields]
+    integer_columns = [array('q') for field in integer_fields]
+    try:
+        for record in catalog.values():
+            for column, field in zip(string_columns, string_fields):
+                column.append(strings.setdefault(record[field], len(strings)))
+            for column, field in zip(integer_columns, integer_fields):
+                column.append(record[field])
+    except OverflowError as e:
+        raise InvalidDataFormatError(f"Value too large for binary catalog: {e}")
+    effect_columns = []
+    if kind == 'items':
+        effect_columns = _effect_columns(catalog)
+    if any('\0' in text for text in strings):
+        raise InvalidDataFormatError("Binary catalogs can't store NUL characters.")
+
+    ids = string_columns[string_fields.index(id_field)]
+    table = list(strings)
+    id_index = array('I', sorted(range(len(ids)), key=lambda number: table[ids[number]]))
+    blob = '\0'.join(table).encode()
+
+    with open(filename, 'wb') as file:
+        file.write(_BINARY_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, _BINARY_KINDS[kind],
+                                       len(ids), len(table), len(blob)))
+        file.write(blob)
+        file.write(b'\0' * (-(_BINARY_HEADER.size + len(blob)) % 8))
+        for column in string_columns + integer_columns + effect_columns + [id_index]:
+            if sys.byteorder == 'big':
+                column.byteswap()
+            column.tofile(file)
+
+def _effect_columns(catalog):
+    """
+    Build the pre-parsed effect columns for an item catalog
+    
+    Returns: List of arrays [first effect, effect count, delta, stat index]
+    Raises: InvalidDataFormatError if a value can't be stored
+    """
+    stat_numbers = {stat: number for number, stat in enumerate(VALID_EFFECT_STATS)}
+    starts, counts, deltas, stats = array('I'), array('I'), array('q'), array('B')
+    try:
+        for record in catalog.values():
+            effects = record['effects'] if 'effects' in record else parse_item_effects(record['effect'])
+            starts.append(len(deltas))
+            counts.append(len(effects))
+            for stat_name, delta in effects:
+                deltas.append(delta)
+                stats.append(stat_numbers[stat_name])
+    except OverflowError as e:
+        raise InvalidDataFormatError(f"Value too large for binary catalog: {e}")
+    return [starts, counts, deltas, stats]
+
+def read_binary_catalog(filename):
+    """
+    Read the raw columns of a binary catalog
+    
+    Columns come straight from the file into array objects; nothing is
+    parsed line by line.
+    
+    Returns: Dictionary with 'kind', 'strings' (list), 'string_columns',
+             'integer_columns' ({field: array}), 'effect_columns'
+             ({'start', 'count', 'delta', 'stat': array}, or None for
+             quests and version 1 files) and 'id_index' (array)
+    Raises: MissingDataFileError, CorruptedDataError
+    """
+    try:
+        with open(filename, 'rb') as file:
+            data = file.read()
+    except FileNotFoundError:
+        raise MissingDataFileError(f"Catalog file '{filename}' not found.")
+    view = memoryview(data)
+    try:
+        magic, version, kind_code, count, string_count, blob_size = _BINARY_HEADER.unpack_from(view)
+        if magic != BINARY_MAGIC or version not in _BINARY_READ_VERSIONS:
+            raise ValueError("not a supported binary catalog")
+        kind = {code: name for name, code in _BINARY_KINDS.items()}[kind_code]
+        record_type, string_fields, integer_fields = _binary_layout(kind)
+
+        offset = _BINARY_HEADER.size
+        strings = bytes(view[offset:offset + blob_size]).decode().split('\0') if string_count else []
+        if len(strings) != string_count:
+            raise ValueError("string table size mismatch")
+        offset += blob_size + (-(_BINARY_HEADER.size + blob_size) % 8)
+
+        def take(typecode, length=count):
+            nonlocal offset
+            column = array(typecode)
+            end = offset + column.itemsize * length
+            if end > len(data):
+                raise ValueError("file is truncated")
+            column.frombytes(view[offset:end])
+            if sys.byteorder == 'big':
+                column.byteswap()
+            offset = end
+            return column
+
+        string_columns = {field: take('I') for field in string_fields}
+        integer_columns = {field: take('q') for field in integer_fields}
+        effect_columns = None
+        if kind == 'items' and version >= 2:
+            starts = take('I')
+            counts = take('I')
+            total = starts[-1] + counts[-1] if count else 0
+            effect_columns = {'start': starts, 'count': counts,
+                              'delta': take('q', total), 'stat': take('B', total)}
+        id_index = take('I')
+    except (struct.error, ValueError, KeyError, UnicodeDecodeError) as e:
+        raise CorruptedDataError(f"Binary catalog '{filename}' is corrupted: {e}")
+    return {
+        'kind': kind,
+        'strings': strings,
+        'string_columns': string_columns,
+        'integer_columns': integer_columns,
+        'effect_columns': effect_columns,
+        'id_index': id_index
+    }
+
+def _binary_effects(effect_columns, numbers):
+    """
+    Rebuild the effects tuples of the given records from the effect columns
+    
+    Returns: List of ((stat, delta), ...) tuples, one per record number
+    Raises: IndexError if a stat index or effect range is out of bounds
+    """
+    starts = effect_columns['start']
+    counts = effect_columns['count']
+    deltas = effect_columns['delta']
+    stats = effect_columns['stat']
+    stat_name = VALID_EFFECT_STATS.__getitem__
+    if (isinstance(numbers, range) and len(numbers) == len(starts) == len(deltas) and
+            starts == array('I', numbers)):
+        # Every item has exactly one effect (the usual case): build them all in C
+        return list(zip(zip(map(stat_name, stats), deltas)))
+    effects = []
+    for number in numbers:
+        start = starts[number]
+        end = start + counts[number]
+        if end > len(deltas):
+            raise IndexError("effect range out of bounds")
+        effects.append(tuple(zip(map(stat_name, stats[start:end]), deltas[start:end])))
+    return effects
+
+def load_binary_catalog(filename, kind=None):
+    """
+    Load a binary catalog into the same records the text loader builds
+    
+    Item effects come from the pre-parsed effect columns, so no effect
+    string is parsed.
+    
+    Args:
+        filename: Binary catalog file
+        kind: Expected kind ('quests' or 'items'), or None for any
+    
+    Returns: Dictionary {record_id: Quest or Item}
+    Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
+    """
+    columns = read_binary_catalog(filename)
+    if kind is not None and columns['kind'] != kind:
+        raise InvalidDataFormatError(f"'{filename}' holds {columns['kind']}, not {kind}.")
+    record_type, string_fields, integer_fields = _binary_layout(columns['kind'])
+    strings = columns['strings']
+    try:
+        field_values = []
+        for field in record_type.FIELDS:
+            if field in columns['string_columns']:
+                field_values.append([strings[index] for index in columns['string_columns'][field]])
+            elif field in columns['integer_columns']:
+                field_values.append(columns['integer_columns'][field])
+            elif field == 'effects' and columns['effect_columns'] is not None:
+                count = len(field_values[0])
+                field_values.append(_binary_effects(columns['effect_columns'], range(count)))
+        catalog = dict(zip(field_values[0], map(record_type, *field_values)))
+    except IndexError as e:
+        raise CorruptedDataError(f"Binary catalog '{filename}' is corrupted: {e}")
+    return catalog
+
+def find_binary_record(columns, record_id):
+    """
+    Look up one record in columns from read_binary_catalog by id
+    
+    Uses the sorted id index, so only O(log n) ids are compared.
+    
+    Returns: Quest or Item, or None if the id isn't present
+    """
+    record_type, string_fields, integer_fields = _binary_layout(columns['kind'])
+    strings = columns['strings']
+    ids = columns['string_columns'][record_type.FIELDS[0]]
+    index = columns['id_index']
+    position = bisect_left(index, record_id, key=lambda number: strings[ids[number]])
+    if position == len(index) or strings[ids[index[position]]] != record_id:
+        return None
+    number = index[position]
+    values = []
+    for field in record_type.FIELDS:
+        if field in columns['string_columns']:
+            values.append(strings[columns['string_columns'][field][number]])
+        elif field in columns['integer_columns']:
+            values.append(columns['integer_columns'][field][number])
+        elif field == 'effects' and columns['effect_columns'] is not None:
+            values.append(_binary_effects(columns['effect_columns'], [number])[0])
+    return record_type(*values)
+
+def write_text_catalog(catalog, filename, kind):
+    """
+    Write a catalog back out in the KEY: value text format
+    
+    Args:
+        catalog: Dictionary of quests or items
+        filename: Destination file
+        kind: 'quests' or 'items'
+    """
+    fields = REQUIRED_QUEST_FIELDS if kind == 'quests' else REQUIRED_ITEM_FIELDS
+    with open(filename, 'w') as file:
+        for number, record in enumerate(catalog.values()):
+            if number:
+                file.write("\n")
+            for field in fields:
+                file.write(f"{field.upper()}: {record[field]}\n")
+
+# ============================================================================
+# HOT RELOAD
+# ============================================================================
+
+# Bumped every time reload_catalog patches a catalog: {id(catalog): (catalog, generation)}
+# Catalogs are plain dicts, which can't be weakly referenced; holding the
+# catalog keeps its id from being reused by a newer dict
+_catalog_generations = {}
+
+# What reload_catalog last saw for each file:
+# {abs_path: {'kind': str, 'stat': (size, mtime_ns), 'blocks': {block_hash: record_id} or None}}
+_catalog_snapshots = {}
+
+def snapshot_catalog(filename, kind):
+    """
+    Remember a freshly loaded file's stat and block hashes for reloads
+    
+    Call this right after load_quests/load_items. Until the file changes,
+    reload_catalog only has to stat it; after an edit it only parses the
+    blocks whose hash is new. Blocks are hashed without being parsed, so
+    this costs one read of the file.
+    """
+    id_field = (Quest if kind == 'quests' else Item).FIELDS[0]
+    stat = os.stat(filename)
+    blocks = {}
+    seen_ids = set()
+    with open(filename, 'r') as file:
+        for line_number, lines in _iter_blocks(file):
+            record_id = _block_record_id(lines, id_field)
+            if record_id in seen_ids:
+                blocks = None  # Duplicate ids; reloads parse every block
+                break
+            if record_id is not None:
+                seen_ids.add(record_id)
+                blocks[_block_hash(lines)] = record_id
+    stamp = (stat.st_size, stat.st_mtime_ns)
+    stat = os.stat(filename)
+    if (stat.st_size, stat.st_mtime_ns) != stamp:
+        blocks = None  # Edited while being read; the next reload parses everything
+    _catalog_snapshots[os.path.abspath(filename)] = {
+        'kind': kind,
+        'stat': stamp,
+        'blocks': blocks
+    }
+
+def _block_hash(lines):
+    """Hash one block of lines from a data file"""
+    return hashlib.blake2b('\n'.join(lines).encode(), digest_size=16).digest()
+
+def _block_record_id(lines, id_field):
+    """Return the value of a block's id line (e.g. QUEST_ID), or None"""
+    for line in lines:
+        key, separator, value = line.partition(': ')
+        if separator and key.strip().lower() == id_field:
+            return value.strip()
+    return None
+
+def reload_quests(quest_data_dict, filename="data/quests.txt"):
+    """
+    Pick up edits to a quest file, patching quest_data_dict in place
+    
+    Returns: Dictionary with 'added', 'removed' and 'modified' quest ids
+    Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
+    """
+    return reload_catalog(quest_data_dict, filename, 'quests')
+
+def reload_items(item_data_dict, filename="data/items.txt"):
+    """
+    Pick up edits to an item file, patching item_data_dict in place
+    
+    Returns: Dictionary with 'added', 'removed' and 'modified' item ids
+    Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
+    """
+    return reload_catalog(item_data_dict, filename, 'items')
+
+def reload_catalog(catalog, filename, kind):
+    """
+    Incrementally reload a catalog file into an existing dictionary
+    
+    If the file's size and mtime are unchanged nothing is read. Otherwise
+    the file is streamed block by block and each block is hashed; only
+    blocks whose hash was not seen on the previous reload are parsed and
+    validated. The catalog is only patched once the whole file has been
+    read successfully, so a bad edit leaves it untouched.
+    
+    With no snapshot (see snapshot_catalog) there are no block hashes
+    yet, so the first reload parses every block and diffs by value. The
+    same happens while an id appears in more than one block, so the last
+    block wins just as it does for load_quests/load_items.
+    
+    Args:
+        catalog: Dictionary returned by load_quests/load_items
+        filename: Source data file
+        kind: 'quests' or 'items'
+    
+    Returns: Dictionary with lists of 'added', 'removed' and 'modified' ids
+    Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
+    """
+    if kind == 'quests':
+        label, parse_block, validate, record_type = "Quest", parse_quest_block, validate_quest_data, Quest
+    else:
+        label, parse_block, validate, record_type = "Item", parse_item_block, validate_item_data, Item
+    diff = {'added': [], 'removed': [], 'modified': []}
+
+    key = os.path.abspath(filename)
+    try:
+        stat = os.stat(filename)
+    except FileNotFoundError:
+        raise MissingDataFileError(f"{label} data file '{filename}' not found.")
+    stamp = (stat.st_size, stat.st_mtime_ns)
+    snapshot = _catalog_snapshots.get(key)
+    if snapshot is not None and snapshot['kind'] != kind:
+        snapshot = None
+    if snapshot is not None and snapshot['stat'] == stamp:
+        return diff
+
+    previous_blocks = snapshot['blocks'] if snapshot is not None and snapshot['blocks'] is not None else {}
+    if snapshot is not None and snapshot['blocks'] is not None:
+        previous_ids = set(previous_blocks.values())
+    else:
+        previous_ids = set(catalog)
+
+    def parse_record(lines):
+        record = parse_block(lines)
+        validate(record)
+        return record_type.from_dict(record)
+
+    try:
+        blocks, changed, duplicated = _read_changed_blocks(filename, catalog, previous_blocks,
+                                                           parse_record, record_type.FIELDS[0])
+        if duplicated and previous_blocks:
+            # With an id in several blocks the last one wins, and an unchanged
+            # hash no longer says which one that is - parse every block
+            blocks, changed, duplicated = _read_changed_blocks(filename, catalog, {},
+                                                               parse_record, record_type.FIELDS[0])
+    except FileNotFoundError:
+        raise MissingDataFileError(f"{label} data file '{filename}' not found.")
+    except InvalidDataFormatError as e:
+        raise e
+    except Exception as e:
+        raise CorruptedDataError(f"{label} data file '{filename}' is corrupted: {e}")
+    if not blocks:
+        raise InvalidDataFormatError(f"{label} data file '{filename}' contains no {kind}.")
+
+    current_ids = set(blocks.values())
+    for record_id, record in changed.items():
+        if record_id not in catalog:
+            diff['added'].append(record_id)
+        elif catalog[record_id] != record:
+            diff['modified'].append(record_id)
+        catalog[record_id] = record
+    for record_id in sorted(previous_ids - current_ids):
+        if record_id in catalog:
+            del catalog[record_id]
+            diff['removed'].append(record_id)
+
+    _catalog_snapshots[key] = {'kind': kind, 'stat': stamp, 'blocks': None if duplicated else blocks}
+    if diff['added'] or diff['removed'] or diff['modified']:
+        _catalog_generations[id(catalog)] = (catalog, get_catalog_generation(catalog) + 1)
+    return diff
+
+def _read_changed_blocks(filename, catalog, previous_blocks, parse_record, id_field):
+    """
+    Hash every block of a data file, parsing only those not in previous_blocks
+    
+    Returns: ({block_hash: record_id}, {record_id: record} for parsed blocks,
+              whether any id appears in more than one block)
+    """
+    blocks = {}
+    changed = {}
+    seen_ids = set()
+    duplicated = False
+    with open(filename, 'r') as file:
+        for line_number, lines in _iter_blocks(file):
+            block_hash = _block_hash(lines)
+            record_id = previous_blocks.get(block_hash)
+            if record_id is None or record_id not in catalog:
+                record = parse_record(lines)
+                record_id = record[id_field]
+                changed[record_id] = record
+            if record_id in seen_ids:
+                duplicated = True
+            seen_ids.add(record_id)
+            blocks[block_hash] = record_id
+    return blocks, changed, duplicated
+
+def get_catalog_generation(catalog):
+    """
+    Get how many times reload_catalog has changed a catalog
+    
+    Indexes remember this number and rebuild when it moves.
+    """
+    entry = _catalog_generations.get(id(catalog))
+    if entry is None or entry[0] is not catalog:
+        return 0
+    return entry[1]
+
+# ============================================================================
+# CATALOG INDEXES
+# ============================================================================
+
+class QuestLevelIndex:
+    """
+    Quests sorted by required_level for range queries
+    
+    quests_between() uses bisect, so a query costs O(log n + k) instead
+    of scanning every quest. The index keeps a reference to its catalog
+    and rebuilds itself after reload_quests changes it.
+    """
+    
+    def __init__(self, quest_data_dict):
+        self.catalog = quest_data_dict
+        self.rebuild()
+    
+    def rebuild(self):
+        """Re-sort the catalog (called automatically after a reload)"""
+        entries = sorted((quest['required_level'], position, quest_id)
+                         for position, (quest_id, quest) in enumerate(self.catalog.items()))
+        self._levels = [level for level, position, quest_id in entries]
+        self._entries = [(position, quest_id) for level, position, quest_id in entries]
+        self._generation = get_catalog_generation(self.catalog)
+    
+    def quests_between(self, min_level=None, max_level=None):
+        """
+        Get quests whose required_level is within [min_level, max_level]
+        
+        Either bound may be None for an open range.
+        
+        Returns: List of quest dictionaries, in catalog order
+        """
+        if self._generation != get_catalog_generation(self.catalog):
+            self.rebuild()
+        low = 0 if min_level is None else bisect_left(self._levels, min_level)
+        high = len(self._levels) if max_level is None else bisect_right(self._levels, max_level)
+        matches = sorted(self._entries[low:high])
+        return [self.catalog[quest_id] for position, quest_id in matches]
+
+class ItemCostIndex:
+    """
+    Items grouped by type and sorted by cost for shop queries
+    
+    items_of_type() uses bisect, so "consumables under 50 gold" costs
+    O(log n + k). The index keeps a reference to its catalog and rebuilds
+    itself after reload_items changes it.
+    """
+    
+    def __init__(self, item_data_dict):
+        self.catalog = item_data_dict
+        self.rebuild()
+    
+    def rebuild(self):
+        """Re-group and re-sort the catalog (called automatically after a reload)"""
+        groups = {}
+        for position, (item_id, item) in enumerate(self.catalog.items()):
+            groups.setdefault(item['type'], []).append((item['cost'], position, item_id))
+        self._costs = {}
+        self._ids = {}
+        for item_type, entries in groups.items():
+            entries.sort()
+            self._costs[item_type] = [cost for cost, position, item_id in entries]
+            self._ids[item_type] = [item_id for cost, position, item_id in entries]
+        self._generation = get_catalog_generation(self.catalog)
+    
+    def items_of_type(self, item_type, min_cost=None, max_cost=None):
+        """
+        Get items of one type whose cost is within [min_cost, max_cost]
+        
+        Either bound may be None for an open range.
+        
+        Returns: List of item dictionaries, cheapest first
+        """
+        if self._generation != get_catalog_generation(self.catalog):
+            self.rebuild()
+        costs = self._costs.get(item_type, [])
+        low = 0 if min_cost is None else bisect_left(costs, min_cost)
+        high = len(costs) if max_cost is None else bisect_right(costs, max_cost)
+        return [self.catalog[item_id] for item_id in self._ids[item_type][low:high]] if costs else []
+    
+    def types(self):
+        """Return the item types present in the catalog"""
+        if self._generation != get_catalog_generation(self.catalog):
+            self.rebuild()
+        return list(self._costs)
+
+# ============================================================================
+# LAZY CATALOGS
+# ============================================================================
+
+# One block of non-blank lines, and the ITEM_ID line inside a block
+_BLOCK_PATTERN = re.compile(rb'\S[^\n]*(?:\n(?![ \t\r]*(?:\n|$))[^\n]*)*')
+_ITEM_ID_PATTERN = re.compile(rb'^[ \t]*ITEM_ID[ \t]*: ([^\r\n]*)', re.MULTILINE | re.IGNORECASE)
+
+class LazyItemCatalog(Mapping):
+    """
+    Read-only item catalog backed by a memory-mapped items file
+    
+    Opening the catalog only builds an index of
+    {item_id: (offset, length)}. Each item is parsed and validated the
+    first time it is looked up, so memory grows with the number of items
+    actually used rather than with the size of the file.
+    
+    Behaves like the dictionary returned by load_items(), so it can be
+    passed anywhere an item_data_dict is expected.
+    """
+    
+    def __init__(self, filename="data/items.txt"):
+        """
+        Open and index an items file
+        
+        Raises:
+            MissingDataFileError if the file doesn't exist
+            InvalidDataFormatError if a block has no ITEM_ID or the file is empty
+            CorruptedDataError if the file can't be mapped
+        """
+        self.filename = filename
+        self._index = {}
+        self._decoded = {}
+        self._file = None
+        self._map = None
+        try:
+            self._file = open(filename, 'rb')
+            if os.fstat(self._file.fileno()).st_size == 0:
+                raise InvalidDataFormatError(f"Item data file '{filename}' contains no items.")
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._build_index()
+        except FileNotFoundError:
+            raise MissingDataFileError(f"Item data file '{filename}' not found.")
+        except InvalidDataFormatError:
+            self.close()
+            raise
+        except Exception as e:
+            self.close()
+            raise CorruptedDataError(f"Item data file '{filename}' is corrupted: {e}")
+    
+    def _build_index(self):
+        """Record the byte span of every item block, keyed by item id"""
+        for block in _BLOCK_PATTERN.finditer(self._map):
+            start, end = block.span()
+            match = _ITEM_ID_PATTERN.search(self._map, start, end)
+            if match is None:
+                raise InvalidDataFormatError(
+                    f"Item data file '{self.filename}' has a block without ITEM_ID at byte {start}.")
+            item_id = match.group(1).strip().decode()
+            self._index[item_id] = (start, end - start)
+        if not self._index:
+            raise InvalidDataFormatError(f"Item data file '{self.filename}' contains no items.")
+    
+    def __getitem__(self, item_id):
+        """Return the Item record, decoding it on first access"""
+        item = self._decoded.get(item_id)
+        if item is not None:
+            return item
+        offset, length = self._index[item_id]
+        try:
+            lines = self._map[offset:offset + length].decode().splitlines()
+        except UnicodeDecodeError as e:
+            raise CorruptedDataError(f"Item '{item_id}' in '{self.filename}' is corrupted: {e}")
+        lines[0] = lines[0].lstrip()
+        item = parse_item_block([line.rstrip('\r') for line in lines])
+        validate_item_data(item)
+        item = Item.from_dict(item)
+        self._decoded[item_id] = item
+        return item
+    
+    def __contains__(self, item_id):
+        return item_id in self._index
+    
+    def __iter__(self):
+        return iter(self._index)
+    
+    def __len__(self):
+        return len(self._index)
+    
+    def decoded_count(self):
+        """Return how many items have been parsed so far"""
+        return len(self._decoded)
+    
+    def close(self):
+        """Release the memory map and file handle"""
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
 # ============================================================================
 # HELPER FUNCTIONS
 # ============================================================================
@@ -209,6 +1350,32 @@ def parse_quest_block(lines):
         quest_data[key] = value
     return quest_data
 
+def _iter_blocks(file):
+    """
+    Group the lines of an open data file into blank-line separated blocks
+    
+    Args:
+        file: Open text file (or any iterable of lines)
+    
+    Yields: Tuple of (line_number, lines) where line_number is the
+            1-based line the block starts on
+    """
+    lines = []
+    start = 0
+    for line_number, line in enumerate(file, 1):
+        line = line.rstrip('\r\n')
+        if not line.strip():
+            if lines:
+                yield start, lines
+                lines = []
+            continue
+        if not lines:
+            start = line_number
+            line = line.lstrip()
+        lines.append(line)
+    if lines:
+        yield start, lines
+
 def parse_item_block(lines):
     """
     Parse a block of lines into an item dictionary
@@ -232,14 +1399,116 @@ def parse_item_block(lines):
                 value = int(value)
             except ValueError:
                 raise InvalidDataFormatError(f"Expected integer for {key}, got: {value}")
+        elif key == 'effect':
+            item_data['effects'] = parse_item_effects(value)
         item_data[key] = value
     return item_data
 
+def parse_item_effects(effect_string):
+    """
+    Parse an item effect string into (stat, delta) pairs
+    
+    Args:
+        effect_string: "stat_name:value", or several separated by commas
+                       (e.g. "strength:5" or "strength:3,magic:3")
+    
+    Returns: Tuple of (stat_name, value) tuples
+    Example: "health:20" → (("health", 20),)
+    Raises: InvalidDataFormatError if malformed or the stat is unknown
+    """
+    effects = []
+    for part in effect_string.split(','):
+        if part.count(':') != 1:
+            raise InvalidDataFormatError(f"Invalid item effect: {effect_string}")
+        stat_name, value = part.split(':')
+        stat_name = stat_name.strip()
+        if stat_name not in VALID_EFFECT_STATS:
+            raise InvalidDataFormatError(f"Unknown stat '{stat_name}' in item effect: {effect_string}")
+        try:
+            value = int(value)
+        except ValueError:
+            raise InvalidDataFormatError(f"Expected integer in item effect, got: {effect_string}")
+        effects.append((sys.intern(stat_name), value))
+    return tuple(effects)
+
+# ============================================================================
+# COMMAND LINE
+# ============================================================================
+
+def convert_catalog(source, destination, to_binary=True, kind=None):
+    """
+    Convert a catalog file between the text and binary formats
+    
+    Returns: 0 on success, 1 if the source couldn't be loaded
+    """
+    try:
+        if to_binary:
+            kind = kind or detect_catalog_kind(source)
+            catalog = load_quests(source) if kind == 'quests' else load_items(source)
+            write_binary_catalog(catalog, destination, kind)
+        else:
+            columns_kind = read_binary_catalog(source)['kind']
+            catalog = load_binary_catalog(source, kind)
+            write_text_catalog(catalog, destination, kind or columns_kind)
+    except DataError as e:
+        print(f"Could not convert '{source}': {e}")
+        return 1
+    print(f"Converted {len(catalog)} records: {source} -> {destination}")
+    return 0
+
+def main(argv=None):
+    """
+    Command line entry point
+    
+    python -m game_data --validate [FILE ...]
+        Check each file (default: data/quests.txt and data/items.txt) and
+        print every problem as "file:line: block N: message".
+        Exits with status 1 if any problem was found.
+    
+    python -m game_data --to-binary SOURCE DEST
+    python -m game_data --to-text SOURCE DEST
+        Convert a catalog between the text and binary formats.
+    """
+    import argparse
+    parser = argparse.ArgumentParser(prog="python -m game_data")
+    parser.add_argument('--validate', nargs='*', metavar='FILE',
+                        help="check catalog files and report every problem")
+    parser.add_argument('--to-binary', nargs=2, metavar=('SOURCE', 'DEST'),
+                        help="convert a text catalog to the binary format")
+    parser.add_argument('--to-text', nargs=2, metavar=('SOURCE', 'DEST'),
+                        help="convert a binary catalog back to text")
+    parser.add_argument('--kind', choices=['quests', 'items'],
+                        help="catalog kind (detected from the file by default)")
+    args = parser.parse_args(argv)
+    if args.to_binary or args.to_text:
+        return convert_catalog(*(args.to_binary or args.to_text),
+                               to_binary=bool(args.to_binary), kind=args.kind)
+    if args.validate is None:
+        parser.print_help()
+        return 2
+
+    filenames = args.validate or ["data/quests.txt", "data/items.txt"]
+    problem_count = 0
+    for filename in filenames:
+        try:
+            for problem in iter_catalog_problems(filename, args.kind):
+                problem_count += 1
+                print(f"{filename}:{problem['line']}: block {problem['block']}: {problem['message']}")
+        except MissingDataFileError as e:
+            problem_count += 1
+            print(f"{filename}: {e}")
+    print(f"{problem_count} problem(s) found in {len(filenames)} file(s)")
+    return 1 if problem_count else 0
+
 # ============================================================================
 # TESTING
 # ============================================================================
 
 if __name__ == "__main__":
+    # Command line mode (e.g. --validate) when arguments are given
+    if len(sys.argv) > 1:
+        sys.exit(main())
+
     print("=== GAME DATA MODULE TEST ===")
     
     # Test creating default files
@@ -0,0 +1,155 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Inventory Storage Module
+
+This module holds the counted Inventory container used for character
+inventories. It has no game data dependencies, so save loading and
+character creation can use it without loading inventory_system.
+"""
+
+from collections.abc import MutableSequence
+from itertools import chain, repeat
+
+# ============================================================================
+# INVENTORY STORAGE
+# ============================================================================
+
+class Inventory(MutableSequence):
+    """
+    Inventory stored as item id → count
+    
+    Works like the list of item ids it replaces (len, in, iteration,
+    append, remove, count, indexing, slicing), but membership, counting,
+    adding and removing are O(1). Copies of an item are kept together in
+    the order the item was first added, so unlike a list the position an
+    item was inserted at isn't kept.
+    """
+
+    __slots__ = ('_counts', '_size')
+
+    def __init__(self, items=()):
+        self._counts = {}
+        self._size = 0
+        if isinstance(items, Inventory):
+            self._counts = dict(items._counts)
+            self._size = items._size
+        else:
+            for item_id in items:
+                self.append(item_id)
+
+    @classmethod
+    def from_stacks(cls, tokens):
+        """
+        Build an inventory from save tokens: "item_id" or "item_id*count"
+        
+        Raises: ValueError if a count is not positive
+        """
+        inventory = cls()
+        for token in tokens:
+            item_id, star, count = token.rpartition('*')
+            if star and count.isdigit():
+                inventory.add(item_id, int(count))
+            else:
+                inventory.append(token)
+        return inventory
+
+    def stacks(self):
+        """Return (item_id, count) pairs in first-added order"""
+        return list(self._counts.items())
+
+    def to_stacks(self):
+        """Return save tokens, "item_id*count" for stacked items"""
+        return to_stacks(self)
+
+    def add(self, item_id, count=1):
+        """Add count copies of an item"""
+        if count <= 0:
+            raise ValueError(f"Count must be positive, got {count}")
+        self._counts[item_id] = self._counts.get(item_id, 0) + count
+        self._size += count
+
+    def append(self, item_id):
+        self._counts[item_id] = self._counts.get(item_id, 0) + 1
+        self._size += 1
+
+    def remove(self, item_id):
+        count = self._counts.get(item_id)
+        if not count:
+            raise ValueError(f"{item_id!r} is not in inventory")
+        if count == 1:
+            del self._counts[item_id]
+        else:
+            self._counts[item_id] = count - 1
+        self._size -= 1
+
+    def count(self, item_id):
+        return self._counts.get(item_id, 0)
+
+    def clear(self):
+        self._counts.clear()
+        self._size = 0
+
+    def copy(self):
+        return Inventory(self)
+
+    def insert(self, index, item_id):
+        """Add an item (items are grouped by id, so index is ignored)"""
+        self.append(item_id)
+
+    def __len__(self):
+        return self._size
+
+    def __contains__(self, item_id):
+        return item_id in self._counts
+
+    def __iter__(self):
+        return chain.from_iterable(repeat(item_id, count) for item_id, count in self._counts.items())
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(self)[index]
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("inventory index out of range")
+        for item_id, count in self._counts.items():
+            if index < count:
+                return item_id
+            index -= count
+
+    def __setitem__(self, index, value):
+        items = list(self)
+        items[index] = value
+        self.__init__(items)
+
+    def __delitem__(self, index):
+        if isinstance(index, slice):
+            items = list(self)
+            del items[index]
+            self.__init__(items)
+        else:
+            self.remove(self[index])
+
+    def __eq__(self, other):
+        if isinstance(other, Inventory):
+            return self._counts == other._counts
+        if isinstance(other, (list, tuple)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self):
+        return f"Inventory({list(self)!r})"
+
+def to_stacks(items):
+    """
+    Return save tokens for an inventory or plain list of item ids
+    
+    Repeated items become one "item_id*count" token.
+    """
+    if isinstance(items, Inventory):
+        counts = items._counts
+    else:
+        counts = {}
+        for item_id in items:
+            counts[item_id] = counts.get(item_id, 0) + 1
+    return [item_id if count == 1 else f"{item_id}*{count}" for item_id, count in counts.items()]
@@ -8,12 +8,14 @@ AI Usage: Used AI to hep solve test cases
 This module handles inventory management, item usage, and equipment.
 """
 
+import game_data
 from custom_exceptions import (
     InventoryFullError,
     ItemNotFoundError,
     InsufficientResourcesError,
     InvalidItemTypeError
 )
+from inventory_storage import Inventory, to_stacks
 
 # Maximum inventory size
 MAX_INVENTORY_SIZE = 20
@@ -141,16 +143,16 @@ def use_item(character, item_id, item_data):
     if item_data['type'] != 'consumable':
         raise InvalidItemTypeError("Item is not consumable")
     
-    # Parse effect (format: "stat_name:value" e.g., "health:20")
-    stat_name, value = parse_item_effect(item_data['effect'])
+    # Effects are pre-parsed at load time (format: (("health", 20),))
+    effects = get_item_effects(item_data)
 
     # Apply effect to character
-    apply_stat_effect(character, stat_name, value)
+    apply_item_effects(character, effects)
 
     # Remove item from inventory
     remove_item_from_inventory(character, item_id)
 
-    return f"Used {item_id}: {stat_name} + {value}"   
+    return f"Used {item_id}: " + ", ".join(f"{stat_name} + {value}" for stat_name, value in effects)
 
 def equip_weapon(character, item_id, item_data):
     """
@@ -183,16 +185,10 @@ def equip_weapon(character, item_id, item_data):
         # Unequip current weapon
         current_weapon_id = character['equipped_weapon']
         current_weapon_data = item_data  # This would normally come from game data
-        current_effect = current_weapon_data['effect']
-        curr_stat_name, curr_value = current_effect.split(":")
-        curr_value = int(curr_value)
-        apply_stat_effect(character, curr_stat_name, -curr_value)  # Remove bonus
+        apply_item_effects(character, get_item_effects(current_weapon_data), -1)  # Remove bonus
         add_item_to_inventory(character, current_weapon_id)  # Add back to inventory
     # Parse effect and apply to character stats
-    effect = item_data['effect']
-    stat_name, value = effect.split(":")
-    value = int(value)
-    apply_stat_effect(character, stat_name, value)
+    apply_item_effects(character, get_item_effects(item_data))
     
     # Store equipped_weapon in character dictionary
     character['equipped_weapon'] = item_id
@@ -232,16 +228,10 @@ def equip_armor(character, item_id, item_data):
         # Unequip current armor
         current_armor_id = character['equipped_armor']
         current_armor_data = item_data  # This would normally come from game data
-        current_effect = current_armor_data['effect']
-        curr_stat_name, curr_value = current_effect.split(":")
-        curr_value = int(curr_value)
-        apply_stat_effect(character, curr_stat_name, -curr_value)  # Remove bonus
+        apply_item_effects(character, get_item_effects(current_armor_data), -1)  # Remove bonus
         add_item_to_inventory(character, current_armor_id)  # Add back to inventory
     # Parse effect and apply to character stats
-    effect = item_data['effect']
-    stat_name, value = effect.split(":")
-    value = int(value)
-    apply_stat_effect(character, stat_name, value)
+    apply_item_effects(character, get_item_effects(item_data))
 
     # Store equipped_armor in character dictionary
     character['equipped_armor'] = item_id
@@ -266,11 +256,8 @@ def unequip_weapon(character):
         return None
     weapon_id = character['equipped_weapon']
     weapon_data = {}  # This would normally come from game data
-    effect = weapon_data.get('effect', '')
-    if effect:
-        stat_name, value = effect.split(":")
-        value = int(value)
-        apply_stat_effect(character, stat_name, -value)  # Remove bonus
+    if weapon_data.get('effect'):
+        apply_item_effects(character, get_item_effects(weapon_data), -1)  # Remove bonus
     add_item_to_inventory(character, weapon_id)  # Add back to inventory
     character['equipped_weapon'] = None
     return weapon_id    
@@ -288,11 +275,8 @@ def unequip_armor(character):
         return None
     armor_id = character['equipped_armor']
     armor_data = {}  # This would normally come from game data
-    effect = armor_data.get('effect', '')
-    if effect:
-        stat_name, value = effect.split(":")
-        value = int(value)
-        apply_stat_effect(character, stat_name, -value)  # Remove bonus
+    if armor_data.get('effect'):
+        apply_item_effects(character, get_item_effects(armor_data), -1)  # Remove bonus
     add_item_to_inventory(character, armor_id)  # Add back to inventory
     character['equipped_armor'] = None
     return armor_id
@@ -354,6 +338,25 @@ def sell_item(character, item_id, item_data):
     character['gold'] += sell_price
     return sell_price
 
+def get_shop_items(item_data_dict, item_type, max_cost=None, cost_index=None):
+    """
+    List the shop's items of one type, optionally under a price limit
+    
+    Args:
+        item_data_dict: Dictionary of all item data
+        item_type: 'weapon', 'armor' or 'consumable'
+        max_cost: Only include items costing at most this much (None = any)
+        cost_index: Optional game_data.ItemCostIndex for O(log n + k) lookups
+    
+    Returns: List of item dictionaries, cheapest first
+    """
+    if cost_index is not None:
+        return cost_index.items_of_type(item_type, None, max_cost)
+    items = [item for item in item_data_dict.values()
+             if item['type'] == item_type and (max_cost is None or item['cost'] <= max_cost)]
+    items.sort(key=lambda item: item['cost'])
+    return items
+
 # ============================================================================
 # HELPER FUNCTIONS
 # ============================================================================
@@ -371,8 +374,33 @@ def parse_item_effect(effect_string):
     # TODO: Implement effect parsing
     # Split on ":"
     # Convert value to integer
-    stat_name, value = effect_string.split(":")
-    return stat_name, int(value)
+    effects = game_data.parse_item_effects(effect_string)
+    if len(effects) != 1:
+        raise ValueError(f"Expected a single effect, got: {effect_string}")
+    return effects[0]
+
+def get_item_effects(item_data):
+    """
+    Get an item's effects as (stat_name, value) pairs
+    
+    Items from game_data already carry their parsed 'effects'; only
+    hand-built item dictionaries fall back to parsing 'effect'.
+    
+    Returns: Tuple of (stat_name, value) tuples
+    """
+    effects = item_data.get('effects')
+    if effects is None:
+        effects = game_data.parse_item_effects(item_data['effect'])
+    return effects
+
+def apply_item_effects(character, effects, sign=1):
+    """
+    Apply every (stat_name, value) effect to a character
+    
+    Use sign=-1 to remove the bonuses again (e.g. when unequipping).
+    """
+    for stat_name, value in effects:
+        apply_stat_effect(character, stat_name, sign * value)
 
 def apply_stat_effect(character, stat_name, value):
     """
@@ -404,14 +432,18 @@ def display_inventory(character, item_data_dict):
     
     Shows item names, types, and quantities
     """
-    # TODO: Implement inventory display
-    # Count items (some may appear multiple times)
-    # Display with item names from item_data_dict
-    item_counts = {}
-    for item_id in character.get('inventory', []):
-        item_counts[item_id] = item_counts.get(item_id, 0) + 1
+    # Count items (some may appear multiple times); an Inventory
+    # already keeps the counts
+    inventory = character.get('inventory', [])
+    if isinstance(inventory, Inventory):
+        item_counts = inventory.stacks()
+    else:
+        item_counts = {}
+        for item_id in inventory:
+            item_counts[item_id] = item_counts.get(item_id, 0) + 1
+        item_counts = item_counts.items()
     print("Inventory:")
-    for item_id, count in item_counts.items():
+    for item_id, count in item_counts:
         item_name = item_data_dict.get(item_id, {}).get('name', 'Unknown Item')
         print(f"- {item_name} (x{count})")
 # ============================================================================
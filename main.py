@@ -10,32 +10,76 @@ This is the main game file that ties all modules together.
 Demonstrates module integration and complete game flow.
 """
 
-# Import all our custom modules
-import character_manager
-import inventory_system
-import quest_handler
-import combat_system
-import game_data
+import atexit
+import importlib.util
+import signal
+import sys
+import time
+
+# ============================================================================
+# LAZY MODULE LOADING
+# ============================================================================
+
+def lazy_import(name):
+    """
+    Import a module whose code only runs the first time it is used
+    
+    The module is registered in sys.modules right away, so later
+    "import name" statements get the same object, but its body is not
+    executed until one of its attributes is accessed.
+    
+    Returns: The (possibly not yet loaded) module
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+# Import all our custom modules. Each subsystem loads on first use, e.g.
+# combat_system on the first explore() and inventory_system when the
+# inventory or shop is first opened, so the menu appears right away.
+SUBSYSTEM_MODULES = ['game_data', 'character_manager', 'quest_handler',
+                     'inventory_system', 'combat_system']
+character_manager = lazy_import("character_manager")
+inventory_system = lazy_import("inventory_system")
+quest_handler = lazy_import("quest_handler")
+combat_system = lazy_import("combat_system")
+game_data = lazy_import("game_data")
 from custom_exceptions import (
     InvalidCharacterClassError,
     CharacterNotFoundError,
     SaveFileCorruptedError,
+    InvalidSaveDataError,
     InventoryError,
     QuestError,
     CombatError,
     CharacterError,
     MissingDataFileError,
-    InvalidDataFormatError
+    InvalidDataFormatError,
+    CorruptedDataError
 )
 
 # ============================================================================
 # GAME STATE
 # ============================================================================
 
+# Data files
+QUEST_DATA_FILE = "data/quests.txt"
+ITEM_DATA_FILE = "data/items.txt"
+
+# Saved characters shown per page by load_game
+SAVE_LIST_PAGE_SIZE = 10
+
 # Global variables for game data
 current_character = None
 all_quests = {}
 all_items = {}
+save_queue = None
 game_running = False
 
 # ============================================================================
@@ -121,14 +165,57 @@ def load_game():
     """
     global current_character
     
-    # TODO: Implement game loading
-    # Get list of saved characters
-    # Display them to user
-    # Get user choice
-    # Try to load character with character_manager.load_character()
-    # Handle CharacterNotFoundError and SaveFileCorruptedError
-    # Start game loop
-    pass
+    # Saved characters are listed one page at a time, so large save
+    # directories don't have to be read in full
+    offset = 0
+    prefix = ""
+    while True:
+        total = character_manager.count_saved_characters(prefix=prefix)
+        if total == 0:
+            if prefix:
+                print(f"No saved characters start with '{prefix}'.")
+                prefix = ""
+                continue
+            print("No saved characters found.")
+            return
+        names = character_manager.list_saved_characters(prefix=prefix, offset=offset,
+                                                        limit=SAVE_LIST_PAGE_SIZE)
+        print("=== SAVED CHARACTERS ===")
+        for number, name in enumerate(names, 1):
+            print(f"{number}. {name}")
+        print(f"Showing {offset + 1}-{offset + len(names)} of {total}")
+        print("Enter a number to load, 'n'/'p' for the next/previous page,")
+        print("'/text' to search by name, or 'q' to go back.")
+        choice = input("Choice: ").strip()
+        
+        if choice == 'q':
+            return
+        elif choice == 'n':
+            if offset + SAVE_LIST_PAGE_SIZE < total:
+                offset += SAVE_LIST_PAGE_SIZE
+        elif choice == 'p':
+            offset = max(0, offset - SAVE_LIST_PAGE_SIZE)
+        elif choice.startswith('/'):
+            prefix = choice[1:]
+            offset = 0
+        elif choice.isdigit() and 1 <= int(choice) <= len(names):
+            break
+        else:
+            print("Invalid choice.")
+    
+    try:
+        current_character = character_manager.load_character(names[int(choice) - 1])
+    except CharacterNotFoundError:
+        print("That save no longer exists.")
+        return
+    except SaveFileCorruptedError:
+        print("That save file is corrupted and can't be loaded.")
+        return
+    except InvalidSaveDataError as e:
+        print(f"Error: {e}")
+        return
+    print(f"Welcome back, {current_character['name']}!")
+    game_loop()
 
 # ============================================================================
 # GAME LOOP
@@ -145,6 +232,8 @@ def game_loop():
     # TODO: Implement game loop
     # While game_running:
     while game_running:
+        # Pick up any edits to the data files since the last action
+        reload_game_data()
         # Display game menu
         choice = game_menu()
         # Get player choice
@@ -164,10 +253,13 @@ def game_loop():
             game_running = False
         else:
             print("Invalid choice. Please select a valid option.")
+        # Save game after each action (written in the background);
+        # choice 6 has already saved and flushed
+        if choice != 6:
+            queue_save()
 
-    #   Save game after each action
-    save_game()
-    print("Game saved!")
+    # Make sure everything is on disk before returning to the main menu
+    flush_saves()
 
 def game_menu():
     """
@@ -300,13 +392,61 @@ def save_game():
     # Use character_manager.save_character()
     # Handle any file I/O exceptions
     try:
-        character_manager.save_character(current_character)
+        queue_save()
+        flush_saves()
         print("Game saved successfully!")
     except Exception as e:
         print(f"Error saving game: {e}")
     finally:
         pass
 
+def queue_save():
+    """
+    Save the current character without waiting for the disk
+    
+    Uses the write-behind queue when it is running (see start_save_queue),
+    otherwise saves synchronously.
+    """
+    if save_queue is not None:
+        save_queue.save(current_character)
+    else:
+        character_manager.save_character(current_character)
+
+def flush_saves():
+    """Wait until every queued save has been written"""
+    if save_queue is not None:
+        save_queue.flush()
+
+def start_save_queue():
+    """
+    Start the background save writer
+    
+    Queued saves are flushed when the interpreter exits and on SIGTERM
+    (or SIGHUP, where available) before the process stops.
+    """
+    global save_queue
+    if save_queue is not None:
+        return save_queue
+    import save_backends
+    save_queue = save_backends.SaveQueue(character_manager.save_character)
+    atexit.register(stop_save_queue)
+    for name in ('SIGTERM', 'SIGHUP'):
+        if hasattr(signal, name):
+            signal.signal(getattr(signal, name), _flush_and_exit)
+    return save_queue
+
+def stop_save_queue():
+    """Flush and stop the background save writer"""
+    global save_queue
+    if save_queue is not None:
+        save_queue.close()
+        save_queue = None
+
+def _flush_and_exit(signum, frame):
+    """Signal handler: write pending saves, then exit"""
+    stop_save_queue()
+    sys.exit(128 + signum)
+
 def load_game_data():
     """Load all quest and item data from files"""
     global all_quests, all_items
@@ -317,18 +457,42 @@ def load_game_data():
     # Handle MissingDataFileError, InvalidDataFormatError
     # If files missing, create defaults with game_data.create_default_data_files()
     try:
-        all_quests = game_data.load_quests()
-        all_items = game_data.load_items()
+        all_quests = game_data.load_quests(QUEST_DATA_FILE, use_cache=True)
+        all_items = game_data.load_items(ITEM_DATA_FILE, use_cache=True)
     except MissingDataFileError as e:
         print(f"Data file missing: {e}")
         game_data.create_default_data_files()
-        all_quests = game_data.load_quests()
-        all_items = game_data.load_items()
+        all_quests = game_data.load_quests(QUEST_DATA_FILE)
+        all_items = game_data.load_items(ITEM_DATA_FILE)
     except InvalidDataFormatError as e:
         print(f"Data format error: {e}")
         raise None
     finally:
         pass
+    # Remember file stats so reload_game_data() can spot later edits
+    game_data.snapshot_catalog(QUEST_DATA_FILE, 'quests')
+    game_data.snapshot_catalog(ITEM_DATA_FILE, 'items')
+
+def reload_game_data():
+    """
+    Pick up edits to the quest/item files without restarting
+    
+    all_quests and all_items are patched in place. A file that is mid-edit
+    or invalid is reported and the current data is kept.
+    """
+    global all_quests, all_items
+
+    for label, catalog, reload_function, filename in (
+            ("quests", all_quests, game_data.reload_quests, QUEST_DATA_FILE),
+            ("items", all_items, game_data.reload_items, ITEM_DATA_FILE)):
+        try:
+            diff = reload_function(catalog, filename)
+        except (MissingDataFileError, InvalidDataFormatError, CorruptedDataError) as e:
+            print(f"Could not reload {label}: {e}")
+            continue
+        if diff['added'] or diff['removed'] or diff['modified']:
+            print(f"Reloaded {label}: {len(diff['added'])} added, "
+                  f"{len(diff['removed'])} removed, {len(diff['modified'])} modified")
 
 def handle_character_death():
     """Handle character death"""
@@ -360,6 +524,26 @@ def handle_character_death():
     # If revive: use character_manager.revive_character()
     # If quit: set game_running = False
 
+def report_import_times():
+    """
+    Print how long each subsystem module takes to load
+    
+    Modules are loaded in SUBSYSTEM_MODULES order, so each time covers the
+    module itself plus any dependency that was not loaded before it.
+    
+    Returns: Dictionary {module_name: seconds}
+    """
+    timings = {}
+    print("=== IMPORT TIME ===")
+    for name in SUBSYSTEM_MODULES:
+        module = sys.modules[name]
+        start = time.perf_counter()
+        getattr(module, '__name__')  # First attribute access runs the module
+        timings[name] = time.perf_counter() - start
+        print(f"{name:<20} {timings[name] * 1000:8.2f} ms")
+    print(f"{'total':<20} {sum(timings.values()) * 1000:8.2f} ms")
+    return timings
+
 def display_welcome():
     """Display welcome message"""
     print("=" * 50)
@@ -392,6 +576,9 @@ def main():
         print("Please check data files for errors.")
         return
     
+    # Saves made during play are written by a background thread
+    start_save_queue()
+    
     # Main menu loop
     while True:
         choice = main_menu()
@@ -405,4 +592,7 @@ def main():
         else:
             print("Invalid choice. Please select 1-3.")
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    if "--import-time" in sys.argv[1:]:
+        report_import_times()
+    else:
+        main()
\ No newline at end of file
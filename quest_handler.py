@@ -10,12 +10,14 @@ This module handles quest management, dependencies, and completion.
 """
 
 import character_manager
+import game_data
 from custom_exceptions import (
     QuestNotFoundError,
     QuestRequirementsNotMetError,
     QuestAlreadyCompletedError,
     QuestNotActiveError,
-    InsufficientLevelError
+    InsufficientLevelError,
+    InvalidDataFormatError
 )
 
 # ============================================================================
@@ -146,18 +148,31 @@ def get_completed_quests(character, quest_data_dict):
             completed_quests.append(quest_data_dict[qid])
     return completed_quests
 
-def get_available_quests(character, quest_data_dict):
+def get_available_quests(character, quest_data_dict, quest_graph=None, level_index=None):
     """
     Get quests that character can currently accept
     
     Available = meets level req + prerequisite done + not completed + not active
     
+    If a QuestGraph built from the current quest_data_dict is given, only
+    quests with no prerequisite and the follow-ups of completed quests are
+    checked instead of every quest; a stale graph falls back to the scan.
+    Otherwise a game_data.QuestLevelIndex limits the scan to quests at or
+    below the character's level.
+    
     Returns: List of quest dictionaries
     """
     # TODO: Implement available quest search
     # Filter all quests by requirements
+    if quest_graph is not None and quest_graph.is_current(quest_data_dict):
+        return quest_graph.get_available_quests(character)
+    if level_index is not None:
+        candidates = [(quest['quest_id'], quest)
+                      for quest in level_index.quests_between(None, character['level'])]
+    else:
+        candidates = quest_data_dict.items()
     available_quests = []
-    for qid, quest in quest_data_dict.items():
+    for qid, quest in candidates:
         if (character['level'] >= quest['required_level'] and
             (quest['prerequisite'] == "NONE" or quest['prerequisite'] in character['completed_quests']) and
             qid not in character['completed_quests'] and
@@ -216,7 +231,7 @@ def can_accept_quest(character, quest_id, quest_data_dict):
         return False
     return True
 
-def get_quest_prerequisite_chain(quest_id, quest_data_dict):
+def get_quest_prerequisite_chain(quest_id, quest_data_dict, quest_graph=None):
     """
     Get the full chain of prerequisites for a quest
     
@@ -224,18 +239,26 @@ def get_quest_prerequisite_chain(quest_id, quest_data_dict):
     Example: If Quest C requires Quest B, which requires Quest A:
              Returns ["quest_a", "quest_b", "quest_c"]
     
-    Raises: QuestNotFoundError if quest doesn't exist
+    Raises: 
+        QuestNotFoundError if quest doesn't exist
+        InvalidDataFormatError if the prerequisites form a cycle
     """
     # TODO: Implement prerequisite chain tracing
     # Follow prerequisite links backwards
     # Build list in reverse order
+    if quest_graph is not None and quest_graph.is_current(quest_data_dict):
+        return list(quest_graph.get_chain(quest_id))
     if quest_id not in quest_data_dict:
         raise QuestNotFoundError(f"Quest '{quest_id}' not found.")
     chain = []
+    visited = set()
     current_quest_id = quest_id
     while current_quest_id != "NONE":
         if current_quest_id not in quest_data_dict:
             raise QuestNotFoundError(f"Quest '{current_quest_id}' not found.")
+        if current_quest_id in visited:
+            raise InvalidDataFormatError(f"Quest prerequisites form a cycle at '{current_quest_id}'.")
+        visited.add(current_quest_id)
         chain.append(current_quest_id)
         current_quest = quest_data_dict[current_quest_id]
         current_quest_id = current_quest['prerequisite']
@@ -280,13 +303,18 @@ def get_total_quest_rewards_earned(character, quest_data_dict):
             total_gold += quest['reward_gold']
     return {'total_xp': total_xp, 'total_gold': total_gold}
 
-def get_quests_by_level(quest_data_dict, min_level, max_level):
+def get_quests_by_level(quest_data_dict, min_level, max_level, level_index=None):
     """
     Get all quests within a level range
     
+    If a game_data.QuestLevelIndex is given the range is found with bisect
+    instead of scanning every quest.
+    
     Returns: List of quest dictionaries
     """
     # TODO: Implement level filtering
+    if level_index is not None:
+        return level_index.quests_between(min_level, max_level)
     filtered_quests = []
     for quest in quest_data_dict.values():
         if min_level <= quest['required_level'] <= max_level:
@@ -345,24 +373,181 @@ def display_character_quest_progress(character, quest_data_dict):
 # VALIDATION
 # ============================================================================
 
-def validate_quest_prerequisites(quest_data_dict):
+def validate_quest_prerequisites(quest_data_dict, quest_graph=None):
     """
     Validate that all quest prerequisites exist
     
     Checks that every prerequisite (that's not "NONE") refers to a real quest
     
+    A QuestGraph is only built from valid data, so passing one built from
+    quest_data_dict as it is now makes this an O(1) check.
+    
     Returns: True if all valid
     Raises: QuestNotFoundError if invalid prerequisite found
     """
     # TODO: Implement prerequisite validation
     # Check each quest's prerequisite
     # Ensure prerequisite exists in quest_data_dict
+    if quest_graph is not None and quest_graph.is_current(quest_data_dict):
+        return True
     for quest_id, quest in quest_data_dict.items():
         prereq = quest['prerequisite']
         if prereq != "NONE" and prereq not in quest_data_dict:
             raise QuestNotFoundError(f"Quest '{quest_id}' has invalid prerequisite '{prereq}'.")
     return True
 
+# ============================================================================
+# QUEST GRAPH
+# ============================================================================
+
+class QuestGraph:
+    """
+    Prerequisite graph built once from the loaded quest dictionary
+    
+    Each quest has at most one prerequisite, so the graph is a forest.
+    Building it checks that every prerequisite exists and that there are
+    no cycles, then precomputes:
+    - order: quest ids in topological order (prerequisites first)
+    - depth: number of prerequisites above each quest
+    - children: quests that list each quest as their prerequisite
+    - roots: quests with no prerequisite
+    
+    Chains are memoized the first time they are asked for, and
+    is_prerequisite_of() answers "is A anywhere above B" in O(1).
+    
+    The graph remembers the catalog generation it was built at, so
+    is_current() spots in-place changes made by game_data.reload_quests.
+    """
+    
+    def __init__(self, quest_data_dict):
+        """
+        Build the graph
+        
+        Raises:
+            QuestNotFoundError if a prerequisite doesn't exist
+            InvalidDataFormatError if prerequisites form a cycle
+        """
+        self.quests = quest_data_dict
+        self.generation = game_data.get_catalog_generation(quest_data_dict)
+        self.roots = []
+        self.children = {quest_id: [] for quest_id in quest_data_dict}
+        self.position = {}
+        for index, (quest_id, quest) in enumerate(quest_data_dict.items()):
+            self.position[quest_id] = index
+            prereq = quest['prerequisite']
+            if prereq == "NONE":
+                self.roots.append(quest_id)
+            elif prereq not in quest_data_dict:
+                raise QuestNotFoundError(f"Quest '{quest_id}' has invalid prerequisite '{prereq}'.")
+            else:
+                self.children[prereq].append(quest_id)
+
+        # Depth-first walk from the roots gives a topological order plus
+        # entry/exit numbers for O(1) ancestor checks
+        self.order = []
+        self.depth = {}
+        self._enter = {}
+        self._exit = {}
+        counter = 0
+        for root in self.roots:
+            stack = [(root, 0, False)]
+            while stack:
+                quest_id, depth, finished = stack.pop()
+                if finished:
+                    self._exit[quest_id] = counter
+                    continue
+                self.order.append(quest_id)
+                self.depth[quest_id] = depth
+                self._enter[quest_id] = counter
+                counter += 1
+                stack.append((quest_id, depth, True))
+                for child in reversed(self.children[quest_id]):
+                    stack.append((child, depth + 1, False))
+
+        if len(self.order) < len(quest_data_dict):
+            raise InvalidDataFormatError(
+                f"Quest prerequisites form a cycle: {' -> '.join(self._find_cycle())}")
+        self._chains = {}
+    
+    def is_current(self, quest_data_dict):
+        """Return True if the graph was built from quest_data_dict as it is now"""
+        return (self.quests is quest_data_dict and
+                self.generation == game_data.get_catalog_generation(quest_data_dict))
+    
+    def _find_cycle(self):
+        """Return one cycle among the quests the walk never reached"""
+        unreached = next(quest_id for quest_id in self.quests if quest_id not in self.depth)
+        path = []
+        seen = {}
+        quest_id = unreached
+        while quest_id not in seen:
+            seen[quest_id] = len(path)
+            path.append(quest_id)
+            quest_id = self.quests[quest_id]['prerequisite']
+        return path[seen[quest_id]:] + [quest_id]
+    
+    def get_chain(self, quest_id):
+        """
+        Get the prerequisite chain ending at quest_id
+        
+        Returns: Tuple of quest ids [earliest_prereq, ..., quest_id]
+        Raises: QuestNotFoundError if quest doesn't exist
+        """
+        chain = self._chains.get(quest_id)
+        if chain is not None:
+            return chain
+        if quest_id not in self.depth:
+            raise QuestNotFoundError(f"Quest '{quest_id}' not found.")
+        links = []
+        current = quest_id
+        while current != "NONE" and current not in self._chains:
+            links.append(current)
+            current = self.quests[current]['prerequisite']
+        links.reverse()
+        chain = (self._chains[current] if current != "NONE" else ()) + tuple(links)
+        self._chains[quest_id] = chain
+        return chain
+    
+    def is_prerequisite_of(self, ancestor_id, quest_id):
+        """Return True if ancestor_id appears anywhere above quest_id"""
+        if ancestor_id == quest_id or ancestor_id not in self._enter or quest_id not in self._enter:
+            return False
+        return self._enter[ancestor_id] < self._enter[quest_id] < self._exit[ancestor_id]
+    
+    def get_available_quests(self, character):
+        """
+        Get quests the character can accept, checking only the candidates
+        
+        Candidates are root quests and the children of completed quests.
+        Results are in the same order as the quest dictionary.
+        
+        Returns: List of quest dictionaries
+        """
+        completed = set(character['completed_quests'])
+        active = set(character['active_quests'])
+        candidates = list(self.roots)
+        for quest_id in completed:
+            candidates.extend(self.children.get(quest_id, ()))
+        candidates.sort(key=self.position.__getitem__)
+        available_quests = []
+        for quest_id in candidates:
+            quest = self.quests[quest_id]
+            if (character['level'] >= quest['required_level'] and
+                    quest_id not in completed and quest_id not in active):
+                available_quests.append(quest)
+        return available_quests
+
+def build_quest_graph(quest_data_dict):
+    """
+    Build a QuestGraph for a quest dictionary
+    
+    Returns: QuestGraph
+    Raises:
+        QuestNotFoundError if a prerequisite doesn't exist
+        InvalidDataFormatError if prerequisites form a cycle
+    """
+    return QuestGraph(quest_data_dict)
+
 # ============================================================================
 # TESTING
 # ============================================================================
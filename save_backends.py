@@ -0,0 +1,1211 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Save Backends Module
+
+This module holds the storage backends used by character_manager to save
+and load characters:
+
+- TextSaveBackend: one {name}_save.txt file per character (the default)
+- BinarySaveBackend: one {name}_save.bin file per character in a compact,
+  checksummed binary format
+- SqliteSaveBackend: every character in one sqlite3 database
+- LogSaveBackend: every character in one append-only log file with an
+  in-memory index, compacted when too much of it is stale
+
+Every backend stores the same fields, so a character loads identically
+whichever backend saved it. SaveQueue moves saves onto
+a background writer thread.
+"""
+
+import bisect
+import os
+import struct
+import sys
+import tempfile
+import threading
+import zlib
+from collections.abc import MutableSequence
+
+import inventory_storage
+from custom_exceptions import (
+    CharacterNotFoundError,
+    SaveFileCorruptedError,
+    InvalidSaveDataError
+)
+
+def parse_save_list(value):
+    """Decode a comma-separated save value into a list"""
+    return value.split(',') if value else []
+
+def parse_save_inventory(value):
+    """Decode an inventory save value ("item_id" or "item_id*count" tokens)"""
+    return inventory_storage.Inventory.from_stacks(parse_save_list(value))
+
+# Field table for the save format, in file order: (field, type, decoder).
+# The decoder turns the text after "KEY:" into the field's value and
+# raises ValueError if it can't.
+SAVE_SCHEMA = (
+    ('name', str, str),
+    ('class', str, str),
+    ('level', int, int),
+    ('health', int, int),
+    ('max_health', int, int),
+    ('strength', int, int),
+    ('magic', int, int),
+    ('experience', int, int),
+    ('gold', int, int),
+    ('inventory', list, parse_save_inventory),
+    ('active_quests', list, parse_save_list),
+    ('completed_quests', list, parse_save_list)
+)
+
+# Fields written to every save, in file order
+SAVE_FIELDS = [field for field, field_type, decoder in SAVE_SCHEMA]
+
+# Fields stored as comma-separated lists
+LIST_FIELDS = [field for field, field_type, decoder in SAVE_SCHEMA if field_type is list]
+
+# List fields saved as "item_id*count" stacks: field → (to tokens, from tokens)
+STACKED_FIELDS = {
+    'inventory': (inventory_storage.to_stacks, inventory_storage.Inventory.from_stacks)
+}
+
+# Save file KEY → (field, decoder)
+_FIELD_DECODERS = {field.upper(): (field, decoder) for field, field_type, decoder in SAVE_SCHEMA}
+
+# ============================================================================
+# TEXT ENCODING
+# ============================================================================
+
+def encode_character_text(character, fields=None):
+    """
+    Encode a character in the KEY: value save format
+
+    Lists are written as comma-separated values. Only the given fields
+    are written if fields is not None.
+
+    Returns: String with one line per field
+    """
+    lines = []
+    for field in SAVE_FIELDS if fields is None else fields:
+        value = character[field]
+        if field in STACKED_FIELDS:
+            value = ','.join(STACKED_FIELDS[field][0](value))
+        elif field in LIST_FIELDS:
+            value = ','.join(value)
+        lines.append(f"{field.upper()}: {value}\n")
+    return ''.join(lines)
+
+def decode_character_text(text, character_name):
+    """
+    Decode the KEY: value save format into a typed character dictionary
+
+    Every line is converted and checked against SAVE_SCHEMA as it is
+    read, so numbers come back as ints and lists as lists with no
+    separate validation pass. Keys the schema doesn't know are kept as
+    strings. If a key appears twice the later line wins.
+
+    Returns: Character dictionary
+    Raises: InvalidSaveDataError if a field is missing or has a bad value
+    """
+    character = {}
+    decoders = _FIELD_DECODERS
+    for line in text.splitlines():
+        key, colon, value = line.partition(':')
+        if not colon:  # Skip empty lines and lines without a colon
+            continue
+        key = key.strip()
+        value = value.strip()
+        entry = decoders.get(key) or decoders.get(key.upper())
+        if entry is None:
+            if key:
+                character[key.lower()] = value
+            continue
+        field, decoder = entry
+        try:
+            character[field] = decoder(value)
+        except ValueError:
+            raise InvalidSaveDataError(
+                f"Save file for '{character_name}' has an invalid {field}: {value!r}") from None
+
+    for field in SAVE_FIELDS:
+        if field not in character:
+            raise InvalidSaveDataError(f"Save file for '{character_name}' is invalid.")
+    return character
+
+def write_file_atomic(filename, text):
+    """
+    Replace a file's contents so readers see the old or new file, never half of one
+
+    The text (str or bytes) is written and fsynced to a temporary file in
+    the same directory, which is then renamed over the target with
+    os.replace. The file keeps its existing mode, and a new file gets the
+    mode open() would give it (0o666 less the umask).
+    """
+    directory = os.path.dirname(filename) or '.'
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb' if isinstance(text, bytes) else 'w') as file:
+            file.write(text)
+            file.flush()
+            os.fsync(file.fileno())
+        os.chmod(temp_path, _file_mode(filename))
+        os.replace(temp_path, filename)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+# Reading the umask means setting it, which isn't safe once save threads
+# are running, so it is read once at import
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+def _file_mode(filename):
+    """Return the permission bits for (re)writing a file"""
+    try:
+        return os.stat(filename).st_mode & 0o7777
+    except FileNotFoundError:
+        # mkstemp files are 0o600; match what a plain open() would create
+        return 0o666 & ~_UMASK
+
+# ============================================================================
+# BINARY ENCODING
+# ============================================================================
+
+# Binary save layout:
+#   header   magic, version, flags, body length      ('<5sBBI')
+#   body     SAVE_SCHEMA fields in order, zlib-compressed if FLAG_ZLIB:
+#              str  → varint byte length + UTF-8
+#              int  → zigzag varint
+#              list → varint count + the items NUL-joined as one str
+#   trailer  CRC32 of header + body                  ('<I')
+SAVE_MAGIC = b'QCSAV'
+SAVE_VERSION = 1
+FLAG_ZLIB = 0x01
+_SAVE_HEADER = struct.Struct('<5sBBI')
+_SAVE_TRAILER = struct.Struct('<I')
+
+# Bodies at least this big are compressed when compression is automatic
+COMPRESS_MIN_BYTES = 256
+
+def is_binary_save(data):
+    """Return True if data starts like a binary save"""
+    return data[:len(SAVE_MAGIC)] == SAVE_MAGIC
+
+def _write_varint(out, value):
+    while value > 0x7f:
+        out.append((value & 0x7f) | 0x80)
+        value >>= 7
+    out.append(value)
+
+def _write_string(out, value):
+    encoded = value.encode()
+    _write_varint(out, len(encoded))
+    out += encoded
+
+def _read_varint(data, position):
+    result = data[position]
+    if result < 0x80:  # Most values fit in one byte
+        return result, position + 1
+    result = 0
+    shift = 0
+    while True:
+        byte = data[position]
+        position += 1
+        result |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            return result, position
+        shift += 7
+
+def _read_string(data, position):
+    length, position = _read_varint(data, position)
+    end = position + length
+    if end > len(data):
+        raise IndexError("string runs past the end of the save")
+    return data[position:end].decode(), end
+
+def encode_character_binary(character, compress=None):
+    """
+    Encode a character in the binary save format
+
+    Args:
+        compress: True/False to force zlib on/off; None compresses bodies
+                  of COMPRESS_MIN_BYTES or more when that makes them smaller
+
+    Returns: bytes
+    """
+    body = bytearray()
+    for field, field_type, decoder in SAVE_SCHEMA:
+        value = character[field]
+        if field_type is int:
+            value = int(value)
+            _write_varint(body, value << 1 if value >= 0 else (-value << 1) - 1)
+        elif field_type is list:
+            if field in STACKED_FIELDS:
+                value = STACKED_FIELDS[field][0](value)
+            if any('\0' in item for item in value):
+                raise ValueError(f"{field} items can't contain NUL characters")
+            _write_varint(body, len(value))
+            _write_string(body, '\0'.join(value))
+        else:
+            _write_string(body, value)
+
+    flags = 0
+    if compress or (compress is None and len(body) >= COMPRESS_MIN_BYTES):
+        packed = zlib.compress(bytes(body))
+        if compress or len(packed) < len(body):
+            body = packed
+            flags |= FLAG_ZLIB
+    data = _SAVE_HEADER.pack(SAVE_MAGIC, SAVE_VERSION, flags, len(body)) + bytes(body)
+    return data + _SAVE_TRAILER.pack(zlib.crc32(data))
+
+def decode_character_binary(data, character_name):
+    """
+    Decode a binary save
+
+    The length and CRC32 are checked before the body is parsed.
+
+    Returns: Character dictionary
+    Raises: SaveFileCorruptedError if the data is truncated, fails the
+            checksum, or can't be parsed
+    """
+    if len(data) < _SAVE_HEADER.size + _SAVE_TRAILER.size or not is_binary_save(data):
+        raise SaveFileCorruptedError(f"Save for '{character_name}' is not a binary save or is truncated.")
+    magic, version, flags, body_length = _SAVE_HEADER.unpack_from(data)
+    if version > SAVE_VERSION:
+        raise SaveFileCorruptedError(f"Save for '{character_name}' has unsupported version {version}.")
+    end = _SAVE_HEADER.size + body_length
+    if len(data) != end + _SAVE_TRAILER.size:
+        raise SaveFileCorruptedError(f"Save for '{character_name}' is truncated.")
+    if zlib.crc32(data[:end]) != _SAVE_TRAILER.unpack_from(data, end)[0]:
+        raise SaveFileCorruptedError(f"Save for '{character_name}' failed its checksum.")
+
+    try:
+        body = data[_SAVE_HEADER.size:end]
+        if flags & FLAG_ZLIB:
+            body = zlib.decompress(body)
+        character = {}
+        position = 0
+        for field, field_type, decoder in SAVE_SCHEMA:
+            if field_type is int:
+                value, position = _read_varint(body, position)
+                character[field] = (value >> 1) ^ -(value & 1)
+            elif field_type is list:
+                count, position = _read_varint(body, position)
+                joined, position = _read_string(body, position)
+                items = joined.split('\0') if count else []
+                if len(items) != count:
+                    raise IndexError(f"{field} holds {len(items)} items, expected {count}")
+                if field in STACKED_FIELDS:
+                    items = STACKED_FIELDS[field][1](items)
+                character[field] = items
+            else:
+                character[field], position = _read_string(body, position)
+    except (IndexError, ValueError, zlib.error) as e:
+        raise SaveFileCorruptedError(f"Save for '{character_name}' can't be decoded: {e}") from e
+    if position != len(body):
+        raise SaveFileCorruptedError(f"Save for '{character_name}' has trailing data.")
+    return character
+
+# ============================================================================
+# BACKEND BASE
+# ============================================================================
+
+class SaveBackend:
+    """
+    Bookkeeping shared by the save backends
+
+    Every delete bumps the character's save epoch, so callers that skip
+    saving unchanged characters (see character_manager.TrackedCharacter)
+    can tell a save made before the delete from one made after it.
+
+    save() returns how many fields it wrote: len(SAVE_FIELDS) unless the
+    backend writes only the changed fields.
+    """
+
+    def __init__(self):
+        # (abs directory, name) → number of deletes so far
+        self._save_epochs = {}
+        self._epoch_lock = threading.Lock()
+
+    def save_epoch(self, character_name, save_directory):
+        """Return how many times a character's save was deleted through this backend"""
+        return self._save_epochs.get((os.path.abspath(save_directory), character_name), 0)
+
+    def _bump_save_epoch(self, character_name, save_directory):
+        key = (os.path.abspath(save_directory), character_name)
+        with self._epoch_lock:
+            self._save_epochs[key] = self._save_epochs.get(key, 0) + 1
+
+    def has_save(self, character_name, save_directory):
+        """Return True if a character's save is present (False if the backend can't tell)"""
+        return False
+
+# ============================================================================
+# TEXT FILE BACKEND
+# ============================================================================
+
+class TextSaveBackend(SaveBackend):
+    """
+    One {name}_save.txt file per character (the original format)
+
+    With shard_prefix_length > 0, saves go into subdirectories named after
+    the first hex digits of the CRC32 of the character name (e.g.
+    save_games/3f/Hero_save.txt), so no directory grows too large. Saves
+    left at the top level are still found.
+
+    Listing uses an index of sorted names per directory, built with
+    os.scandir and rebuilt only when the directory's (or a shard's)
+    mtime changes. Saves and deletes through this backend update the
+    index in place.
+    """
+
+    name = 'text'
+    SUFFIX = "_save.txt"
+    # Every save file suffix this backend lists and loads
+    SUFFIXES = (SUFFIX,)
+
+    def __init__(self, shard_prefix_length=0):
+        super().__init__()
+        self.shard_prefix_length = shard_prefix_length
+        # abs directory → (signature, sorted names, shard names)
+        self._name_index = {}
+        self._lock = threading.Lock()
+
+    def shard_name(self, character_name):
+        """Return the shard subdirectory for a character ('' if unsharded)"""
+        if not self.shard_prefix_length:
+            return ''
+        return f"{zlib.crc32(character_name.encode()):08x}"[:self.shard_prefix_length]
+
+    def save_path(self, character_name, save_directory):
+        """Return the save file path for a character"""
+        return os.path.join(save_directory, self.shard_name(character_name),
+                            f"{character_name}{self.SUFFIX}")
+
+    def _find_save(self, character_name, save_directory):
+        """Return the existing save file for a character, or None"""
+        for filename in self._candidate_paths(character_name, save_directory):
+            if os.path.exists(filename):
+                return filename
+        return None
+
+    def has_save(self, character_name, save_directory):
+        """Return True if a character's save file exists"""
+        return self._find_save(character_name, save_directory) is not None
+
+    def _candidate_paths(self, character_name, save_directory):
+        """Yield every place a character's save may be, preferred first"""
+        shard = self.shard_name(character_name)
+        for suffix in self.SUFFIXES:
+            yield os.path.join(save_directory, shard, f"{character_name}{suffix}")
+            if shard:
+                yield os.path.join(save_directory, f"{character_name}{suffix}")
+
+    def save(self, character, save_directory, fields=None):
+        """Write a character's save file (always the full file) and return the field count"""
+        filename = self.save_path(character['name'], save_directory)
+        before = self._index_is_current(save_directory)
+        os.makedirs(os.path.dirname(filename), exist_ok=True)
+        write_file_atomic(filename, encode_character_text(character))
+        self._update_index(save_directory, character['name'], True, before)
+        return len(SAVE_FIELDS)
+
+    def load(self, character_name, save_directory):
+        """
+        Read and decode a character's save file
+
+        Raises: CharacterNotFoundError, SaveFileCorruptedError, InvalidSaveDataError
+        """
+        filename = self._find_save(character_name, save_directory)
+        if filename is None:
+            raise CharacterNotFoundError(f"Character '{character_name}' not found.")
+        return self._read_save(filename, character_name)
+
+    def _read_save(self, filename, character_name):
+        try:
+            with open(filename, 'r') as file:
+                text = file.read()
+        except Exception as e:
+            raise SaveFileCorruptedError(f"{e} exists but can't be read") from e
+        return decode_character_text(text, character_name)
+
+    def list_names(self, save_directory, prefix='', offset=0, limit=None):
+        """Return saved character names in sorted order (see page_names)"""
+        return page_names(self._sorted_names(save_directory), prefix, offset, limit)
+
+    def count_names(self, save_directory, prefix=''):
+        """Return how many saved character names start with prefix"""
+        return count_prefix(self._sorted_names(save_directory), prefix)
+
+    def delete(self, character_name, save_directory):
+        """
+        Delete a character's save file
+
+        Raises: CharacterNotFoundError if the character doesn't exist
+        """
+        filename = self._find_save(character_name, save_directory)
+        if filename is None:
+            raise CharacterNotFoundError(f"Character '{character_name}' not found.")
+        before = self._index_is_current(save_directory)
+        os.remove(filename)
+        self._bump_save_epoch(character_name, save_directory)
+        self._update_index(save_directory, character_name, False, before)
+        return True
+
+    # ------------------------------------------------------------------
+    # Name index
+    # ------------------------------------------------------------------
+
+    def _signature(self, directory, shards):
+        """Return the mtimes that change whenever a save is added or removed"""
+        try:
+            mtimes = [os.stat(directory).st_mtime_ns]
+            for shard in shards:
+                mtimes.append(os.stat(os.path.join(directory, shard)).st_mtime_ns)
+        except FileNotFoundError:
+            return None
+        return tuple(mtimes)
+
+    def _scan(self, directory):
+        """
+        List save names with os.scandir, descending into shard directories
+
+        Each directory is stat'ed before it is read, so a save added
+        during the scan leaves the signature stale and forces a rescan.
+
+        Returns: (signature, sorted names, shard names)
+        """
+        mtimes = [os.stat(directory).st_mtime_ns]
+        names = []
+        shards = []
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.name.endswith(self.SUFFIXES) and entry.is_file():
+                    names.append(self._strip_suffix(entry.name))
+                elif self.shard_prefix_length and entry.is_dir() and _is_shard_name(entry.name, self.shard_prefix_length):
+                    shards.append(entry.name)
+        shards.sort()
+        for shard in shards:
+            shard_directory = os.path.join(directory, shard)
+            mtimes.append(os.stat(shard_directory).st_mtime_ns)
+            with os.scandir(shard_directory) as entries:
+                for entry in entries:
+                    if entry.name.endswith(self.SUFFIXES) and entry.is_file():
+                        names.append(self._strip_suffix(entry.name))
+        return tuple(mtimes), sorted(set(names)), shards
+
+    def _strip_suffix(self, filename):
+        for suffix in self.SUFFIXES:
+            if filename.endswith(suffix):
+                return filename[:-len(suffix)]
+        return filename
+
+    def _sorted_names(self, save_directory):
+        """Return the cached sorted names, rescanning if the directory changed"""
+        directory = os.path.abspath(save_directory)
+        with self._lock:
+            cached = self._name_index.get(directory)
+            if cached is not None and self._signature(directory, cached[2]) == cached[0]:
+                return cached[1]
+            if not os.path.isdir(directory):
+                self._name_index.pop(directory, None)
+                return []
+            self._name_index[directory] = self._scan(directory)
+            return self._name_index[directory][1]
+
+    def _index_is_current(self, save_directory):
+        """Return True if the cached index matches the directory right now"""
+        directory = os.path.abspath(save_directory)
+        with self._lock:
+            cached = self._name_index.get(directory)
+            return cached is not None and self._signature(directory, cached[2]) == cached[0]
+
+    def _update_index(self, save_directory, character_name, present, was_current):
+        """Apply our own save/delete to the index instead of rescanning"""
+        directory = os.path.abspath(save_directory)
+        with self._lock:
+            cached = self._name_index.get(directory)
+            if cached is None:
+                return
+            if not was_current:
+                # Someone else changed the directory too; rescan next time
+                del self._name_index[directory]
+                return
+            signature, names, shards = cached
+            shard = self.shard_name(character_name)
+            if shard and shard not in shards:
+                shards = sorted(shards + [shard])
+            position = bisect.bisect_left(names, character_name)
+            found = position < len(names) and names[position] == character_name
+            if present and not found:
+                names = names[:position] + [character_name] + names[position:]
+            elif not present and found and self._find_save(character_name, save_directory) is None:
+                names = names[:position] + names[position + 1:]
+            self._name_index[directory] = (self._signature(directory, shards), names, shards)
+
+def _is_shard_name(name, length):
+    """Return True if a directory name looks like a save shard"""
+    return len(name) == length and all(char in '0123456789abcdef' for char in name)
+
+def page_names(sorted_names, prefix='', offset=0, limit=None):
+    """
+    Return one page of names that start with prefix
+
+    Args:
+        sorted_names: Names in sorted order
+        prefix: Only names starting with this are returned
+        offset: Number of matching names to skip
+        limit: Maximum number of names to return (None for all)
+    """
+    start, end = _prefix_range(sorted_names, prefix)
+    start = min(start + offset, end)
+    if limit is not None:
+        end = min(end, start + limit)
+    return sorted_names[start:end]
+
+def count_prefix(sorted_names, prefix=''):
+    """Return how many sorted names start with prefix"""
+    start, end = _prefix_range(sorted_names, prefix)
+    return end - start
+
+def _prefix_range(sorted_names, prefix):
+    if not prefix:
+        return 0, len(sorted_names)
+    start = bisect.bisect_left(sorted_names, prefix)
+    end = bisect.bisect_left(sorted_names, prefix[:-1] + chr(ord(prefix[-1]) + 1), start)
+    return start, end
+
+class BinarySaveBackend(TextSaveBackend):
+    """
+    One {name}_save.bin file per character in the binary save format
+
+    Text saves ({name}_save.txt) in the same directory are still listed
+    and loaded; saving a character writes its binary file and removes
+    the old text file. Sharding and the name index work as in
+    TextSaveBackend.
+    """
+
+    name = 'binary'
+    SUFFIX = "_save.bin"
+    SUFFIXES = (SUFFIX, TextSaveBackend.SUFFIX)
+
+    def __init__(self, shard_prefix_length=0, compress=None):
+        super().__init__(shard_prefix_length)
+        self.compress = compress
+
+    def save(self, character, save_directory, fields=None):
+        """Write a character's binary save file (always the full file) and return the field count"""
+        filename = self.save_path(character['name'], save_directory)
+        before = self._index_is_current(save_directory)
+        os.makedirs(os.path.dirname(filename), exist_ok=True)
+        write_file_atomic(filename, encode_character_binary(character, self.compress))
+        for legacy in self._candidate_paths(character['name'], save_directory):
+            if legacy.endswith(TextSaveBackend.SUFFIX) and os.path.exists(legacy):
+                os.remove(legacy)
+        self._update_index(save_directory, character['name'], True, before)
+        return len(SAVE_FIELDS)
+
+    def _read_save(self, filename, character_name):
+        try:
+            with open(filename, 'rb') as file:
+                data = file.read()
+        except Exception as e:
+            raise SaveFileCorruptedError(f"{e} exists but can't be read") from e
+        if is_binary_save(data):
+            return decode_character_binary(data, character_name)
+        try:
+            text = data.decode()
+        except UnicodeDecodeError as e:
+            raise SaveFileCorruptedError(f"Save for '{character_name}' can't be read: {e}") from e
+        return decode_character_text(text, character_name)
+
+    def delete(self, character_name, save_directory):
+        """
+        Delete a character's save files (binary and any leftover text)
+
+        Raises: CharacterNotFoundError if the character doesn't exist
+        """
+        super().delete(character_name, save_directory)
+        while self._find_save(character_name, save_directory) is not None:
+            super().delete(character_name, save_directory)
+        return True
+
+def convert_saves(save_directory="data/save_games", to_binary=True, shard_prefix_length=0):
+    """
+    Convert every save in a directory between the text and binary formats
+
+    Returns: Number of characters converted
+    """
+    text_backend = TextSaveBackend(shard_prefix_length)
+    binary_backend = BinarySaveBackend(shard_prefix_length)
+    count = 0
+    for name in binary_backend.list_names(save_directory):
+        filename = binary_backend._find_save(name, save_directory)
+        is_text = filename.endswith(TextSaveBackend.SUFFIX)
+        if is_text != to_binary:
+            continue
+        character = binary_backend.load(name, save_directory)
+        if to_binary:
+            binary_backend.save(character, save_directory)
+        else:
+            text_backend.save(character, save_directory)
+            os.remove(filename)
+        count += 1
+    return count
+
+# ============================================================================
+# SQLITE BACKEND
+# ============================================================================
+
+class SqliteSaveBackend(SaveBackend):
+    """
+    Every character in one sqlite3 database per save directory
+
+    The database is {save_directory}/characters.db with one row per
+    character, indexed by name.
+    """
+
+    name = 'sqlite'
+    DATABASE_NAME = "characters.db"
+
+    def __init__(self):
+        super().__init__()
+        self._connections = {}
+        self._lock = threading.Lock()
+
+    def _connect(self, save_directory, create=True):
+        """Return the (cached) connection for a save directory, or None"""
+        path = os.path.abspath(os.path.join(save_directory, self.DATABASE_NAME))
+        connection = self._connections.get(path)
+        if connection is None:
+            if not create and not os.path.exists(path):
+                return None
+            os.makedirs(save_directory, exist_ok=True)
+            # Imported here because sqlite3 is slow to import at startup
+            import sqlite3
+            connection = sqlite3.connect(path, check_same_thread=False)
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS characters (name TEXT PRIMARY KEY, data TEXT NOT NULL)")
+            connection.commit()
+            self._connections[path] = connection
+        return connection
+
+    def save(self, character, save_directory, fields=None):
+        """Insert or replace a character's row (always the full row) and return the field count"""
+        data = encode_character_text(character)
+        with self._lock:
+            connection = self._connect(save_directory)
+            connection.execute("INSERT OR REPLACE INTO characters (name, data) VALUES (?, ?)",
+                               (character['name'], data))
+            connection.commit()
+        return len(SAVE_FIELDS)
+
+    def has_save(self, character_name, save_directory):
+        """Return True if the database has a row for the character"""
+        with self._lock:
+            connection = self._connect(save_directory, create=False)
+            if connection is None:
+                return False
+            return connection.execute("SELECT 1 FROM characters WHERE name = ?",
+                                      (character_name,)).fetchone() is not None
+
+    def load(self, character_name, save_directory):
+        """
+        Load a character's row
+
+        Raises: CharacterNotFoundError, SaveFileCorruptedError, InvalidSaveDataError
+        """
+        import sqlite3
+        try:
+            with self._lock:
+                connection = self._connect(save_directory, create=False)
+                row = None
+                if connection is not None:
+                    row = connection.execute("SELECT data FROM characters WHERE name = ?",
+                                             (character_name,)).fetchone()
+        except sqlite3.DatabaseError as e:
+            raise SaveFileCorruptedError(f"Save database can't be read: {e}") from e
+        if row is None:
+            raise CharacterNotFoundError(f"Character '{character_name}' not found.")
+        return decode_character_text(row[0], character_name)
+
+    def list_names(self, save_directory, prefix='', offset=0, limit=None):
+        """Return saved character names in sorted order (see page_names)"""
+        where, parameters = self._prefix_clause(prefix)
+        with self._lock:
+            connection = self._connect(save_directory, create=False)
+            if connection is None:
+                return []
+            rows = connection.execute(
+                f"SELECT name FROM characters{where} ORDER BY name LIMIT ? OFFSET ?",
+                parameters + (-1 if limit is None else limit, offset))
+            return [row[0] for row in rows]
+
+    def count_names(self, save_directory, prefix=''):
+        """Return how many saved character names start with prefix"""
+        where, parameters = self._prefix_clause(prefix)
+        with self._lock:
+            connection = self._connect(save_directory, create=False)
+            if connection is None:
+                return 0
+            return connection.execute(f"SELECT COUNT(*) FROM characters{where}", parameters).fetchone()[0]
+
+    def _prefix_clause(self, prefix):
+        """Return a WHERE clause matching names that start with prefix (uses the name index)"""
+        if not prefix:
+            return "", ()
+        return " WHERE name >= ? AND name < ?", (prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1))
+
+    def delete(self, character_name, save_directory):
+        """
+        Delete a character's row
+
+        Raises: CharacterNotFoundError if the character doesn't exist
+        """
+        with self._lock:
+            connection = self._connect(save_directory, create=False)
+            deleted = 0
+            if connection is not None:
+                deleted = connection.execute("DELETE FROM characters WHERE name = ?",
+                                             (character_name,)).rowcount
+                connection.commit()
+        if not deleted:
+            raise CharacterNotFoundError(f"Character '{character_name}' not found.")
+        self._bump_save_epoch(character_name, save_directory)
+        return True
+
+    def close(self):
+        """Close every open database connection"""
+        with self._lock:
+            for connection in self._connections.values():
+                connection.close()
+            self._connections.clear()
+
+# ============================================================================
+# APPEND-ONLY LOG BACKEND
+# ============================================================================
+
+# Record header: operation, name length, payload length, then a CRC32 of
+# those three fields plus the name and payload. Logs written before the
+# header was checksummed (CRC32 of name + payload only) still scan.
+_LOG_HEADER = struct.Struct('<cHII')
+_LOG_CHECKED = struct.Struct('<cHI')  # The checksummed part of the header
+_LOG_PUT = b'P'
+_LOG_UPDATE = b'U'
+_LOG_DELETE = b'D'
+_LOG_OPERATIONS = (_LOG_PUT, _LOG_UPDATE, _LOG_DELETE)
+
+def _log_record(operation, name_bytes, payload):
+    """Build one log record (header + name + payload)"""
+    checked = _LOG_CHECKED.pack(operation, len(name_bytes), len(payload))
+    body = name_bytes + payload
+    return checked + struct.pack('<I', zlib.crc32(body, zlib.crc32(checked))) + body
+
+class LogSaveBackend(SaveBackend):
+    """
+    Every character in one append-only log per save directory
+
+    Saves and deletes append a record to {save_directory}/characters.log;
+    nothing is rewritten in place. A save given a list of changed fields
+    appends an update record with just those fields on top of the
+    character's last full record. An in-memory index maps each name to
+    the offsets of its full record and the updates since, so loads read
+    only those records. After MAX_UPDATES updates the next save writes a
+    full record again. The index is rebuilt by scanning the log the
+    first time a directory is used; a torn record at the end (from a
+    crash) is cut off. A damaged record anywhere else raises
+    SaveFileCorruptedError and the log is left untouched.
+
+    When stale records make up more than COMPACT_RATIO of the log (and
+    the log is at least COMPACT_MIN_BYTES), the live records are copied
+    to a new log which atomically replaces the old one.
+    """
+
+    name = 'log'
+    LOG_NAME = "characters.log"
+    COMPACT_RATIO = 0.5
+    COMPACT_MIN_BYTES = 64 * 1024
+    MAX_UPDATES = 16
+
+    def __init__(self):
+        super().__init__()
+        # abs log path → {'index': {name: [(offset, length), ...]}, 'size': int, 'live': int,
+        #                'sorted': sorted names or None}
+        self._logs = {}
+        self._lock = threading.Lock()
+
+    def _log_path(self, save_directory):
+        return os.path.abspath(os.path.join(save_directory, self.LOG_NAME))
+
+    def _open_log(self, save_directory):
+        """Return the index state for a directory, scanning the log if needed"""
+        path = self._log_path(save_directory)
+        state = self._logs.get(path)
+        if state is None:
+            state = self._scan(path)
+            self._logs[path] = state
+        return state
+
+    def _scan(self, path):
+        """
+        Build the index by reading every record in the log
+
+        Raises: SaveFileCorruptedError if a record before the last one is damaged
+        """
+        index = {}
+        offset = 0
+        if os.path.exists(path):
+            with open(path, 'rb') as file:
+                data = file.read()
+            while offset + _LOG_HEADER.size <= len(data):
+                operation, name_length, payload_length, checksum = _LOG_HEADER.unpack_from(data, offset)
+                body_start = offset + _LOG_HEADER.size
+                end = body_start + name_length + payload_length
+                if end > len(data):
+                    break  # Torn record at the end
+                body = data[body_start:end]
+                checked = data[offset:offset + _LOG_CHECKED.size]
+                valid = (operation in _LOG_OPERATIONS and
+                         checksum in (zlib.crc32(body, zlib.crc32(checked)), zlib.crc32(body)))
+                if not valid:
+                    if end == len(data):
+                        break  # Last record written only partly before a crash
+                    raise SaveFileCorruptedError(
+                        f"Save log '{path}' has a damaged record at byte {offset}.")
+                name = body[:name_length].decode()
+                entry = (body_start + name_length, payload_length)
+                if operation == _LOG_PUT:
+                    index[name] = [entry]
+                elif operation == _LOG_UPDATE:
+                    if name in index:
+                        index[name].append(entry)
+                else:
+                    index.pop(name, None)
+                offset = end
+            if offset < len(data):
+                # Drop a torn last record so later appends stay reachable
+                with open(path, 'r+b') as file:
+                    file.truncate(offset)
+        live = sum(length for records in index.values() for position, length in records)
+        return {'index': index, 'size': offset, 'live': live, 'sorted': None}
+
+    def _append(self, path, state, operation, name, payload):
+        """Append one record and return the payload offset"""
+        name_bytes = name.encode()
+        record = _log_record(operation, name_bytes, payload)
+        with open(path, 'ab') as file:
+            file.write(record)
+        payload_offset = state['size'] + _LOG_HEADER.size + len(name_bytes)
+        state['size'] += len(record)
+        return payload_offset
+
+    def save(self, character, save_directory, fields=None):
+        """
+        Append a character's latest state to the log
+
+        If fields is given and the character is already in the log, only
+        those fields are written.
+
+        Returns: The number of fields written
+        """
+        os.makedirs(save_directory, exist_ok=True)
+        name = character['name']
+        with self._lock:
+            path = self._log_path(save_directory)
+            state = self._open_log(save_directory)
+            records = state['index'].get(name)
+            if fields is not None and records and len(records) <= self.MAX_UPDATES:
+                written = len(fields)
+                payload = encode_character_text(character, fields).encode()
+                offset = self._append(path, state, _LOG_UPDATE, name, payload)
+                records.append((offset, len(payload)))
+            else:
+                written = len(SAVE_FIELDS)
+                payload = encode_character_text(character).encode()
+                offset = self._append(path, state, _LOG_PUT, name, payload)
+                state['index'][name] = [(offset, len(payload))]
+                if records is None:
+                    state['sorted'] = None
+                state['live'] -= sum(length for position, length in records or [])
+            state['live'] += len(payload)
+            self._maybe_compact(path, state)
+        return written
+
+    def has_save(self, character_name, save_directory):
+        """Return True if the log exists and indexes the character"""
+        with self._lock:
+            if not os.path.exists(self._log_path(save_directory)):
+                return False
+            return character_name in self._open_log(save_directory)['index']
+
+    def _read_records(self, file, records):
+        """Read a character's full record and updates as one save text"""
+        chunks = []
+        for offset, length in records:
+            file.seek(offset)
+            chunk = file.read(length)
+            if len(chunk) != length:
+                raise SaveFileCorruptedError("Save log record is truncated.")
+            chunks.append(chunk)
+        # Later lines override earlier ones when decoded
+        return b''.join(chunks).decode()
+
+    def load(self, character_name, save_directory):
+        """
+        Read a character's latest record
+
+        Raises: CharacterNotFoundError, SaveFileCorruptedError, InvalidSaveDataError
+        """
+        with self._lock:
+            state = self._open_log(save_directory)
+            records = state['index'].get(character_name)
+            if records is None:
+                raise CharacterNotFoundError(f"Character '{character_name}' not found.")
+            try:
+                with open(self._log_path(save_directory), 'rb') as file:
+                    text = self._read_records(file, records)
+            except (OSError, UnicodeDecodeError) as e:
+                raise SaveFileCorruptedError(f"Save log can't be read: {e}") from e
+        return decode_character_text(text, character_name)
+
+    def list_names(self, save_directory, prefix='', offset=0, limit=None):
+        """Return saved character names in sorted order (see page_names)"""
+        return page_names(self._sorted_names(save_directory), prefix, offset, limit)
+
+    def count_names(self, save_directory, prefix=''):
+        """Return how many saved character names start with prefix"""
+        return count_prefix(self._sorted_names(save_directory), prefix)
+
+    def _sorted_names(self, save_directory):
+        if not os.path.exists(self._log_path(save_directory)):
+            return []
+        with self._lock:
+            state = self._open_log(save_directory)
+            if state['sorted'] is None:
+                state['sorted'] = sorted(state['index'])
+            return state['sorted']
+
+    def delete(self, character_name, save_directory):
+        """
+        Append a delete record for a character
+
+        Raises: CharacterNotFoundError if the character doesn't exist
+        """
+        with self._lock:
+            path = self._log_path(save_directory)
+            state = self._open_log(save_directory)
+            records = state['index'].pop(character_name, None)
+            if records is None:
+                raise CharacterNotFoundError(f"Character '{character_name}' not found.")
+            self._append(path, state, _LOG_DELETE, character_name, b'')
+            state['sorted'] = None
+            state['live'] -= sum(length for offset, length in records)
+            self._maybe_compact(path, state)
+        self._bump_save_epoch(character_name, save_directory)
+        return True
+
+    def _maybe_compact(self, path, state):
+        """Compact the log when most of it is stale"""
+        if state['size'] < self.COMPACT_MIN_BYTES:
+            return
+        if state['live'] > state['size'] * (1 - self.COMPACT_RATIO):
+            return
+        self.compact_path(path, state)
+
+    def compact(self, save_directory):
+        """Rewrite a directory's log so it only holds live records"""
+        with self._lock:
+            path = self._log_path(save_directory)
+            if os.path.exists(path):
+                self.compact_path(path, self._open_log(save_directory))
+
+    def compact_path(self, path, state):
+        """
+        Copy live records to a new log and swap it in (lock must be held)
+
+        Each character's updates are merged into a single full record.
+        """
+        temp_path = path + ".compact"
+        new_index = {}
+        size = 0
+        with open(path, 'rb') as source, open(temp_path, 'wb') as target:
+            for name, records in state['index'].items():
+                if len(records) == 1:
+                    source.seek(records[0][0])
+                    payload = source.read(records[0][1])
+                else:
+                    merged = decode_character_text(self._read_records(source, records), name)
+                    payload = encode_character_text(merged).encode()
+                name_bytes = name.encode()
+                record = _log_record(_LOG_PUT, name_bytes, payload)
+                target.write(record)
+                new_index[name] = [(size + _LOG_HEADER.size + len(name_bytes), len(payload))]
+                size += len(record)
+            target.flush()
+            os.fsync(target.fileno())
+        os.chmod(temp_path, _file_mode(path))
+        os.replace(temp_path, path)
+        state['index'] = new_index
+        state['size'] = size
+        state['live'] = sum(records[0][1] for records in new_index.values())
+
+# ============================================================================
+# BACKEND REGISTRY
+# ============================================================================
+
+SAVE_BACKENDS = {
+    'text': TextSaveBackend,
+    'binary': BinarySaveBackend,
+    'sqlite': SqliteSaveBackend,
+    'log': LogSaveBackend
+}
+
+def create_backend(name):
+    """
+    Create a save backend by name
+
+    Returns: Backend instance
+    Raises: ValueError if the name is unknown
+    """
+    if name not in SAVE_BACKENDS:
+        raise ValueError(f"Unknown save backend: {name}")
+    return SAVE_BACKENDS[name]()
+
+# ============================================================================
+# WRITE-BEHIND QUEUE
+# ============================================================================
+
+def copy_value(value):
+    """Copy lists and inventories; other values are returned as they are"""
+    if isinstance(value, (list, MutableSequence)):
+        return value.copy()
+    return value
+
+def snapshot_character(character):
+    """Copy a character so later changes don't affect a queued save"""
+    if hasattr(character, 'snapshot'):
+        return character.snapshot()
+    return {key: copy_value(value) for key, value in character.items()}
+
+class SaveQueue:
+    """
+    Background writer that takes saves off the caller's thread
+
+    save() snapshots the character and returns immediately; a worker
+    thread passes the snapshot to save_function. A character saved again
+    before its previous save was written only has its latest state
+    written (the earlier one is counted as coalesced).
+
+    Call flush() to wait until everything queued is on disk, and close()
+    when done; saves after close() are written synchronously.
+    """
+
+    def __init__(self, save_function):
+        """
+        Args:
+            save_function: Called as save_function(character, save_directory),
+                           e.g. character_manager.save_character
+        """
+        self._save_function = save_function
+        self._pending = {}  # (save_directory, name) → (character, save_directory)
+        self._condition = threading.Condition()
+        self._writing = False
+        self._closed = False
+        self.stats = {'queued': 0, 'coalesced': 0, 'written': 0, 'failed': 0}
+        self.last_error = None
+        self._thread = threading.Thread(target=self._run, name="save-queue", daemon=True)
+        self._thread.start()
+
+    def save(self, character, save_directory="data/save_games"):
+        """Queue a character to be saved"""
+        snapshot = snapshot_character(character)
+        with self._condition:
+            if not self._closed:
+                key = (save_directory, snapshot['name'])
+                self.stats['queued'] += 1
+                if key in self._pending:
+                    self.stats['coalesced'] += 1
+                self._pending[key] = (snapshot, save_directory)
+                self._condition.notify_all()
+                return True
+        return self._save_function(snapshot, save_directory)
+
+    def pending_count(self):
+        """Return the number of characters waiting to be written"""
+        with self._condition:
+            return len(self._pending)
+
+    def flush(self, timeout=None):
+        """
+        Wait until every queued save has been written
+
+        Returns: True if the queue drained, False if the timeout ran out
+        """
+        with self._condition:
+            return self._condition.wait_for(lambda: not self._pending and not self._writing,
+                                            timeout)
+
+    def close(self, timeout=None):
+        """Flush the queue and stop the writer thread"""
+        drained = self.flush(timeout)
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join(timeout)
+        return drained
+
+    def _run(self):
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._pending or self._closed)
+                if not self._pending:
+                    return
+                key = next(iter(self._pending))
+                character, save_directory = self._pending.pop(key)
+                self._writing = True
+            try:
+                saved = self._save_function(character, save_directory)
+            except Exception as e:
+                saved = False
+                self.last_error = e
+            with self._condition:
+                self._writing = False
+                self.stats['written' if saved is not False else 'failed'] += 1
+                self._condition.notify_all()
+
+# ============================================================================
+# COMMAND LINE
+# ============================================================================
+
+def main(argv=None):
+    """
+    Command line entry point
+
+    python -m save_backends --to-binary [DIRECTORY]
+    python -m save_backends --to-text [DIRECTORY]
+        Convert every save in DIRECTORY (default: data/save_games)
+        between the text and binary formats.
+    """
+    import argparse
+    parser = argparse.ArgumentParser(prog="python -m save_backends")
+    direction = parser.add_mutually_exclusive_group(required=True)
+    direction.add_argument('--to-binary', action='store_true',
+                           help="convert text saves to the binary format")
+    direction.add_argument('--to-text', action='store_true',
+                           help="convert binary saves back to text")
+    parser.add_argument('directory', nargs='?', default="data/save_games")
+    parser.add_argument('--shards', type=int, default=0, metavar='N',
+                        help="save files are sharded by N hex digits")
+    args = parser.parse_args(argv)
+    try:
+        count = convert_saves(args.directory, args.to_binary, args.shards)
+    except (SaveFileCorruptedError, InvalidSaveDataError) as e:
+        print(f"Could not convert saves in '{args.directory}': {e}")
+        return 1
+    print(f"Converted {count} save(s) in {args.directory}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
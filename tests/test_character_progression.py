@@ -0,0 +1,243 @@
+"""
+Test Character Progression
+Tests for level-up math and character progression helpers
+"""
+
+import copy
+import pickle
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+from custom_exceptions import CharacterDeadError
+
+def loop_gain_experience(character, xp_amount):
+    """The original one-level-per-iteration gain_experience rules"""
+    character['experience'] += xp_amount
+    while character['experience'] >= character['level'] * 100:
+        character['level'] += 1
+        character['max_health'] += 10
+        character['strength'] += 2
+        character['magic'] += 2
+        character['health'] = character['max_health']
+        character['experience'] -= character['level'] * 100
+    return character
+
+# ============================================================================
+# LEVEL UPS
+# ============================================================================
+
+@pytest.mark.parametrize("level", [1, 2, 3, 7, 25])
+def test_gain_experience_matches_loop(level):
+    for experience in [0, 50, 99]:
+        for xp_amount in list(range(0, 3000, 37)) + [10 ** 6, 123456789]:
+            expected = character_manager.create_character("Loop", "Cleric")
+            expected.update(level=level, experience=experience, health=40)
+            actual = character_manager.create_character("Loop", "Cleric")
+            actual.update(level=level, experience=experience, health=40)
+
+            loop_gain_experience(expected, xp_amount)
+            character_manager.gain_experience(actual, xp_amount)
+            assert actual == expected
+
+def test_compute_level_ups_matches_loop_exhaustively():
+    for level in range(0, 30):
+        for experience in range(-250, 20000, 11):
+            character = {'level': level, 'experience': 0, 'max_health': 0, 'strength': 0,
+                         'magic': 0, 'health': 0}
+            loop_gain_experience(character, experience)
+            assert character_manager.compute_level_ups(level, experience) == \
+                (character['level'] - level, character['experience'])
+
+def test_no_level_up_keeps_health():
+    character = character_manager.create_character("Hurt", "Warrior")
+    character['health'] = 10
+    character_manager.gain_experience(character, 99)
+    assert character['level'] == 1
+    assert character['health'] == 10
+
+def test_xp_to_next_level():
+    character = character_manager.create_character("Next", "Mage")
+    assert character_manager.xp_to_next_level(character) == 100
+    character_manager.gain_experience(character, 150)
+    # Level 2 took 200 XP off, leaving -50 toward the 200 needed
+    assert character['experience'] == -50
+    assert character_manager.xp_to_next_level(character) == 250
+
+def test_level_for_total_xp():
+    assert character_manager.level_for_total_xp(0) == 1
+    assert character_manager.level_for_total_xp(99) == 1
+    assert character_manager.level_for_total_xp(100) == 2
+    assert character_manager.level_for_total_xp(10 ** 9) == \
+        loop_gain_experience({'level': 1, 'experience': 0, 'max_health': 0, 'strength': 0,
+                              'magic': 0, 'health': 0}, 10 ** 9)['level']
+
+# ============================================================================
+# BATCH REWARDS
+# ============================================================================
+
+def make_roster():
+    roster = []
+    for number in range(60):
+        character = character_manager.create_character(f"hero_{number}", "Rogue")
+        character['level'] = 1 + number % 12
+        character['experience'] = (number * 37) % 300 - 50
+        character['gold'] = number
+        if number % 9 == 0:
+            character['health'] = 0
+        roster.append(character)
+    return roster
+
+def scalar_rewards(roster, xp_amounts, gold_amounts):
+    errors = {}
+    for position, character in enumerate(roster):
+        try:
+            character_manager.gain_experience(character, xp_amounts[position])
+            character_manager.add_gold(character, gold_amounts[position])
+        except (CharacterDeadError, ValueError) as e:
+            errors[position] = e
+    return errors
+
+@pytest.mark.parametrize("use_numpy", [False, True])
+def test_grant_rewards_matches_scalar(use_numpy):
+    if use_numpy:
+        pytest.importorskip("numpy")
+    xp_amounts = [(number * 997) % 20000 for number in range(60)]
+    gold_amounts = [(number * 13) % 90 - 45 for number in range(60)]
+    expected = make_roster()
+    expected_errors = scalar_rewards(expected, xp_amounts, gold_amounts)
+
+    roster = make_roster()
+    errors = character_manager.grant_rewards(roster, xp_amounts, gold_amounts, use_numpy=use_numpy)
+    assert roster == expected
+    assert {position: (type(error), str(error)) for position, error in errors.items()} == \
+        {position: (type(error), str(error)) for position, error in expected_errors.items()}
+    assert all(type(character['level']) is int for character in roster)
+
+@pytest.mark.parametrize("use_numpy", [False, True])
+def test_grant_rewards_huge_levels_match_scalar(use_numpy):
+    if use_numpy:
+        pytest.importorskip("numpy")
+    roster = make_roster()
+    for number, character in enumerate(roster):
+        character['level'] = 2 ** 31 + number
+    expected = [dict(character) for character in roster]
+    xp_amounts = [10 ** 12] * len(roster)
+    expected_errors = scalar_rewards(expected, xp_amounts, [1] * len(roster))
+
+    errors = character_manager.grant_rewards(roster, xp_amounts, 1, use_numpy=use_numpy)
+    assert roster == expected
+    assert sorted(errors) == sorted(expected_errors)
+
+def test_batch_value_limit_keeps_int64_exact():
+    # The largest intermediate in the NumPy path is the quadratic's
+    # discriminant, with experience and XP each at the limit
+    limit = character_manager._BATCH_VALUE_LIMIT
+    budget2 = 2 * (2 * limit // 100)
+    assert 4 * limit * limit + 4 * limit + 9 + 4 * budget2 < 2 ** 63
+
+def test_grant_rewards_single_amount():
+    roster = [character_manager.create_character(name, "Mage") for name in ["A", "B"]]
+    assert character_manager.grant_rewards(roster, xp_amount=250, gold_amount=5) == {}
+    assert [character['level'] for character in roster] == [2, 2]
+    assert [character['gold'] for character in roster] == [105, 105]
+
+def test_grant_rewards_non_int_scalar():
+    roster = [character_manager.create_character(name, "Mage") for name in ["A", "B"]]
+    expected = [character_manager.create_character(name, "Mage") for name in ["A", "B"]]
+    scalar_rewards(expected, [250.0, 250.0], [5.0, 5.0])
+
+    assert character_manager.grant_rewards(roster, xp_amount=250.0, gold_amount=5.0) == {}
+    assert roster == expected
+
+def test_grant_rewards_length_mismatch():
+    with pytest.raises(ValueError):
+        character_manager.grant_rewards([character_manager.create_character("A", "Mage")], [1, 2])
+
+# ============================================================================
+# WHAT-IF BRANCHES
+# ============================================================================
+
+def make_hero():
+    character = character_manager.create_character("Brancher", "Warrior")
+    character['inventory'].append('potion')
+    character['active_quests'] = ['first_quest']
+    return character
+
+def test_branches_are_isolated():
+    character = make_hero()
+    root = character_manager.fork_character(character)
+    left = root.fork()
+    right = root.fork()
+
+    left['inventory'].append('sword')
+    left['active_quests'].remove('first_quest')
+    character_manager.gain_experience(left, 250)
+    right['gold'] = 5
+
+    assert list(character['inventory']) == ['potion'] and character['level'] == 1
+    assert list(root['inventory']) == ['potion'] and root['active_quests'] == ['first_quest']
+    assert list(right['inventory']) == ['potion'] and right['active_quests'] == ['first_quest']
+    assert left['level'] == 2 and left['gold'] == 100 and right['gold'] == 5
+
+def test_parent_changes_after_fork_stay_out_of_child():
+    root = character_manager.fork_character(make_hero())
+    child = root.fork()
+    root['inventory'].append('shield')
+    assert list(child['inventory']) == ['potion']
+    grandchild = child.fork()
+    child['active_quests'].append('second_quest')
+    assert grandchild['active_quests'] == ['first_quest']
+
+def test_forking_shares_lists_until_used():
+    root = character_manager.fork_character(make_hero())
+    child = root.fork()
+    assert dict.__getitem__(child, 'inventory') is dict.__getitem__(root, 'inventory')
+    child['inventory']
+    assert dict.__getitem__(child, 'inventory') is not dict.__getitem__(root, 'inventory')
+
+def test_commit_keeps_chosen_branch():
+    character = make_hero()
+    root = character_manager.fork_character(character)
+    branches = [root.fork() for _ in range(3)]
+    for number, branch in enumerate(branches):
+        character_manager.add_gold(branch, number * 100)
+        branch['equipped_weapon'] = f"sword_{number}"
+    del branches[2]['active_quests']
+
+    assert character_manager.commit_character(branches[2]) is character
+    assert character['gold'] == 300
+    assert character['equipped_weapon'] == "sword_2"
+    assert 'active_quests' not in character
+
+    # The branch can keep going without touching the committed character
+    branches[2]['inventory'].append('bomb')
+    assert 'bomb' not in character['inventory']
+
+def test_branch_dict_methods_copy_lists():
+    root = character_manager.fork_character(make_hero())
+    child = root.fork()
+    for value in child.values():
+        if isinstance(value, list):
+            value.append('changed')
+    child.get('inventory').append('changed')
+    child.copy()['inventory'].append('copy_only')
+    assert root['active_quests'] == ['first_quest']
+    assert list(root['inventory']) == ['potion']
+    assert child.pop('inventory').count('changed') == 1
+
+def test_branch_pickles_as_plain_character():
+    root = character_manager.fork_character(make_hero())
+    child = root.fork()
+    child['gold'] = 7
+    for branch in (root, child):
+        restored = pickle.loads(pickle.dumps(branch))
+        assert type(restored) is dict
+        assert restored == dict.copy(branch)
+
+    duplicate = copy.copy(child)
+    duplicate['inventory'].append('copy_only')
+    assert list(child['inventory']) == ['potion']
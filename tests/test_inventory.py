@@ -0,0 +1,115 @@
+"""
+Test Inventory
+Tests for the counted Inventory storage and its use in saves
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+import inventory_system
+import save_backends
+from inventory_system import Inventory
+from custom_exceptions import (
+    InventoryFullError,
+    ItemNotFoundError
+)
+
+# ============================================================================
+# LIST COMPATIBILITY
+# ============================================================================
+
+def test_inventory_behaves_like_a_list():
+    inventory = Inventory(['potion', 'sword', 'potion'])
+    assert len(inventory) == 3
+    assert 'potion' in inventory and 'shield' not in inventory
+    assert inventory.count('potion') == 2
+    assert list(inventory) == ['potion', 'potion', 'sword']
+    assert inventory == ['potion', 'potion', 'sword']
+    assert inventory[0] == 'potion' and inventory[-1] == 'sword'
+    assert inventory[:2] == ['potion', 'potion']
+
+    inventory.remove('potion')
+    assert inventory.count('potion') == 1
+    with pytest.raises(ValueError):
+        inventory.remove('shield')
+    assert inventory.pop() == 'sword'
+    del inventory[0]
+    assert len(inventory) == 0 and inventory == []
+
+def test_inventory_copy_is_independent():
+    inventory = Inventory(['potion'])
+    copy = inventory.copy()
+    copy.append('potion')
+    assert inventory.count('potion') == 1
+    assert copy != inventory
+
+def test_inventory_stacks():
+    inventory = Inventory.from_stacks(['potion*3', 'sword', 'odd*name'])
+    assert inventory.stacks() == [('potion', 3), ('sword', 1), ('odd*name', 1)]
+    assert inventory.to_stacks() == ['potion*3', 'sword', 'odd*name']
+    assert inventory_system.to_stacks(['a', 'b', 'a']) == ['a*2', 'b']
+    with pytest.raises(ValueError):
+        Inventory.from_stacks(['potion*0'])
+
+# ============================================================================
+# INVENTORY FUNCTIONS
+# ============================================================================
+
+def test_functions_work_on_inventory_and_list():
+    for empty in (Inventory(), []):
+        character = {'inventory': empty, 'gold': 100}
+        inventory_system.add_item_to_inventory(character, 'potion')
+        inventory_system.add_item_to_inventory(character, 'potion')
+        assert inventory_system.has_item(character, 'potion')
+        assert inventory_system.count_item(character, 'potion') == 2
+        assert inventory_system.get_inventory_space_remaining(character) == inventory_system.MAX_INVENTORY_SIZE - 2
+        inventory_system.remove_item_from_inventory(character, 'potion')
+        with pytest.raises(ItemNotFoundError):
+            inventory_system.remove_item_from_inventory(character, 'sword')
+        assert inventory_system.clear_inventory(character) == ['potion']
+
+def test_max_inventory_size_counts_every_item():
+    character = {'inventory': Inventory(['potion'] * inventory_system.MAX_INVENTORY_SIZE)}
+    with pytest.raises(InventoryFullError):
+        inventory_system.add_item_to_inventory(character, 'potion')
+
+def test_new_character_has_inventory():
+    character = character_manager.create_character("Stacker", "Rogue")
+    assert isinstance(character['inventory'], Inventory)
+    assert character_manager.validate_character_data(character)
+
+# ============================================================================
+# SAVES
+# ============================================================================
+
+@pytest.mark.parametrize("backend_name", ['text', 'binary', 'sqlite', 'log'])
+def test_inventory_saved_as_stacks(backend_name, tmp_path):
+    backend = save_backends.create_backend(backend_name)
+    character = character_manager.create_character("Stacker", "Rogue")
+    character['inventory'].add('potion', 12)
+    character['inventory'].append('sword')
+    backend.save(character, str(tmp_path))
+
+    loaded = backend.load("Stacker", str(tmp_path))
+    assert isinstance(loaded['inventory'], Inventory)
+    assert loaded['inventory'].stacks() == [('potion', 12), ('sword', 1)]
+
+def test_text_save_stacks_and_old_saves_load():
+    character = character_manager.create_character("Stacker", "Rogue")
+    character['inventory'].add('potion', 5)
+    text = save_backends.encode_character_text(character)
+    assert "INVENTORY: potion*5\n" in text
+
+    old_text = text.replace("potion*5", "potion,potion,sword")
+    loaded = save_backends.decode_character_text(old_text, "Stacker")
+    assert loaded['inventory'].stacks() == [('potion', 2), ('sword', 1)]
+
+def test_in_place_inventory_change_is_dirty(tmp_path):
+    character = character_manager.create_character("Stacker", "Rogue")
+    character_manager.save_character(character, str(tmp_path))
+    character['inventory'].append('potion')
+    assert character.dirty_fields() == ['inventory']
@@ -0,0 +1,62 @@
+"""
+Test Main Startup
+Tests that main.py defers loading its subsystems until they are used
+"""
+
+import pytest
+import sys
+import os
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def run_python(code):
+    """Run code in a fresh interpreter from the project root and return stdout"""
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT,
+                            capture_output=True, text=True, check=True)
+    return result.stdout
+
+def test_subsystems_load_on_first_use():
+    """Test that importing main does not execute the subsystem modules"""
+    output = run_python(
+        "import sys, main\n"
+        "print(type(sys.modules['combat_system']).__name__)\n"
+        "main.combat_system.create_enemy('goblin')\n"
+        "print(type(sys.modules['combat_system']).__name__)\n"
+    )
+    assert output.split() == ['_LazyModule', 'module']
+
+def test_inventory_system_stays_lazy_after_data_load():
+    """Test that loading game data and the save code doesn't load the shop"""
+    output = run_python(
+        "import sys, main\n"
+        "main.load_game_data()\n"
+        "main.character_manager.create_character('Hero', 'Mage')\n"
+        "print(type(sys.modules['character_manager']).__name__)\n"
+        "print(type(sys.modules['inventory_system']).__name__)\n"
+    )
+    assert output.split() == ['module', '_LazyModule']
+
+def test_sqlite_loads_only_for_the_sqlite_backend():
+    """Test that sqlite3 is imported when the sqlite backend opens a database, not before"""
+    output = run_python(
+        "import sys, tempfile, character_manager\n"
+        "print('sqlite3' in sys.modules)\n"
+        "character_manager.set_save_backend('sqlite')\n"
+        "character_manager.list_saved_characters(tempfile.mkdtemp())\n"
+        "print('sqlite3' in sys.modules)\n"
+        "character_manager.save_character(character_manager.create_character('Hero', 'Mage'), tempfile.mkdtemp())\n"
+        "print('sqlite3' in sys.modules)\n"
+    )
+    assert output.split() == ['False', 'False', 'True']
+
+def test_import_time_report():
+    """Test that --import-time lists every subsystem module"""
+    result = subprocess.run([sys.executable, "main.py", "--import-time"], cwd=ROOT,
+                            capture_output=True, text=True, check=True)
+    for name in ['game_data', 'character_manager', 'quest_handler',
+                 'inventory_system', 'combat_system', 'total']:
+        assert name in result.stdout
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
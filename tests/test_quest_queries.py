@@ -0,0 +1,147 @@
+"""
+Test Quest Queries
+Tests for the precomputed quest graph and catalog indexes
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import quest_handler
+import inventory_system
+import game_data
+from custom_exceptions import (
+    QuestNotFoundError,
+    InvalidDataFormatError
+)
+
+def make_quest(quest_id, prerequisite="NONE", required_level=1):
+    """Build a minimal quest dictionary"""
+    return {
+        'quest_id': quest_id,
+        'title': quest_id.title(),
+        'description': 'A test quest',
+        'reward_xp': 50,
+        'reward_gold': 25,
+        'required_level': required_level,
+        'prerequisite': prerequisite
+    }
+
+def make_quests(*quests):
+    """Build a quest_data_dict from quest dictionaries"""
+    return {quest['quest_id']: quest for quest in quests}
+
+# ============================================================================
+# QUEST GRAPH TESTS
+# ============================================================================
+
+def test_quest_graph_precomputes_order_depth_and_chains():
+    """Test topological order, depth, children and chains"""
+    quests = make_quests(make_quest('c', 'b'), make_quest('a'),
+                         make_quest('b', 'a'), make_quest('side', 'a'))
+    graph = quest_handler.build_quest_graph(quests)
+
+    assert graph.order.index('a') < graph.order.index('b') < graph.order.index('c')
+    assert graph.depth == {'a': 0, 'b': 1, 'c': 2, 'side': 1}
+    assert graph.children['a'] == ['b', 'side']
+    assert quest_handler.get_quest_prerequisite_chain('c', quests, graph) == ['a', 'b', 'c']
+    assert quest_handler.get_quest_prerequisite_chain('c', quests) == ['a', 'b', 'c']
+    assert graph.is_prerequisite_of('a', 'c')
+    assert not graph.is_prerequisite_of('side', 'c')
+    assert quest_handler.validate_quest_prerequisites(quests, graph) == True
+
+def test_quest_graph_reports_bad_prerequisites():
+    """Test that cycles and missing prerequisites are caught at build time"""
+    cyclic = make_quests(make_quest('a', 'c'), make_quest('b', 'a'),
+                         make_quest('c', 'b'), make_quest('root'))
+    with pytest.raises(InvalidDataFormatError):
+        quest_handler.build_quest_graph(cyclic)
+    with pytest.raises(InvalidDataFormatError):
+        quest_handler.get_quest_prerequisite_chain('a', cyclic)
+
+    with pytest.raises(QuestNotFoundError):
+        quest_handler.build_quest_graph(make_quests(make_quest('a', 'ghost')))
+
+def test_graph_available_quests_match_full_scan():
+    """Test that graph-backed availability matches the original scan"""
+    quests = make_quests(make_quest('a'), make_quest('b', 'a'), make_quest('c', 'b'),
+                         make_quest('high', 'a', required_level=5), make_quest('d'))
+    graph = quest_handler.build_quest_graph(quests)
+    character = {'level': 2, 'active_quests': ['d'], 'completed_quests': ['a']}
+
+    expected = quest_handler.get_available_quests(character, quests)
+
+    assert quest_handler.get_available_quests(character, quests, graph) == expected
+    assert [quest['quest_id'] for quest in expected] == ['b']
+
+def test_stale_graph_falls_back_to_scan(tmp_path):
+    """Test that a graph isn't trusted after reload_quests changes its catalog in place"""
+    blocks = [f"QUEST_ID: {quest_id}\nTITLE: {quest_id}\nDESCRIPTION: A test quest\n"
+              f"REWARD_XP: 50\nREWARD_GOLD: 25\nREQUIRED_LEVEL: 1\nPREREQUISITE: {prereq}\n"
+              for quest_id, prereq in (('a', 'NONE'), ('b', 'a'), ('c', 'NONE'))]
+    path = os.path.join(str(tmp_path), "quests.txt")
+    with open(path, 'w') as file:
+        file.write("\n".join(blocks))
+    quests = game_data.load_quests(path)
+    game_data.snapshot_catalog(path, 'quests')
+    graph = quest_handler.build_quest_graph(quests)
+    assert graph.is_current(quests)
+
+    with open(path, 'w') as file:
+        file.write("\n".join(blocks[1:]))
+    os.utime(path, ns=(0, 1))
+    game_data.reload_quests(quests, path)
+
+    assert not graph.is_current(quests)
+    with pytest.raises(QuestNotFoundError):
+        quest_handler.validate_quest_prerequisites(quests, graph)
+    character = {'level': 1, 'active_quests': [], 'completed_quests': []}
+    available = quest_handler.get_available_quests(character, quests, graph)
+    assert [quest['quest_id'] for quest in available] == ['c']
+
+# ============================================================================
+# CATALOG INDEX TESTS
+# ============================================================================
+
+def test_quest_level_index_range_queries():
+    """Test that indexed level queries match the full scan"""
+    quests = make_quests(*[make_quest(f"q{i}", required_level=(i * 7) % 12) for i in range(40)])
+    index = game_data.QuestLevelIndex(quests)
+
+    for low, high in ((5, 10), (0, 0), (11, 20), (20, 30)):
+        assert (quest_handler.get_quests_by_level(quests, low, high, index)
+                == quest_handler.get_quests_by_level(quests, low, high))
+
+    character = {'level': 3, 'active_quests': ['q0'], 'completed_quests': []}
+    assert (quest_handler.get_available_quests(character, quests, level_index=index)
+            == quest_handler.get_available_quests(character, quests))
+
+def test_item_cost_index_rebuilds_after_reload(tmp_path):
+    """Test shop queries by type/cost and automatic rebuild on reload"""
+    text = "".join(
+        f"ITEM_ID: item_{i}\nNAME: Item {i}\nTYPE: {('consumable', 'weapon')[i % 2]}\n"
+        f"EFFECT: health:5\nCOST: {(i * 13) % 90}\nDESCRIPTION: Test item\n\n"
+        for i in range(30))
+    path = os.path.join(str(tmp_path), "items.txt")
+    with open(path, 'w') as file:
+        file.write(text)
+    items = game_data.load_items(path)
+    index = game_data.ItemCostIndex(items)
+
+    cheap = inventory_system.get_shop_items(items, 'consumable', 50, cost_index=index)
+    assert cheap == inventory_system.get_shop_items(items, 'consumable', 50)
+    assert [item['cost'] for item in cheap] == sorted(item['cost'] for item in cheap)
+    assert all(item['cost'] <= 50 for item in cheap)
+
+    with open(path, 'w') as file:
+        file.write(text.replace("COST: 0\n", "COST: 500\n"))
+    os.utime(path, ns=(0, 1))
+    game_data.reload_items(items, path)
+
+    assert 'item_0' not in [item['item_id'] for item in index.items_of_type('consumable', max_cost=50)]
+    assert index.items_of_type('consumable', min_cost=500)[0]['item_id'] == 'item_0'
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,626 @@
+"""
+Test Save System
+Tests for character save backends, the write-behind queue and dirty tracking
+"""
+
+import pytest
+import asyncio
+import sys
+import os
+import sqlite3
+import struct
+import threading
+import time
+import zlib
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+import save_backends
+from custom_exceptions import (
+    CharacterNotFoundError,
+    SaveFileCorruptedError,
+    InvalidSaveDataError
+)
+
+BACKEND_NAMES = ['text', 'binary', 'sqlite', 'log']
+
+@pytest.fixture(params=BACKEND_NAMES)
+def backend(request):
+    """Select each backend in turn, restoring the default afterwards"""
+    previous = character_manager.get_save_backend()
+    selected = character_manager.set_save_backend(request.param)
+    yield selected
+    if hasattr(selected, 'close'):
+        selected.close()
+    character_manager.set_save_backend(previous)
+
+def make_character(name="Hero"):
+    character = character_manager.create_character(name, "Warrior")
+    character['inventory'] = ['health_potion', 'iron_sword']
+    character['completed_quests'] = ['first_quest']
+    return character
+
+# ============================================================================
+# BACKEND ROUND TRIPS
+# ============================================================================
+
+def test_default_backend_is_text():
+    assert isinstance(character_manager.get_save_backend(), save_backends.TextSaveBackend)
+
+def test_save_and_load_round_trip(backend, tmp_path):
+    character = make_character()
+    assert character_manager.save_character(character, str(tmp_path)) is True
+
+    loaded = character_manager.load_character("Hero", str(tmp_path))
+    assert loaded['name'] == "Hero"
+    assert loaded['level'] == 1
+    assert loaded['inventory'] == ['health_potion', 'iron_sword']
+    assert loaded['active_quests'] == []
+    assert loaded['completed_quests'] == ['first_quest']
+
+def test_backends_load_identically(tmp_path):
+    character = make_character()
+    loaded = []
+    for name in BACKEND_NAMES:
+        backend = save_backends.create_backend(name)
+        backend.save(character, str(tmp_path))
+        loaded.append(backend.load("Hero", str(tmp_path)))
+    assert all(character == loaded[0] for character in loaded)
+
+def test_overwrite_keeps_latest(backend, tmp_path):
+    character = make_character()
+    character_manager.save_character(character, str(tmp_path))
+    character['gold'] = 999
+    character_manager.save_character(character, str(tmp_path))
+
+    assert character_manager.load_character("Hero", str(tmp_path))['gold'] == 999
+    assert character_manager.list_saved_characters(str(tmp_path)) == ["Hero"]
+
+def test_list_and_delete(backend, tmp_path):
+    for name in ["Alpha", "Beta"]:
+        character_manager.save_character(make_character(name), str(tmp_path))
+    assert sorted(character_manager.list_saved_characters(str(tmp_path))) == ["Alpha", "Beta"]
+
+    assert character_manager.delete_character("Alpha", str(tmp_path)) is True
+    assert character_manager.list_saved_characters(str(tmp_path)) == ["Beta"]
+    with pytest.raises(CharacterNotFoundError):
+        character_manager.load_character("Alpha", str(tmp_path))
+    with pytest.raises(CharacterNotFoundError):
+        character_manager.delete_character("Alpha", str(tmp_path))
+
+def test_missing_directory(backend, tmp_path):
+    missing = str(tmp_path / "missing")
+    assert character_manager.list_saved_characters(missing) == []
+    with pytest.raises(CharacterNotFoundError):
+        character_manager.load_character("Nobody", missing)
+
+def test_unknown_backend_name():
+    with pytest.raises(ValueError):
+        save_backends.create_backend("floppy")
+
+def test_decode_missing_fields():
+    with pytest.raises(InvalidSaveDataError):
+        save_backends.decode_character_text("NAME: Hero\n", "Hero")
+
+def test_migrate_saves(tmp_path):
+    for name in ["Alpha", "Beta"]:
+        save_backends.TextSaveBackend().save(make_character(name), str(tmp_path))
+    destination = save_backends.SqliteSaveBackend()
+    assert character_manager.migrate_saves('text', destination, str(tmp_path)) == 2
+    assert destination.list_names(str(tmp_path)) == ["Alpha", "Beta"]
+    destination.close()
+
+# ============================================================================
+# LOG BACKEND
+# ============================================================================
+
+def test_log_reopens_from_disk(tmp_path):
+    log = save_backends.LogSaveBackend()
+    log.save(make_character("Alpha"), str(tmp_path))
+    log.save(make_character("Beta"), str(tmp_path))
+    log.delete("Alpha", str(tmp_path))
+
+    reopened = save_backends.LogSaveBackend()
+    assert reopened.list_names(str(tmp_path)) == ["Beta"]
+    assert reopened.load("Beta", str(tmp_path))['name'] == "Beta"
+
+def test_log_drops_torn_record(tmp_path):
+    log = save_backends.LogSaveBackend()
+    log.save(make_character("Alpha"), str(tmp_path))
+    path = tmp_path / save_backends.LogSaveBackend.LOG_NAME
+    good_size = path.stat().st_size
+    with open(path, 'ab') as file:
+        file.write(b'P\x05\x00garbage')
+
+    reopened = save_backends.LogSaveBackend()
+    assert reopened.list_names(str(tmp_path)) == ["Alpha"]
+    assert path.stat().st_size == good_size
+    reopened.save(make_character("Beta"), str(tmp_path))
+    assert sorted(save_backends.LogSaveBackend().list_names(str(tmp_path))) == ["Alpha", "Beta"]
+
+def test_log_damage_before_the_end_keeps_later_saves(tmp_path):
+    log = save_backends.LogSaveBackend()
+    for name in ["Alpha", "Beta", "Gamma"]:
+        log.save(make_character(name), str(tmp_path))
+    path = tmp_path / save_backends.LogSaveBackend.LOG_NAME
+    data = bytearray(path.read_bytes())
+    size = len(data)
+
+    data[save_backends._LOG_HEADER.size + 10] ^= 0x01  # One bit in Alpha's record
+    path.write_bytes(bytes(data))
+    with pytest.raises(SaveFileCorruptedError):
+        save_backends.LogSaveBackend().list_names(str(tmp_path))
+    assert path.stat().st_size == size
+
+    data[save_backends._LOG_HEADER.size + 10] ^= 0x01
+    data[0] = ord('X')  # Unknown operation on a record that isn't the last
+    path.write_bytes(bytes(data))
+    with pytest.raises(SaveFileCorruptedError):
+        save_backends.LogSaveBackend().load("Gamma", str(tmp_path))
+    assert path.stat().st_size == size
+
+def test_log_reads_records_without_header_checksum(tmp_path):
+    body = b"Alpha" + save_backends.encode_character_text(make_character("Alpha")).encode()
+    record = struct.pack('<cHII', b'P', 5, len(body) - 5, zlib.crc32(body)) + body
+    (tmp_path / save_backends.LogSaveBackend.LOG_NAME).write_bytes(record)
+    assert save_backends.LogSaveBackend().load("Alpha", str(tmp_path))['name'] == "Alpha"
+
+def test_log_compaction(tmp_path):
+    log = save_backends.LogSaveBackend()
+    log.COMPACT_MIN_BYTES = 0
+    character = make_character()
+    for gold in range(50):
+        character['gold'] = gold
+        log.save(character, str(tmp_path))
+    log.save(make_character("Other"), str(tmp_path))
+    log.compact(str(tmp_path))
+
+    path = tmp_path / save_backends.LogSaveBackend.LOG_NAME
+    record_size = len(save_backends.encode_character_text(character)) + 64
+    assert path.stat().st_size < 2 * record_size
+    assert log.load("Hero", str(tmp_path))['gold'] == 49
+    assert save_backends.LogSaveBackend().load("Other", str(tmp_path))['name'] == "Other"
+
+# ============================================================================
+# WRITE-BEHIND QUEUE
+# ============================================================================
+
+def test_text_save_is_atomic(tmp_path):
+    backend = save_backends.TextSaveBackend()
+    backend.save(make_character(), str(tmp_path))
+    backend.save(make_character(), str(tmp_path))
+    assert os.listdir(tmp_path) == ["Hero_save.txt"]
+
+@pytest.mark.skipif(os.name != 'posix', reason="POSIX permission bits")
+def test_atomic_write_keeps_file_mode(tmp_path):
+    path = str(tmp_path / "Hero_save.txt")
+    save_backends.write_file_atomic(path, "new")
+    umask = os.umask(0)
+    os.umask(umask)
+    assert os.stat(path).st_mode & 0o777 == 0o666 & ~umask
+
+    os.chmod(path, 0o640)
+    save_backends.write_file_atomic(path, "newer")
+    assert os.stat(path).st_mode & 0o777 == 0o640
+
+def test_save_queue_writes_in_background(tmp_path):
+    queue = save_backends.SaveQueue(character_manager.save_character)
+    character = make_character()
+    queue.save(character, str(tmp_path))
+    character['gold'] = 5  # Changes after queueing don't leak into the save
+    assert queue.close() is True
+
+    assert character_manager.load_character("Hero", str(tmp_path))['gold'] == 100
+    assert queue.stats['written'] == 1
+
+def test_save_queue_coalesces(tmp_path):
+    release = threading.Event()
+    written = []
+
+    def slow_save(character, save_directory):
+        release.wait()
+        written.append((character['name'], character['gold']))
+        return True
+
+    queue = save_backends.SaveQueue(slow_save)
+    character = make_character()
+    queue.save(make_character("Blocker"), str(tmp_path))
+    while queue.pending_count():  # Wait until the writer is busy with Blocker
+        pass
+    for gold in range(10):
+        character['gold'] = gold
+        queue.save(character, str(tmp_path))
+    release.set()
+    queue.close()
+
+    assert written == [("Blocker", 100), ("Hero", 9)]
+    assert queue.stats == {'queued': 11, 'coalesced': 9, 'written': 2, 'failed': 0}
+
+def test_save_queue_counts_failures(tmp_path):
+    def failing_save(character, save_directory):
+        raise OSError("disk full")
+
+    queue = save_backends.SaveQueue(failing_save)
+    queue.save(make_character(), str(tmp_path))
+    queue.close()
+    assert queue.stats['failed'] == 1
+    assert isinstance(queue.last_error, OSError)
+
+# ============================================================================
+# DIRTY TRACKING
+# ============================================================================
+
+def test_unchanged_save_is_skipped(backend, tmp_path):
+    character_manager.reset_save_stats()
+    character = make_character()
+    character_manager.save_character(character, str(tmp_path))
+    assert character_manager.save_character(character, str(tmp_path)) is True
+
+    character['inventory'].append('magic_ring')  # In-place changes are tracked
+    character_manager.save_character(character, str(tmp_path))
+
+    stats = character_manager.get_save_stats()
+    assert stats['saved'] == 2
+    assert stats['skipped'] == 1
+    loaded = character_manager.load_character("Hero", str(tmp_path))
+    assert loaded['inventory'] == ['health_potion', 'iron_sword', 'magic_ring']
+
+def test_unchanged_save_after_delete_is_written(backend, tmp_path):
+    character = make_character()
+    character_manager.save_character(character, str(tmp_path))
+    character_manager.delete_character("Hero", str(tmp_path))
+    assert character_manager.save_character(character, str(tmp_path)) is True
+
+    assert character_manager.list_saved_characters(str(tmp_path)) == ["Hero"]
+    assert character_manager.load_character("Hero", str(tmp_path))['gold'] == 100
+
+def test_unchanged_save_removed_outside_game_is_written(tmp_path):
+    character = make_character()
+    character_manager.save_character(character, str(tmp_path))
+    os.remove(tmp_path / "Hero_save.txt")
+    character_manager.save_character(character, str(tmp_path))
+    assert (tmp_path / "Hero_save.txt").exists()
+
+def test_unchanged_sqlite_row_removed_outside_game_is_written(tmp_path):
+    previous = character_manager.get_save_backend()
+    selected = character_manager.set_save_backend('sqlite')
+    try:
+        character = make_character()
+        character_manager.save_character(character, str(tmp_path))
+        connection = sqlite3.connect(str(tmp_path / save_backends.SqliteSaveBackend.DATABASE_NAME))
+        connection.execute("DELETE FROM characters")
+        connection.commit()
+        connection.close()
+
+        character_manager.save_character(character, str(tmp_path))
+        assert character_manager.list_saved_characters(str(tmp_path)) == ["Hero"]
+    finally:
+        selected.close()
+        character_manager.set_save_backend(previous)
+
+def test_fields_written_counts_full_rewrites(backend, tmp_path):
+    character_manager.reset_save_stats()
+    character = make_character()
+    character_manager.save_character(character, str(tmp_path))
+    character['gold'] = 250
+    character_manager.save_character(character, str(tmp_path))
+
+    changed = 1 if backend.name == 'log' else len(save_backends.SAVE_FIELDS)
+    assert character_manager.get_save_stats()['fields_written'] == len(save_backends.SAVE_FIELDS) + changed
+
+def test_loaded_character_is_clean(backend, tmp_path):
+    character_manager.save_character(make_character(), str(tmp_path))
+    loaded = character_manager.load_character("Hero", str(tmp_path))
+    assert not loaded.is_dirty((backend, str(tmp_path)))
+    loaded['gold'] = 1
+    assert loaded.dirty_fields((backend, str(tmp_path))) == ['gold']
+
+def test_new_directory_saves_everything(tmp_path):
+    character = make_character()
+    character_manager.save_character(character, str(tmp_path / "a"))
+    character_manager.save_character(character, str(tmp_path / "b"))
+    assert character_manager.list_saved_characters(str(tmp_path / "b")) == ["Hero"]
+
+def test_plain_dicts_always_save(tmp_path):
+    character_manager.reset_save_stats()
+    character = dict(make_character())
+    character_manager.save_character(character, str(tmp_path))
+    character_manager.save_character(character, str(tmp_path))
+    assert character_manager.get_save_stats()['saved'] == 2
+
+def test_log_writes_only_changed_fields(tmp_path):
+    previous = character_manager.get_save_backend()
+    log = character_manager.set_save_backend('log')
+    try:
+        character_manager.reset_save_stats()
+        character = make_character()
+        character_manager.save_character(character, str(tmp_path))
+        path = tmp_path / save_backends.LogSaveBackend.LOG_NAME
+        full_size = path.stat().st_size
+
+        character['gold'] = 250
+        character['level'] = 2
+        character_manager.save_character(character, str(tmp_path))
+        assert path.stat().st_size - full_size < full_size / 2
+        assert character_manager.get_save_stats()['fields_written'] == 12 + 2
+
+        for loader in (log, save_backends.LogSaveBackend()):
+            loaded = loader.load("Hero", str(tmp_path))
+            assert loaded['gold'] == 250
+            assert loaded['level'] == 2
+            assert loaded['inventory'] == ['health_potion', 'iron_sword']
+
+        log.compact(str(tmp_path))
+        assert save_backends.LogSaveBackend().load("Hero", str(tmp_path))['gold'] == 250
+    finally:
+        character_manager.set_save_backend(previous)
+
+class NullSaveBackend:
+    """Backend that stores nothing, so only the save bookkeeping is exercised"""
+
+    def save(self, character, save_directory, fields=None):
+        return True
+
+def test_save_stats_are_thread_safe(tmp_path):
+    previous = character_manager.get_save_backend()
+    character_manager.set_save_backend(NullSaveBackend())
+    try:
+        character_manager.reset_save_stats()
+        character = dict(make_character())
+
+        def save_many():
+            for number in range(2000):
+                character_manager.save_character(character, str(tmp_path))
+
+        threads = [threading.Thread(target=save_many) for number in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        stats = character_manager.get_save_stats()
+        assert stats['saved'] == 8 * 2000
+        assert stats['fields_written'] == 8 * 2000 * len(save_backends.SAVE_FIELDS)
+    finally:
+        character_manager.set_save_backend(previous)
+
+def test_save_queue_marks_source_clean(tmp_path):
+    queue = save_backends.SaveQueue(character_manager.save_character)
+    character = make_character()
+    queue.save(character, str(tmp_path))
+    queue.close()
+    assert not character.is_dirty()
+
+# ============================================================================
+# LISTING
+# ============================================================================
+
+def test_list_pages_and_prefix(backend, tmp_path):
+    for name in ["Cara", "Anna", "Bob", "Abe", "Al"]:
+        character_manager.save_character(make_character(name), str(tmp_path))
+
+    assert character_manager.list_saved_characters(str(tmp_path)) == ["Abe", "Al", "Anna", "Bob", "Cara"]
+    assert character_manager.list_saved_characters(str(tmp_path), offset=1, limit=2) == ["Al", "Anna"]
+    assert character_manager.list_saved_characters(str(tmp_path), offset=4, limit=2) == ["Cara"]
+    assert character_manager.list_saved_characters(str(tmp_path), prefix="A") == ["Abe", "Al", "Anna"]
+    assert character_manager.list_saved_characters(str(tmp_path), prefix="A", offset=2) == ["Anna"]
+    assert character_manager.list_saved_characters(str(tmp_path), prefix="Z") == []
+    assert character_manager.count_saved_characters(str(tmp_path)) == 5
+    assert character_manager.count_saved_characters(str(tmp_path), prefix="A") == 3
+
+def test_text_index_sees_outside_changes(tmp_path):
+    backend = save_backends.TextSaveBackend()
+    backend.save(make_character("Alpha"), str(tmp_path))
+    assert backend.list_names(str(tmp_path)) == ["Alpha"]
+
+    # A file added by something else changes the directory mtime
+    (tmp_path / "Beta_save.txt").write_text(save_backends.encode_character_text(make_character("Beta")))
+    os.utime(tmp_path, ns=(0, os.stat(tmp_path).st_mtime_ns + 1))
+    assert backend.list_names(str(tmp_path)) == ["Alpha", "Beta"]
+
+def test_text_index_updates_on_own_writes(tmp_path, monkeypatch):
+    backend = save_backends.TextSaveBackend()
+    backend.save(make_character("Alpha"), str(tmp_path))
+    backend.list_names(str(tmp_path))
+
+    scans = []
+    original_scan = backend._scan
+    monkeypatch.setattr(backend, '_scan', lambda directory: scans.append(directory) or original_scan(directory))
+    backend.save(make_character("Beta"), str(tmp_path))
+    backend.delete("Alpha", str(tmp_path))
+    assert backend.list_names(str(tmp_path)) == ["Beta"]
+    assert scans == []
+
+def test_sharded_text_backend(tmp_path):
+    backend = save_backends.TextSaveBackend(shard_prefix_length=2)
+    for name in ["Alpha", "Beta", "Gamma"]:
+        backend.save(make_character(name), str(tmp_path))
+    # A save from before sharding was turned on is still found
+    save_backends.TextSaveBackend().save(make_character("Legacy"), str(tmp_path))
+
+    assert all(len(entry) == 2 for entry in os.listdir(tmp_path) if not entry.endswith(".txt"))
+    assert os.path.exists(backend.save_path("Alpha", str(tmp_path)))
+    assert save_backends.TextSaveBackend(shard_prefix_length=2).list_names(str(tmp_path)) == \
+        ["Alpha", "Beta", "Gamma", "Legacy"]
+    assert backend.load("Legacy", str(tmp_path))['name'] == "Legacy"
+    backend.delete("Gamma", str(tmp_path))
+    assert backend.list_names(str(tmp_path), prefix="G") == []
+
+# ============================================================================
+# BULK LOADING
+# ============================================================================
+
+def test_load_characters_reports_errors(backend, tmp_path):
+    names = [f"Hero{number}" for number in range(20)]
+    for name in names:
+        character_manager.save_character(make_character(name), str(tmp_path))
+
+    characters, errors = character_manager.load_characters(names + ["Ghost", "Hero3"], str(tmp_path),
+                                                           max_workers=4)
+    assert sorted(characters) == sorted(names)
+    assert characters["Hero7"]['name'] == "Hero7"
+    assert list(errors) == ["Ghost"]
+    assert isinstance(errors["Ghost"], CharacterNotFoundError)
+
+def test_load_characters_serial_matches_pool(tmp_path):
+    for name in ["Alpha", "Beta", "Gamma"]:
+        character_manager.save_character(make_character(name), str(tmp_path))
+    (tmp_path / "Broken_save.txt").write_text("NAME: Broken\n")
+
+    serial = character_manager.load_characters(["Alpha", "Beta", "Gamma", "Broken"], str(tmp_path), max_workers=1)
+    pooled = character_manager.load_characters(["Alpha", "Beta", "Gamma", "Broken"], str(tmp_path), max_workers=3)
+    assert serial[0] == pooled[0]
+    assert isinstance(pooled[1]["Broken"], InvalidSaveDataError)
+
+# ============================================================================
+# TYPED DECODING
+# ============================================================================
+
+def test_loaded_character_is_typed(tmp_path):
+    character_manager.save_character(make_character(), str(tmp_path))
+    loaded = character_manager.load_character("Hero", str(tmp_path))
+    assert loaded == make_character()
+    assert character_manager.validate_character_data(loaded) is True
+
+    character_manager.gain_experience(loaded, 150)
+    character_manager.add_gold(loaded, 10)
+    assert loaded['level'] == 2
+    assert loaded['gold'] == 110
+
+def test_decode_rejects_bad_numbers():
+    text = save_backends.encode_character_text(make_character()).replace("GOLD: 100", "GOLD: lots")
+    with pytest.raises(InvalidSaveDataError, match="gold"):
+        save_backends.decode_character_text(text, "Hero")
+
+def test_decode_tolerates_format_variations():
+    text = "\n" + save_backends.encode_character_text(make_character()).replace("LEVEL: 1", "level:3")
+    text += "no colon here\nNOTE: extra\n"
+    character = save_backends.decode_character_text(text, "Hero")
+    assert character['level'] == 3
+    assert character['note'] == "extra"
+    assert character['active_quests'] == []
+
+# ============================================================================
+# BINARY SAVES
+# ============================================================================
+
+@pytest.mark.parametrize("compress", [False, True, None])
+def test_binary_round_trip(compress):
+    character = make_character()
+    character['experience'] = -150
+    character['inventory'] = ['item_%d' % number for number in range(100)]
+    data = save_backends.encode_character_binary(character, compress)
+    assert save_backends.is_binary_save(data)
+    assert save_backends.decode_character_binary(data, "Hero") == character
+    assert len(data) < len(save_backends.encode_character_text(character))
+
+@pytest.mark.parametrize("damage", ["truncate", "flip", "version"])
+def test_binary_damage_is_detected(damage):
+    data = bytearray(save_backends.encode_character_binary(make_character()))
+    if damage == "truncate":
+        data = data[:-7]
+    elif damage == "flip":
+        data[20] ^= 0x01
+    else:
+        data[5] = save_backends.SAVE_VERSION + 1
+    with pytest.raises(SaveFileCorruptedError):
+        save_backends.decode_character_binary(bytes(data), "Hero")
+
+def test_binary_backend_loads_text_saves(tmp_path):
+    save_backends.TextSaveBackend().save(make_character("Old"), str(tmp_path))
+    backend = save_backends.BinarySaveBackend()
+    backend.save(make_character("New"), str(tmp_path))
+
+    assert backend.list_names(str(tmp_path)) == ["New", "Old"]
+    assert backend.load("Old", str(tmp_path)) == make_character("Old")
+    backend.save(backend.load("Old", str(tmp_path)), str(tmp_path))
+    assert sorted(os.listdir(tmp_path)) == ["New_save.bin", "Old_save.bin"]
+
+def test_binary_backend_reports_corruption(tmp_path):
+    backend = save_backends.BinarySaveBackend()
+    backend.save(make_character(), str(tmp_path))
+    path = tmp_path / "Hero_save.bin"
+    path.write_bytes(path.read_bytes()[:-1])
+    with pytest.raises(SaveFileCorruptedError):
+        backend.load("Hero", str(tmp_path))
+
+def test_convert_saves_both_ways(tmp_path):
+    for name in ["Alpha", "Beta"]:
+        save_backends.TextSaveBackend().save(make_character(name), str(tmp_path))
+    assert save_backends.main(["--to-binary", str(tmp_path)]) == 0
+    assert sorted(os.listdir(tmp_path)) == ["Alpha_save.bin", "Beta_save.bin"]
+
+    assert save_backends.convert_saves(str(tmp_path), to_binary=False) == 2
+    assert sorted(os.listdir(tmp_path)) == ["Alpha_save.txt", "Beta_save.txt"]
+    assert save_backends.TextSaveBackend().load("Beta", str(tmp_path)) == make_character("Beta")
+
+# ============================================================================
+# ASYNC API
+# ============================================================================
+
+class RecordingBackend(save_backends.TextSaveBackend):
+    """Text backend that records how many saves overlap"""
+
+    def __init__(self):
+        super().__init__()
+        self.lock = threading.Lock()
+        self.active = {}
+        self.active_total = 0
+        self.max_per_name = 0
+        self.max_total = 0
+        self.order = []
+
+    def save(self, character, save_directory, fields=None):
+        name = character['name']
+        with self.lock:
+            self.active[name] = self.active.get(name, 0) + 1
+            self.active_total += 1
+            self.max_per_name = max(self.max_per_name, self.active[name])
+            self.max_total = max(self.max_total, self.active_total)
+        time.sleep(0.01)
+        try:
+            return super().save(character, save_directory, fields)
+        finally:
+            with self.lock:
+                self.active[name] -= 1
+                self.active_total -= 1
+                self.order.append((name, character['gold']))
+
+def test_async_round_trip(backend, tmp_path):
+    async def scenario():
+        character = make_character()
+        assert await character_manager.async_save_character(character, str(tmp_path)) is True
+        loaded = await character_manager.async_load_character("Hero", str(tmp_path))
+        names = await character_manager.async_list_saved_characters(str(tmp_path))
+        count = await character_manager.async_count_saved_characters(str(tmp_path))
+        await character_manager.async_delete_character("Hero", str(tmp_path))
+        with pytest.raises(CharacterNotFoundError):
+            await character_manager.async_load_character("Hero", str(tmp_path))
+        return loaded, names, count
+
+    loaded, names, count = asyncio.run(scenario())
+    assert loaded['gold'] == 100
+    assert names == ["Hero"] and count == 1
+
+def test_async_saves_serialize_per_character(tmp_path):
+    previous = character_manager.get_save_backend()
+    recorder = character_manager.set_save_backend(RecordingBackend())
+
+    async def scenario():
+        characters = [make_character(f"Hero{number}") for number in range(6)]
+        saves = []
+        for gold in range(5):
+            for character in characters:
+                character['gold'] = gold
+                saves.append(character_manager.async_save_character(character, str(tmp_path)))
+        return await asyncio.gather(*saves)
+
+    try:
+        assert all(asyncio.run(scenario()))
+    finally:
+        character_manager.set_save_backend(previous)
+    assert recorder.max_per_name == 1
+    assert 1 < recorder.max_total <= character_manager.ASYNC_DIRECTORY_LIMIT
+    # gather starts the saves in order, so each character's saves ran in that order
+    assert [gold for name, gold in recorder.order if name == "Hero0"] == [0, 1, 2, 3, 4]
+    assert character_manager.load_character("Hero3", str(tmp_path))['gold'] == 4